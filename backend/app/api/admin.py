@@ -4,15 +4,18 @@ Admin API routes for application management
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timezone
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.deps import get_current_admin_user
-from app.models.user import User
-from app.models.application import Application, AdminNote, ApplicationApproval, ApplicationResponse
+from app.core.principal_cache import Principal
+from app.models.application import Application, AdminNote, ApplicationApproval
 from app.schemas.admin_note import AdminNote as AdminNoteSchema, AdminNoteCreate
 from app.schemas.application import ApplicationUpdate, Application as ApplicationSchema, ApplicationProgress
+from app.services import progress_service, response_service
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -20,8 +23,8 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 @router.get("/applications/{application_id}/progress", response_model=ApplicationProgress)
 async def get_application_progress_admin(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Get detailed progress for an application (admin version)
@@ -29,148 +32,30 @@ async def get_application_progress_admin(
     Returns completion status for each section and overall progress.
     Admin can view progress for any application.
     """
-    # Import here to avoid circular dependency
-    from app.api.applications import (
-        ApplicationSection,
-        ApplicationQuestion,
-        ApplicationResponse as AppResponse,
-        SectionProgress
-    )
-
-    application = db.query(Application).filter(Application.id == application_id).first()
+    result = await db.execute(select(Application).where(Application.id == application_id))
+    application = result.scalars().first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Application not found"
         )
 
-    # Get application status for conditional filtering
-    app_status = application.status
-
-    # Get sections filtered by status
-    sections_query = db.query(ApplicationSection).filter(
-        ApplicationSection.is_active == True
-    )
-
-    # Filter sections by status
-    if app_status:
-        sections_query = sections_query.filter(
-            (ApplicationSection.show_when_status == None) |
-            (ApplicationSection.show_when_status == app_status)
-        )
-    else:
-        sections_query = sections_query.filter(
-            ApplicationSection.show_when_status == None
-        )
-
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Get all responses for this application
-    all_responses = db.query(AppResponse).filter(
-        AppResponse.application_id == application_id
-    ).all()
-
-    # Create a dict of question_id -> response_value for quick lookup
-    response_dict = {str(r.question_id): r.response_value for r in all_responses}
-
-    # Helper function to check if a question should be shown based on conditional logic
-    def should_show_question(question: ApplicationQuestion) -> bool:
-        # If no conditional logic, always show
-        if not question.show_if_question_id or not question.show_if_answer:
-            return True
-
-        # Get the trigger question's response
-        trigger_response = response_dict.get(str(question.show_if_question_id))
-
-        # Show the question only if the trigger response matches the expected answer
-        return trigger_response == question.show_if_answer
-
-    section_progress_list = []
-    completed_sections = 0
-
-    for section in sections:
-        # Get questions for this section, filtered by status
-        questions_query = db.query(ApplicationQuestion).filter(
-            ApplicationQuestion.section_id == section.id,
-            ApplicationQuestion.is_active == True
-        )
-
-        # Filter questions by status
-        if app_status:
-            questions_query = questions_query.filter(
-                (ApplicationQuestion.show_when_status == None) |
-                (ApplicationQuestion.show_when_status == app_status)
-            )
-        else:
-            questions_query = questions_query.filter(
-                ApplicationQuestion.show_when_status == None
-            )
-
-        questions = questions_query.all()
-
-        # Filter questions by conditional logic
-        visible_questions = [q for q in questions if should_show_question(q)]
-
-        total_questions = len(visible_questions)
-        required_questions = sum(1 for q in visible_questions if q.is_required)
-
-        # Get responses for visible questions only
-        visible_question_ids = [q.id for q in visible_questions]
-        responses = [r for r in all_responses if r.question_id in visible_question_ids]
-
-        answered_questions = len(responses)
-        answered_required = sum(
-            1 for r in responses
-            if any(q.id == r.question_id and q.is_required for q in visible_questions)
-        )
-
-        # Calculate section completion
-        if required_questions > 0:
-            section_percentage = int((answered_required / required_questions) * 100)
-        else:
-            section_percentage = 100 if answered_questions == total_questions else 0
-
-        is_complete = answered_required == required_questions
-
-        if is_complete:
-            completed_sections += 1
-
-        section_progress_list.append(SectionProgress(
-            section_id=section.id,
-            section_title=section.title,
-            total_questions=total_questions,
-            required_questions=required_questions,
-            answered_questions=answered_questions,
-            answered_required=answered_required,
-            completion_percentage=section_percentage,
-            is_complete=is_complete
-        ))
-
-    # Calculate overall percentage
-    total_sections = len(sections)
-    overall_percentage = int((completed_sections / total_sections) * 100) if total_sections > 0 else 0
-
-    return ApplicationProgress(
-        application_id=application.id,
-        total_sections=total_sections,
-        completed_sections=completed_sections,
-        overall_percentage=overall_percentage,
-        section_progress=section_progress_list
-    )
+    return await progress_service.get_application_progress(db, application)
 
 
 @router.get("/applications/{application_id}/approval-status")
 async def get_approval_status(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Get approval status for an application
     Returns approval count, decline count, and current user's vote
     """
     try:
-        application = db.query(Application).filter(Application.id == application_id).first()
+        result = await db.execute(select(Application).where(Application.id == application_id))
+        application = result.scalars().first()
         if not application:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -178,11 +63,12 @@ async def get_approval_status(
             )
 
         # Get all approvals with admin info
-        approvals = db.query(ApplicationApproval).options(
+        result = await db.execute(select(ApplicationApproval).options(
             joinedload(ApplicationApproval.admin)
-        ).filter(
+        ).where(
             ApplicationApproval.application_id == application_id
-        ).all()
+        ))
+        approvals = result.scalars().all()
 
         # Count approvals and declines
         approval_count = sum(1 for a in approvals if a.approved)
@@ -239,15 +125,16 @@ async def get_approval_status(
 async def create_note(
     application_id: str,
     note_data: AdminNoteCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Create a new admin note on an application
     Admin-only endpoint
     """
     # Verify application exists
-    application = db.query(Application).filter(Application.id == application_id).first()
+    result = await db.execute(select(Application).where(Application.id == application_id))
+    application = result.scalars().first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -261,13 +148,14 @@ async def create_note(
         note=note_data.note
     )
     db.add(note)
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    await db.refresh(note)
 
     # Load admin info
-    note = db.query(AdminNote).options(
+    result = await db.execute(select(AdminNote).options(
         joinedload(AdminNote.admin)
-    ).filter(AdminNote.id == note.id).first()
+    ).where(AdminNote.id == note.id))
+    note = result.scalars().first()
 
     return note
 
@@ -275,15 +163,16 @@ async def create_note(
 @router.get("/applications/{application_id}/notes", response_model=List[AdminNoteSchema])
 async def get_notes(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Get all notes for an application
     Admin-only endpoint
     """
     # Verify application exists
-    application = db.query(Application).filter(Application.id == application_id).first()
+    result = await db.execute(select(Application).where(Application.id == application_id))
+    application = result.scalars().first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -291,11 +180,12 @@ async def get_notes(
         )
 
     # Get notes with admin info, ordered by most recent first
-    notes = db.query(AdminNote).options(
+    result = await db.execute(select(AdminNote).options(
         joinedload(AdminNote.admin)
-    ).filter(
+    ).where(
         AdminNote.application_id == application_id
-    ).order_by(AdminNote.created_at.desc()).all()
+    ).order_by(AdminNote.created_at.desc()))
+    notes = result.scalars().all()
 
     return notes
 
@@ -303,8 +193,8 @@ async def get_notes(
 @router.post("/applications/{application_id}/approve")
 async def approve_application(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Approve an application (admin marks their approval)
@@ -313,7 +203,8 @@ async def approve_application(
     Admin-only endpoint
     """
     try:
-        application = db.query(Application).filter(Application.id == application_id).first()
+        result = await db.execute(select(Application).where(Application.id == application_id))
+        application = result.scalars().first()
         if not application:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -321,10 +212,11 @@ async def approve_application(
             )
 
         # Check if this admin already has an approval/decline record
-        existing = db.query(ApplicationApproval).filter(
+        result = await db.execute(select(ApplicationApproval).where(
             ApplicationApproval.application_id == application_id,
             ApplicationApproval.admin_id == current_user.id
-        ).first()
+        ))
+        existing = result.scalars().first()
 
         if existing:
             # Update existing record
@@ -339,17 +231,17 @@ async def approve_application(
             )
             db.add(approval)
 
-        db.flush()  # Flush to get the record in the session
+        await db.flush()  # Flush to get the record in the session
 
         # Count total approvals (approved=True)
-        approval_count = db.query(ApplicationApproval).filter(
+        approval_count = await db.scalar(select(func.count(ApplicationApproval.id)).where(
             ApplicationApproval.application_id == application_id,
             ApplicationApproval.approved == True
-        ).count()
+        ))
 
         # NOTE: 3 approvals no longer auto-accept - admin must manually click Accept button
-        db.commit()
-        db.refresh(application)
+        await db.commit()
+        await db.refresh(application)
 
         return {
             "message": "Application approved successfully",
@@ -361,7 +253,7 @@ async def approve_application(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         import traceback
         traceback.print_exc()
         raise HTTPException(
@@ -373,8 +265,8 @@ async def approve_application(
 @router.post("/applications/{application_id}/decline")
 async def decline_application(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Decline an application (admin marks their decline)
@@ -384,7 +276,8 @@ async def decline_application(
     Admin-only endpoint
     """
     try:
-        application = db.query(Application).filter(Application.id == application_id).first()
+        result = await db.execute(select(Application).where(Application.id == application_id))
+        application = result.scalars().first()
         if not application:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -392,10 +285,11 @@ async def decline_application(
             )
 
         # Check if this admin already has an approval/decline record
-        existing = db.query(ApplicationApproval).filter(
+        result = await db.execute(select(ApplicationApproval).where(
             ApplicationApproval.application_id == application_id,
             ApplicationApproval.admin_id == current_user.id
-        ).first()
+        ))
+        existing = result.scalars().first()
 
         if existing:
             # Update existing record to declined
@@ -410,18 +304,18 @@ async def decline_application(
             )
             db.add(decline)
 
-        db.commit()
+        await db.commit()
 
         # Count approvals and declines
-        approval_count = db.query(ApplicationApproval).filter(
+        approval_count = await db.scalar(select(func.count(ApplicationApproval.id)).where(
             ApplicationApproval.application_id == application_id,
             ApplicationApproval.approved == True
-        ).count()
+        ))
 
-        decline_count = db.query(ApplicationApproval).filter(
+        decline_count = await db.scalar(select(func.count(ApplicationApproval.id)).where(
             ApplicationApproval.application_id == application_id,
             ApplicationApproval.approved == False
-        ).count()
+        ))
 
         return {
             "message": "Application declined",
@@ -433,7 +327,7 @@ async def decline_application(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         import traceback
         traceback.print_exc()
         raise HTTPException(
@@ -445,8 +339,8 @@ async def decline_application(
 @router.post("/applications/{application_id}/accept")
 async def accept_application(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Accept an application (manually transition to 'accepted' status)
@@ -457,7 +351,8 @@ async def accept_application(
     Admin/Super Admin only endpoint
     """
     try:
-        application = db.query(Application).filter(Application.id == application_id).first()
+        result = await db.execute(select(Application).where(Application.id == application_id))
+        application = result.scalars().first()
         if not application:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -472,12 +367,13 @@ async def accept_application(
             )
 
         # Count approvals and verify 3 approvals from different teams
-        approvals = db.query(ApplicationApproval).options(
+        result = await db.execute(select(ApplicationApproval).options(
             joinedload(ApplicationApproval.admin)
-        ).filter(
+        ).where(
             ApplicationApproval.application_id == application_id,
             ApplicationApproval.approved == True
-        ).all()
+        ))
+        approvals = result.scalars().all()
 
         approval_count = len(approvals)
         if approval_count < 3:
@@ -498,14 +394,14 @@ async def accept_application(
         application.status = 'accepted'
         application.accepted_at = datetime.now(timezone.utc)
 
-        db.commit()
-        db.refresh(application)
+        await db.commit()
+        await db.refresh(application)
 
         # Recalculate progress - will now include conditional post-acceptance questions
         from app.api.applications import calculate_completion_percentage
-        new_progress = calculate_completion_percentage(db, application_id)
+        new_progress = await calculate_completion_percentage(db, application_id)
         application.completion_percentage = new_progress
-        db.commit()
+        await db.commit()
 
         # TODO: Send acceptance email to family
 
@@ -520,7 +416,7 @@ async def accept_application(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         import traceback
         traceback.print_exc()
         raise HTTPException(
@@ -533,17 +429,19 @@ async def accept_application(
 async def update_application_admin(
     application_id: str,
     update_data: ApplicationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Update application as admin (can edit any application)
     Admin-only endpoint
     """
     try:
-        application = db.query(Application).filter(
+        # Row lock: serializes with family autosaves, whose delta mode checks response versions
+        result = await db.execute(select(Application).where(
             Application.id == application_id
-        ).first()
+        ).with_for_update())
+        application = result.scalars().first()
 
         if not application:
             raise HTTPException(
@@ -557,37 +455,23 @@ async def update_application_admin(
         if update_data.camper_last_name is not None:
             application.camper_last_name = update_data.camper_last_name
 
-        # Save responses if provided
+        # Save responses if provided (one upsert for the whole batch)
         if update_data.responses:
-            for response_data in update_data.responses:
-                # Check if response already exists
-                existing_response = db.query(ApplicationResponse).filter(
-                    ApplicationResponse.application_id == application_id,
-                    ApplicationResponse.question_id == response_data.question_id
-                ).first()
-
-                if existing_response:
-                    # Update existing response
-                    existing_response.response_value = response_data.response_value
-                    existing_response.file_id = response_data.file_id
-                else:
-                    # Create new response
-                    new_response = ApplicationResponse(
-                        application_id=application_id,
-                        question_id=response_data.question_id,
-                        response_value=response_data.response_value,
-                        file_id=response_data.file_id
-                    )
-                    db.add(new_response)
-
-        db.commit()
-        db.refresh(application)
+            await response_service.upsert_responses(db, application, [
+                (r.question_id, r.response_value, r.file_id) for r in update_data.responses
+            ])
+
+            # Completion counters are rebuilt on the family's next autosave
+            application.completion_state = None
+
+        await db.commit()
+        await db.refresh(application)
 
         return application
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         import traceback
         traceback.print_exc()
         raise HTTPException(
@@ -3,16 +3,21 @@ Application Builder API endpoints for super admins
 Manage application sections and questions
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import List, Optional, Union, Dict, Any
 from pydantic import BaseModel
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload, object_session
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.form_logic import describe_cycle, find_condition_cycle
+from app.core.form_schema import FormQuestion, FormSection, form_schema_cache
+from app.core.http_cache import conditional_response, make_etag
+from app.core.principal_cache import Principal
 from app.models.application import ApplicationSection, ApplicationQuestion, ApplicationHeader
+from app.services import response_service
 
 router = APIRouter(prefix="/application-builder", tags=["application-builder"])
 
@@ -138,14 +143,14 @@ class HeaderResponse(HeaderBase):
 
 
 # Helper function to check super admin
-def require_super_admin(current_user: User = Depends(get_current_user)):
+def require_super_admin(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "super_admin":
         raise HTTPException(status_code=403, detail="Super admin access required")
     return current_user
 
 
 def convert_header_to_response(header: ApplicationHeader) -> dict:
-    """Convert SQLAlchemy header model to response dict"""
+    """Convert a SQLAlchemy header model (or snapshot header) to response dict"""
     return {
         "id": str(header.id),
         "section_id": str(header.section_id),
@@ -157,8 +162,8 @@ def convert_header_to_response(header: ApplicationHeader) -> dict:
     }
 
 
-def convert_section_to_response(section: ApplicationSection) -> dict:
-    """Convert SQLAlchemy section model to response dict"""
+def convert_section_to_response(section: Union[ApplicationSection, FormSection]) -> dict:
+    """Convert a SQLAlchemy section model (or snapshot section) to response dict"""
     return {
         "id": str(section.id),
         "title": section.title,
@@ -173,13 +178,16 @@ def convert_section_to_response(section: ApplicationSection) -> dict:
     }
 
 
-def convert_question_to_response(question: ApplicationQuestion) -> dict:
-    """Convert SQLAlchemy question model to response dict"""
+def convert_question_to_response(question: Union[ApplicationQuestion, FormQuestion]) -> dict:
+    """Convert a SQLAlchemy question model (or snapshot question) to response dict"""
     # Get template filename if template_file_id exists
     from app.models.application import File as FileModel
 
     template_filename = None
-    if question.template_file_id:
+    if isinstance(question, FormQuestion):
+        # Resolved when the snapshot was built
+        template_filename = question.template_filename
+    elif question.template_file_id:
         try:
             session = object_session(question)
             if session:
@@ -215,32 +223,50 @@ def convert_question_to_response(question: ApplicationQuestion) -> dict:
     }
 
 
+def check_condition_cycle(db: Session, question_id: UUID, trigger_id: Optional[UUID]) -> None:
+    """Reject making trigger_id the show-if trigger of question_id if that would create a loop"""
+    rows = db.query(
+        ApplicationQuestion.id, ApplicationQuestion.show_if_question_id, ApplicationQuestion.question_text
+    ).all()
+    cycle = find_condition_cycle({row.id: row.show_if_question_id for row in rows}, question_id, trigger_id)
+    if cycle:
+        labels = {row.id: row.question_text for row in rows}
+        raise HTTPException(
+            status_code=400,
+            detail=f"Conditional logic would create a loop: {describe_cycle(cycle, labels)}"
+        )
+
+
 # Section Endpoints
 @router.get("/sections")
 async def get_all_sections(
+    request: Request,
+    response: Response,
     include_inactive: bool = False,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_super_admin)
 ):
-    """Get all application sections with their questions"""
+    """Get all application sections with their questions (304 if the form hasn't changed)"""
 
-    query = db.query(ApplicationSection).options(
-        joinedload(ApplicationSection.questions)
+    snapshot = await form_schema_cache.get(db)
+    not_modified = conditional_response(
+        request, response, make_etag(snapshot.fingerprint, "all" if include_inactive else "active")
     )
+    if not_modified:
+        return not_modified
 
-    if not include_inactive:
-        query = query.filter(ApplicationSection.is_active == True)
-
-    sections = query.order_by(ApplicationSection.order_index).all()
-
-    return [convert_section_to_response(section) for section in sections]
+    return [
+        convert_section_to_response(section)
+        for section in snapshot.sections
+        if include_inactive or section.is_active
+    ]
 
 
 @router.post("/sections")
 async def create_section(
     section: SectionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Create a new application section"""
 
@@ -259,6 +285,7 @@ async def create_section(
 
     db.add(new_section)
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(new_section)
 
     # Load questions relationship
@@ -272,7 +299,7 @@ async def update_section(
     section_id: UUID,
     section: SectionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Update an application section"""
 
@@ -300,6 +327,7 @@ async def update_section(
         db_section.show_when_status = show_when_status_value
 
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(db_section)
 
     return convert_section_to_response(db_section)
@@ -309,7 +337,7 @@ async def update_section(
 async def delete_section(
     section_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Delete an application section (and all its questions via CASCADE)"""
 
@@ -320,8 +348,11 @@ async def delete_section(
     if not db_section:
         raise HTTPException(status_code=404, detail="Section not found")
 
+    # Their responses go with them; drop them from the applications' response copies
+    response_service.forget_questions(db, [q.id for q in db_section.questions])
     db.delete(db_section)
     db.commit()
+    form_schema_cache.invalidate()
 
     return {"message": "Section deleted successfully"}
 
@@ -331,7 +362,7 @@ async def delete_section(
 async def create_question(
     question: QuestionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Create a new question in a section"""
 
@@ -374,6 +405,7 @@ async def create_question(
 
     db.add(new_question)
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(new_question)
 
     return convert_question_to_response(new_question)
@@ -384,7 +416,7 @@ async def update_question(
     question_id: UUID,
     question: QuestionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Update a question"""
 
@@ -425,6 +457,7 @@ async def update_question(
     if question.template_file_id is not None:
         db_question.template_file_id = question.template_file_id
     if question.show_if_question_id is not None:
+        check_condition_cycle(db, db_question.id, question.show_if_question_id)
         db_question.show_if_question_id = question.show_if_question_id
     if question.show_if_answer is not None:
         db_question.show_if_answer = question.show_if_answer
@@ -435,6 +468,7 @@ async def update_question(
         db_question.detail_prompt_text = question.detail_prompt_text if question.detail_prompt_text else None
 
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(db_question)
 
     return convert_question_to_response(db_question)
@@ -444,7 +478,7 @@ async def update_question(
 async def delete_question(
     question_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Delete a question"""
 
@@ -455,8 +489,10 @@ async def delete_question(
     if not db_question:
         raise HTTPException(status_code=404, detail="Question not found")
 
+    response_service.forget_questions(db, [db_question.id])
     db.delete(db_question)
     db.commit()
+    form_schema_cache.invalidate()
 
     return {"message": "Question deleted successfully"}
 
@@ -465,7 +501,7 @@ async def delete_question(
 async def duplicate_question(
     question_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Duplicate a question - creates a copy with ' - Copy' appended to the name"""
 
@@ -508,6 +544,7 @@ async def duplicate_question(
 
     db.add(duplicated_question)
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(duplicated_question)
 
     return convert_question_to_response(duplicated_question)
@@ -517,7 +554,7 @@ async def duplicate_question(
 async def reorder_sections(
     section_ids: List[UUID],
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Reorder sections by providing ordered list of section IDs"""
 
@@ -528,6 +565,7 @@ async def reorder_sections(
         ).update({"order_index": index})
 
     db.commit()
+    form_schema_cache.invalidate()
 
     return {"message": "Sections reordered successfully"}
 
@@ -536,7 +574,7 @@ async def reorder_sections(
 async def reorder_questions(
     question_ids: List[UUID],
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Reorder questions within a section by providing ordered list of question IDs"""
 
@@ -547,6 +585,7 @@ async def reorder_questions(
         ).update({"order_index": index})
 
     db.commit()
+    form_schema_cache.invalidate()
 
     return {"message": "Questions reordered successfully"}
 
@@ -556,7 +595,7 @@ async def reorder_questions(
 async def create_header(
     header: HeaderCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Create a new header in a section"""
 
@@ -577,6 +616,7 @@ async def create_header(
 
     db.add(db_header)
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(db_header)
 
     return convert_header_to_response(db_header)
@@ -587,7 +627,7 @@ async def update_header(
     header_id: UUID,
     header: HeaderUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Update an existing header"""
 
@@ -607,6 +647,7 @@ async def update_header(
         db_header.is_active = header.is_active
 
     db.commit()
+    form_schema_cache.invalidate()
     db.refresh(db_header)
 
     return convert_header_to_response(db_header)
@@ -616,7 +657,7 @@ async def update_header(
 async def delete_header(
     header_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Delete a header"""
 
@@ -629,6 +670,7 @@ async def delete_header(
 
     db.delete(db_header)
     db.commit()
+    form_schema_cache.invalidate()
 
     return {"message": "Header deleted successfully"}
 
@@ -637,7 +679,7 @@ async def delete_header(
 async def reorder_headers(
     header_ids: List[UUID],
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_super_admin)
+    current_user: Principal = Depends(require_super_admin)
 ):
     """Reorder headers within a section by providing ordered list of header IDs"""
 
@@ -648,5 +690,6 @@ async def reorder_headers(
         ).update({"order_index": index})
 
     db.commit()
+    form_schema_cache.invalidate()
 
     return {"message": "Headers reordered successfully"}
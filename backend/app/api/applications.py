@@ -3,40 +3,47 @@ Application API endpoints
 """
 
 from datetime import datetime, timezone
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from app.core.database import get_db
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import func, select
+from app.core.database import get_async_db
 from app.core.deps import get_current_user, get_current_admin_user
-from app.models.user import User
-from app.models.application import (
-    Application,
-    ApplicationSection,
-    ApplicationQuestion,
-    ApplicationResponse,
-    ApplicationApproval
-)
+from app.core.form_schema import form_schema_cache
+from app.core.http_cache import cached_json_response, make_etag
+from app.core.pagination import InvalidCursor
+from app.core.principal_cache import Principal
+from app.models.application import Application
 from app.schemas.application import (
     ApplicationSectionWithQuestions,
     ApplicationCreate,
     ApplicationUpdate,
+    ApplicationDeltaUpdate,
+    ApplicationDeltaResult,
+    ResponseConflict,
+    SavedResponse,
     Application as ApplicationSchema,
     ApplicationWithResponses,
     ApplicationWithUser,
+    ApplicationListPage,
+    ApplicationSearchResult,
     ApplicationProgress,
-    SectionProgress,
     ApplicationResponseCreate
 )
+from app.services import application_list_service, completion_service, export_service, progress_service, response_service
+from app.services.completion_service import CompletionUpdate
 
 router = APIRouter()
 
 
 @router.get("/sections", response_model=List[ApplicationSectionWithQuestions])
 async def get_application_sections(
+    request: Request,
     application_id: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get all active application sections with their questions
@@ -44,62 +51,34 @@ async def get_application_sections(
     Optionally filters sections/questions based on application status for conditional display.
     Pass application_id to get sections relevant to that application's current status.
 
-    Returns sections in order with all active questions
+    Returns sections in order with all active questions. The ETag changes
+    whenever the form or the status filter does; a matching If-None-Match
+    gets 304 Not Modified.
     """
     # Get application status if application_id provided
     app_status = None
     if application_id:
-        application = db.query(Application).filter(
+        result = await db.execute(select(Application.status).where(
             Application.id == application_id,
             Application.user_id == current_user.id
-        ).first()
-        if application:
-            app_status = application.status
-
-    # Build query for sections
-    sections_query = db.query(ApplicationSection).filter(
-        ApplicationSection.is_active == True
+        ))
+        app_status = result.scalars().first()
+
+    # Sections and questions come from the in-memory form snapshot, already
+    # rendered to JSON for each status
+    snapshot = await form_schema_cache.get(db)
+    return cached_json_response(
+        request,
+        make_etag(snapshot.fingerprint, app_status or "none"),
+        snapshot.visible_sections_json(app_status),
     )
 
-    # Filter sections by status if applicable
-    if app_status:
-        # Show sections that have no status requirement OR match the current status
-        sections_query = sections_query.filter(
-            (ApplicationSection.show_when_status == None) |
-            (ApplicationSection.show_when_status == app_status)
-        )
-    else:
-        # If no application or status, only show sections with no status requirement
-        sections_query = sections_query.filter(
-            ApplicationSection.show_when_status == None
-        )
-
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Filter questions within each section
-    if app_status:
-        for section in sections:
-            # Filter questions to only show those matching the status
-            section.questions = [
-                q for q in section.questions
-                if q.is_active and (q.show_when_status is None or q.show_when_status == app_status)
-            ]
-    else:
-        for section in sections:
-            # Only show questions with no status requirement
-            section.questions = [
-                q for q in section.questions
-                if q.is_active and q.show_when_status is None
-            ]
-
-    return sections
-
 
 @router.post("", response_model=ApplicationSchema, status_code=status.HTTP_201_CREATED)
 async def create_application(
     application_data: ApplicationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new application for the current user
@@ -107,9 +86,10 @@ async def create_application(
     Users can only have one active application at a time
     """
     # Check if user already has an application
-    existing = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.user_id == current_user.id
-    ).first()
+    ))
+    existing = result.scalars().first()
 
     if existing:
         raise HTTPException(
@@ -126,103 +106,118 @@ async def create_application(
     )
 
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    await db.commit()
+    await db.refresh(application)
 
     return application
 
 
 @router.get("", response_model=List[ApplicationSchema])
 async def get_my_applications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get all applications for the current user
     """
-    applications = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.user_id == current_user.id
-    ).all()
+    ))
+    applications = result.scalars().all()
 
     return applications
 
 
-@router.get("/admin/all")
+@router.get("/admin/all", response_model=ApplicationListPage)
 async def get_all_applications_admin(
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, description="Search by camper name or user email"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    limit: int = Query(application_list_service.DEFAULT_PAGE_SIZE, ge=1, le=application_list_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: Literal["updated_at", "completion", "completed_at", "camper_name"] = Query("updated_at"),
+    order: Optional[Literal["asc", "desc"]] = Query(None, description="Defaults to asc for camper_name, desc otherwise"),
+    facets: bool = Query(False, description="Also return counts by status, completion and approving team"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
-    Admin-only: Get all applications with filtering and user information
+    Admin-only: Get applications with filtering and user information, a page at a time
 
     Query Parameters:
     - status_filter: Filter by application status (in_progress, under_review, approved, etc.)
     - search: Search by camper name or user email
+    - limit: Page size
+    - cursor: Continue after the previous page (its next_cursor)
+    - sort / order: Sort key and direction; a cursor only continues the sort it came from
+    - facets: Include counts for the search (ignoring status_filter and cursor), in the same query
     """
-    from sqlalchemy.orm import joinedload
-
-    query = db.query(Application).join(User, Application.user_id == User.id).options(
-        joinedload(Application.user),
-        joinedload(Application.responses),
-        joinedload(Application.approvals).joinedload(ApplicationApproval.admin)
-    )
-
-    # Apply status filter
-    if status_filter:
-        query = query.filter(Application.status == status_filter)
-
-    # Apply search filter
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Application.camper_first_name.ilike(search_term),
-                Application.camper_last_name.ilike(search_term),
-                User.email.ilike(search_term),
-                User.first_name.ilike(search_term),
-                User.last_name.ilike(search_term)
-            )
+    try:
+        return await application_list_service.list_applications(
+            db, status_filter=status_filter, search=search, limit=limit, cursor=cursor,
+            sort=sort, descending=None if order is None else order == "desc", facets=facets
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
         )
 
-    # Order by most recent first
-    query = query.order_by(Application.updated_at.desc())
 
-    applications = query.all()
+@router.get("/admin/search", response_model=List[ApplicationSearchResult])
+async def search_applications_admin(
+    q: str = Query(..., min_length=1, description="Words to match against camper and parent names and parent email"),
+    limit: int = Query(application_list_service.DEFAULT_SEARCH_RESULTS, ge=1, le=application_list_service.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Admin-only: Ranked application search
 
-    # Convert to dict and add approval information
-    result = []
-    for app in applications:
-        app_dict = ApplicationWithUser.model_validate(app).model_dump()
+    Every word must match the start of a word in the camper's name or the
+    parent's name or email ("jo smi" finds Jordan Smith). Camper-name matches
+    rank above parent matches.
+    """
+    return await application_list_service.search_applications(db, q, limit=limit)
 
-        # Add approval stats
-        approvals = [a for a in app.approvals if a.approved]
-        app_dict['approval_count'] = len(approvals)
-        app_dict['approved_by_teams'] = [a.admin.team for a in approvals if a.admin and a.admin.team]
 
-        result.append(app_dict)
+@router.get("/admin/export")
+async def export_applications_admin(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    status_filter: Optional[str] = Query(None, description="Filter by status"),
+    search: Optional[str] = Query(None, description="Search by camper name or user email"),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Admin-only: Download applications with one column per question
 
-    return result
+    Streams a CSV (header row of question text) or NDJSON (one object per
+    application, keyed by the same headers), most recently updated first.
+    Takes the same status_filter and search as /admin/all.
+    """
+    filename = f"applications-{datetime.now(timezone.utc):%Y-%m-%d}.{format}"
+    return StreamingResponse(
+        export_service.export_applications(format, status_filter=status_filter, search=search),
+        media_type=export_service.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/admin/{application_id}", response_model=ApplicationWithUser)
 async def get_application_admin(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Admin-only: Get any application with all responses and user info
     """
-    from sqlalchemy.orm import joinedload
-
-    application = db.query(Application).options(
-        joinedload(Application.user),
-        joinedload(Application.responses)
-    ).filter(
+    # Responses come from application_data, so no join on application_responses
+    result = await db.execute(select(Application).options(
+        joinedload(Application.user)
+    ).where(
         Application.id == application_id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -236,20 +231,18 @@ async def get_application_admin(
 @router.get("/{application_id}", response_model=ApplicationWithResponses)
 async def get_application(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get a specific application with all responses (user must own the application)
     """
-    from sqlalchemy.orm import joinedload
-
-    application = db.query(Application).options(
-        joinedload(Application.responses)
-    ).filter(
+    # Responses come from application_data: one row, no join
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -264,8 +257,8 @@ async def get_application(
 async def update_application(
     application_id: str,
     update_data: ApplicationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update application and save responses (autosave)
@@ -275,10 +268,12 @@ async def update_application(
     - Saving/updating responses to questions
     - Calculating completion percentage
     """
-    application = db.query(Application).filter(
+    # Row lock: concurrent autosaves of one application update its counters in turn
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ).with_for_update())
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -292,59 +287,49 @@ async def update_application(
     if update_data.camper_last_name is not None:
         application.camper_last_name = update_data.camper_last_name
 
-    # Save responses if provided
+    # Reads the previous answers of the questions being saved, so must run first
+    completion_update = await CompletionUpdate.start(db, application, {
+        r.question_id: r.response_value for r in update_data.responses or ()
+    })
+
+    # Save responses if provided (one upsert for the whole batch)
     if update_data.responses:
-        for response_data in update_data.responses:
-            # Check if response already exists
-            existing_response = db.query(ApplicationResponse).filter(
-                ApplicationResponse.application_id == application_id,
-                ApplicationResponse.question_id == response_data.question_id
-            ).first()
-
-            if existing_response:
-                # Update existing response
-                existing_response.response_value = response_data.response_value
-                existing_response.file_id = response_data.file_id
-            else:
-                # Create new response
-                new_response = ApplicationResponse(
-                    application_id=application_id,
-                    question_id=response_data.question_id,
-                    response_value=response_data.response_value,
-                    file_id=response_data.file_id
-                )
-                db.add(new_response)
-
-    # Calculate completion percentage
-    completion = calculate_completion_percentage(db, application_id)
-    application.completion_percentage = completion
-
-    # Auto-mark as under_review when 100% complete
-    if completion == 100 and application.status == "in_progress":
-        application.status = "under_review"
-        application.completed_at = datetime.now(timezone.utc)
+        await response_service.upsert_responses(db, application, [
+            (r.question_id, r.response_value, r.file_id) for r in update_data.responses
+        ])
 
-    db.commit()
-    db.refresh(application)
+    # Update completion counters from the saved responses
+    completion = await completion_update.finish()
+    _mark_under_review_if_complete(application, completion)
+
+    await db.commit()
+    await db.refresh(application)
 
     return application
 
 
-@router.get("/{application_id}/progress", response_model=ApplicationProgress)
-async def get_application_progress(
+@router.patch("/{application_id}/responses", response_model=ApplicationDeltaResult)
+async def save_response_changes(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    update_data: ApplicationDeltaUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get detailed progress for an application
+    Delta autosave: save only the responses that changed
 
-    Returns completion status for each section and overall progress
+    Each change carries the version of the response the client last saw.
+    - Changes matching what is already saved are skipped (no write)
+    - Responses changed by someone else since that version (e.g. an admin)
+      are not overwritten; they come back in `conflicts` with the saved value
+    - Everything else is saved and comes back in `saved` with its new version
     """
-    application = db.query(Application).filter(
+    # Row lock: admin edits and uploads lock it too, so versions can't move under us
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ).with_for_update())
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -352,175 +337,99 @@ async def get_application_progress(
             detail="Application not found"
         )
 
-    # Get application status for conditional filtering
-    app_status = application.status
-
-    # Get sections filtered by status
-    sections_query = db.query(ApplicationSection).filter(
-        ApplicationSection.is_active == True
-    )
+    if update_data.camper_first_name is not None:
+        application.camper_first_name = update_data.camper_first_name
+    if update_data.camper_last_name is not None:
+        application.camper_last_name = update_data.camper_last_name
 
-    # Filter sections by status
-    if app_status:
-        sections_query = sections_query.filter(
-            (ApplicationSection.show_when_status == None) |
-            (ApplicationSection.show_when_status == app_status)
-        )
+    # Last change per question wins, as in the full autosave
+    changes = {change.question_id: change for change in update_data.changes}
+    stored = await response_service.load_stored_responses(db, application.id, changes.keys())
+
+    writes, unchanged, conflicts = {}, [], []
+    for question_id, change in changes.items():
+        current = stored.get(question_id)
+        if current is not None and current.matches(change.response_value, change.file_id):
+            unchanged.append(SavedResponse(question_id=question_id, version=current.version))
+        elif (current.version if current is not None else None) != change.base_version:
+            conflicts.append(ResponseConflict(
+                question_id=question_id,
+                response_value=current.response_value if current is not None else None,
+                file_id=current.file_id if current is not None else None,
+                version=current.version if current is not None else None,
+            ))
+        else:
+            writes[question_id] = change
+
+    if writes:
+        completion_update = await CompletionUpdate.start(db, application, {
+            question_id: change.response_value for question_id, change in writes.items()
+        })
+        versions = await response_service.upsert_responses(db, application, [
+            (question_id, change.response_value, change.file_id) for question_id, change in writes.items()
+        ])
+        completion = await completion_update.finish()
+        _mark_under_review_if_complete(application, completion)
     else:
-        sections_query = sections_query.filter(
-            ApplicationSection.show_when_status == None
-        )
-
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Get all responses for this application (we need these to evaluate conditional logic)
-    all_responses = db.query(ApplicationResponse).filter(
-        ApplicationResponse.application_id == application_id
-    ).all()
-
-    # Create a dict of question_id -> response_value for quick lookup
-    response_dict = {str(r.question_id): r.response_value for r in all_responses}
-
-    # Helper function to check if a question should be shown based on conditional logic
-    def should_show_question(question: ApplicationQuestion) -> bool:
-        # If no conditional logic, always show
-        if not question.show_if_question_id or not question.show_if_answer:
-            return True
-
-        # Get the trigger question's response
-        trigger_response = response_dict.get(str(question.show_if_question_id))
+        versions = {}
 
-        # Show the question only if the trigger response matches the expected answer
-        return trigger_response == question.show_if_answer
+    await db.commit()
 
-    section_progress_list = []
-    completed_sections = 0
-
-    for section in sections:
-        # Get questions for this section, filtered by status
-        questions_query = db.query(ApplicationQuestion).filter(
-            ApplicationQuestion.section_id == section.id,
-            ApplicationQuestion.is_active == True
-        )
+    return ApplicationDeltaResult(
+        saved=[SavedResponse(question_id=question_id, version=version) for question_id, version in versions.items()],
+        unchanged=unchanged,
+        conflicts=conflicts,
+        completion_percentage=application.completion_percentage,
+        status=application.status,
+    )
 
-        # Filter questions by status
-        if app_status:
-            questions_query = questions_query.filter(
-                (ApplicationQuestion.show_when_status == None) |
-                (ApplicationQuestion.show_when_status == app_status)
-            )
-        else:
-            questions_query = questions_query.filter(
-                ApplicationQuestion.show_when_status == None
-            )
 
-        questions = questions_query.all()
+def _mark_under_review_if_complete(application: Application, completion: int) -> None:
+    """Auto-mark as under_review when 100% complete"""
+    if completion == 100 and application.status == "in_progress":
+        application.status = "under_review"
+        application.completed_at = datetime.now(timezone.utc)
 
-        # Filter questions by conditional logic
-        visible_questions = [q for q in questions if should_show_question(q)]
 
-        total_questions = len(visible_questions)
-        required_questions = sum(1 for q in visible_questions if q.is_required)
+@router.get("/{application_id}/progress", response_model=ApplicationProgress)
+async def get_application_progress(
+    application_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Get detailed progress for an application
 
-        # Get responses for visible questions only
-        visible_question_ids = [q.id for q in visible_questions]
-        responses = [r for r in all_responses if r.question_id in visible_question_ids]
+    Returns completion status for each section and overall progress
+    """
+    result = await db.execute(select(Application).where(
+        Application.id == application_id,
+        Application.user_id == current_user.id
+    ))
+    application = result.scalars().first()
 
-        answered_questions = len(responses)
-        answered_required = sum(
-            1 for r in responses
-            if any(q.id == r.question_id and q.is_required for q in visible_questions)
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
         )
 
-        # Calculate section completion
-        if required_questions > 0:
-            section_percentage = int((answered_required / required_questions) * 100)
-        else:
-            section_percentage = 100 if answered_questions == total_questions else 0
-
-        is_complete = answered_required == required_questions
-
-        if is_complete:
-            completed_sections += 1
-
-        section_progress_list.append(SectionProgress(
-            section_id=section.id,
-            section_title=section.title,
-            total_questions=total_questions,
-            required_questions=required_questions,
-            answered_questions=answered_questions,
-            answered_required=answered_required,
-            completion_percentage=section_percentage,
-            is_complete=is_complete
-        ))
+    return await progress_service.get_application_progress(db, application)
 
-    # Calculate overall percentage
-    total_sections = len(sections)
-    overall_percentage = int((completed_sections / total_sections) * 100) if total_sections > 0 else 0
 
-    return ApplicationProgress(
-        application_id=application.id,
-        total_sections=total_sections,
-        completed_sections=completed_sections,
-        overall_percentage=overall_percentage,
-        section_progress=section_progress_list
-    )
-
-
-def calculate_completion_percentage(db: Session, application_id: str) -> int:
+async def calculate_completion_percentage(db: AsyncSession, application_id: str) -> int:
     """
-    Calculate the completion percentage for an application
+    Calculate the completion percentage for an application from scratch
     Based on required questions answered, filtered by:
-    1. Application status (show_when_status)
-    2. Conditional logic (show_if_question_id and show_if_answer)
+    1. Application status (show_when_status on sections and questions)
+    2. Conditional logic (show_if_question_id and show_if_answer, transitively)
     """
-    # Get the application to check its status
-    application = db.query(Application).filter(Application.id == application_id).first()
-    if not application:
+    # Get the application status
+    result = await db.execute(select(Application.status).where(Application.id == application_id))
+    row = result.first()
+    if row is None:
         return 0
 
-    app_status = application.status
-
-    # Get all required questions that match the status filter
-    required_questions = db.query(ApplicationQuestion).filter(
-        ApplicationQuestion.is_required == True,
-        ApplicationQuestion.is_active == True,
-        (ApplicationQuestion.show_when_status == None) | (ApplicationQuestion.show_when_status == app_status)
-    ).all()
-
-    if not required_questions:
-        return 100
-
-    # Get all responses for this application (we need these to evaluate conditional logic)
-    responses = db.query(ApplicationResponse).filter(
-        ApplicationResponse.application_id == application_id
-    ).all()
-
-    # Create a dict of question_id -> response_value for quick lookup
-    response_dict = {str(r.question_id): r.response_value for r in responses}
-
-    # Helper function to check if a question should be shown based on conditional logic
-    def should_show_question(question: ApplicationQuestion) -> bool:
-        # If no conditional logic, always show
-        if not question.show_if_question_id or not question.show_if_answer:
-            return True
-
-        # Get the trigger question's response
-        trigger_response = response_dict.get(str(question.show_if_question_id))
-
-        # Show the question only if the trigger response matches the expected answer
-        return trigger_response == question.show_if_answer
-
-    # Count required questions that should actually be visible
-    total_required = sum(1 for q in required_questions if should_show_question(q))
-
-    if total_required == 0:
-        return 100
-
-    # Count answered required questions (only those that should be visible)
-    answered_required = sum(
-        1 for q in required_questions
-        if should_show_question(q) and str(q.id) in response_dict
-    )
-
-    return int((answered_required / total_required) * 100)
+    answers = await completion_service.load_answers(db, application_id)
+    snapshot = await form_schema_cache.get(db)
+    return completion_service.percentage(completion_service.compute_state(snapshot, row.status, answers))
@@ -6,8 +6,14 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import (
+    create_access_token,
+    verify_password_async,
+    get_password_hash_async,
+    password_needs_rehash,
+)
 from app.core.deps import get_current_user
+from app.core.principal_cache import Principal
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
 
@@ -34,7 +40,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -50,7 +56,12 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
 
     # Create access token
-    access_token = create_access_token(subject=str(db_user.id))
+    access_token = create_access_token(
+        subject=str(db_user.id),
+        role=db_user.role,
+        team=db_user.team,
+        token_version=db_user.token_version
+    )
 
     return Token(
         access_token=access_token,
@@ -79,18 +90,27 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
 
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    if not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
+    # Transparently upgrade the hash if BCRYPT_ROUNDS changed since it was made
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(credentials.password)
+
     # Update last login
     user.last_login = datetime.utcnow()
     db.commit()
 
     # Create access token
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(
+        subject=str(user.id),
+        role=user.role,
+        team=user.team,
+        token_version=user.token_version
+    )
 
     return Token(
         access_token=access_token,
@@ -100,17 +120,26 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
     Get current user information
 
     Requires authentication (Bearer token in Authorization header)
     """
-    return UserResponse.model_validate(current_user)
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return UserResponse.model_validate(user)
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: Principal = Depends(get_current_user)):
     """
     Logout (client should discard token)
 
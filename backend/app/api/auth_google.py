@@ -6,14 +6,12 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
 
 from app.core.database import get_db
 from app.core.security import create_access_token
-from app.core.config import settings
 from app.models.user import User
 from app.schemas.user import Token, UserResponse
+from app.services.google_auth_service import verify_google_id_token
 
 router = APIRouter()
 
@@ -40,19 +38,9 @@ async def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db
     - User information
     """
     try:
-        # Verify the Google ID token
-        idinfo = id_token.verify_oauth2_token(
-            auth_data.credential,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID
-        )
-
-        # Verify the token is from Google
-        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token issuer"
-            )
+        # Verify the Google ID token (signature, audience, expiry and issuer)
+        # against cached Google certificates
+        idinfo = await verify_google_id_token(auth_data.credential)
 
         # Extract user information
         google_id = idinfo['sub']
@@ -109,7 +97,12 @@ async def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db
         db.refresh(user)
 
         # Create JWT access token
-        access_token = create_access_token(subject=str(user.id))
+        access_token = create_access_token(
+            subject=str(user.id),
+            role=user.role,
+            team=user.team,
+            token_version=user.token_version
+        )
 
         return Token(
             access_token=access_token,
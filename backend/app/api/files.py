@@ -4,29 +4,42 @@ Handles file uploads and downloads for application documents
 """
 
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Form
-from sqlalchemy.orm import Session, joinedload
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List
 
-from ..core.database import get_db
+from ..core.database import get_async_db
 from ..core.deps import get_current_user
-from ..models.user import User
+from ..core.principal_cache import Principal
 from ..models.application import (
     Application,
     File as FileModel,
-    ApplicationResponse,
     ApplicationQuestion,
 )
-from ..services import storage_service
+from ..services import response_service, storage_service
 from ..core.config import settings
 
 router = APIRouter(prefix="/api/files", tags=["files"])
 
 
+async def _lock_application(db: AsyncSession, application_id) -> Application:
+    """Re-read the application under a row lock before changing its responses"""
+    result = await db.execute(
+        select(Application)
+        .where(Application.id == application_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().one()
+
+
 @router.post("/upload-template")
 async def upload_template_file(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Upload a template file for a question
@@ -61,7 +74,8 @@ async def upload_template_file(
 
     try:
         # Upload to Supabase Storage in templates folder
-        upload_result = storage_service.upload_file(
+        upload_result = await run_in_threadpool(
+            storage_service.upload_file,
             file=file_content,
             filename=file.filename,
             application_id="templates",  # Special folder for templates
@@ -80,8 +94,8 @@ async def upload_template_file(
             section="template"
         )
         db.add(file_record)
-        db.commit()
-        db.refresh(file_record)
+        await db.commit()
+        await db.refresh(file_record)
 
         return {
             "success": True,
@@ -92,7 +106,7 @@ async def upload_template_file(
         }
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
@@ -101,8 +115,8 @@ async def upload_file(
     file: UploadFile = File(...),
     application_id: str = Form(...),
     question_id: str = Form(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Upload a file for an application question
@@ -113,10 +127,11 @@ async def upload_file(
     - Links file to ApplicationResponse
     """
     # Validate application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -142,11 +157,12 @@ async def upload_file(
     # Reset file pointer for upload
     await file.seek(0)
 
-    question = db.query(ApplicationQuestion).options(
+    result = await db.execute(select(ApplicationQuestion).options(
         joinedload(ApplicationQuestion.section)
-    ).filter(
+    ).where(
         ApplicationQuestion.id == question_id
-    ).first()
+    ))
+    question = result.scalars().first()
 
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
@@ -157,7 +173,8 @@ async def upload_file(
 
     try:
         # Upload to Supabase Storage
-        upload_result = storage_service.upload_file(
+        upload_result = await run_in_threadpool(
+            storage_service.upload_file,
             file=file_content,
             filename=file.filename,
             application_id=application_id,
@@ -176,29 +193,19 @@ async def upload_file(
             section=section_label
         )
         db.add(file_record)
-        db.flush()  # Flush to get the file_record.id before using it
-
-        # Update or create ApplicationResponse to link the file
-        response = db.query(ApplicationResponse).filter(
-            ApplicationResponse.application_id == application_id,
-            ApplicationResponse.question_id == question_id
-        ).first()
-
-        if response:
-            # Update existing response with file_id
-            response.file_id = file_record.id
-            response.response_value = None  # Clear text value when file is uploaded
-        else:
-            # Create new response with file
-            response = ApplicationResponse(
-                application_id=application_id,
-                question_id=question_id,
-                file_id=file_record.id
-            )
-            db.add(response)
+        await db.flush()  # Flush to get the file_record.id before using it
+
+        # Lock the application like autosave does (taken only now, not during the storage upload)
+        application = await _lock_application(db, application.id)
+
+        # Link the file to the question's response (clearing any text value)
+        await response_service.upsert_response(db, application, question.id, file_id=file_record.id)
+
+        # Completion counters are rebuilt on the next autosave
+        application.completion_state = None
 
-        db.commit()
-        db.refresh(file_record)
+        await db.commit()
+        await db.refresh(file_record)
 
         return {
             "success": True,
@@ -209,15 +216,15 @@ async def upload_file(
         }
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
 @router.get("/template/{file_id}")
 async def get_template_file(
     file_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get template file metadata and download URL
@@ -225,17 +232,19 @@ async def get_template_file(
     Any authenticated user can download template files
     """
     # Get file record
-    file_record = db.query(FileModel).filter(
+    result = await db.execute(select(FileModel).where(
         FileModel.id == file_id,
         FileModel.section == "template"
-    ).first()
+    ))
+    file_record = result.scalars().first()
 
     if not file_record:
         raise HTTPException(status_code=404, detail="Template file not found")
 
     try:
         # Generate signed URL (valid for 1 hour)
-        signed_url = storage_service.get_signed_url(
+        signed_url = await run_in_threadpool(
+            storage_service.get_signed_url,
             file_record.storage_path,
             expires_in=3600
         )
@@ -256,8 +265,8 @@ async def get_template_file(
 @router.post("/batch")
 async def get_files_batch(
     file_ids: List[str],
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get multiple files' metadata and download URLs in a single request
@@ -268,19 +277,21 @@ async def get_files_batch(
         return []
 
     # Get all file records in one query
-    file_records = db.query(FileModel).filter(
+    result = await db.execute(select(FileModel).where(
         FileModel.id.in_(file_ids)
-    ).all()
+    ))
+    file_records = result.scalars().all()
 
     # Get all associated application IDs
     app_ids = [f.application_id for f in file_records if f.application_id]
 
     # Verify user has access to all applications (batch check)
     if app_ids:
-        user_apps = db.query(Application.id).filter(
+        result = await db.execute(select(Application.id).where(
             Application.id.in_(app_ids),
             Application.user_id == current_user.id
-        ).all()
+        ))
+        user_apps = result.all()
         user_app_ids = {str(app.id) for app in user_apps}
     else:
         user_app_ids = set()
@@ -294,7 +305,8 @@ async def get_files_batch(
 
         try:
             # Generate signed URL
-            signed_url = storage_service.get_signed_url(
+            signed_url = await run_in_threadpool(
+                storage_service.get_signed_url,
                 file_record.storage_path,
                 expires_in=3600
             )
@@ -318,8 +330,8 @@ async def get_files_batch(
 @router.get("/{file_id}")
 async def get_file(
     file_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get file metadata and download URL
@@ -327,25 +339,28 @@ async def get_file(
     Returns file information and a signed URL for downloading
     """
     # Get file record
-    file_record = db.query(FileModel).filter(
+    result = await db.execute(select(FileModel).where(
         FileModel.id == file_id
-    ).first()
+    ))
+    file_record = result.scalars().first()
 
     if not file_record:
         raise HTTPException(status_code=404, detail="File not found")
 
     # Verify user owns the application
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == file_record.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application and current_user.role not in ["admin", "super_admin"]:
         raise HTTPException(status_code=403, detail="Access denied")
 
     try:
         # Generate signed URL (valid for 1 hour)
-        signed_url = storage_service.get_signed_url(
+        signed_url = await run_in_threadpool(
+            storage_service.get_signed_url,
             file_record.storage_path,
             expires_in=3600
         )
@@ -366,8 +381,8 @@ async def get_file(
 @router.delete("/{file_id}")
 async def delete_file(
     file_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Delete a file
@@ -375,36 +390,35 @@ async def delete_file(
     Removes file from storage and database
     """
     # Get file record
-    file_record = db.query(FileModel).filter(
+    result = await db.execute(select(FileModel).where(
         FileModel.id == file_id
-    ).first()
+    ))
+    file_record = result.scalars().first()
 
     if not file_record:
         raise HTTPException(status_code=404, detail="File not found")
 
     # Verify user owns the application
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == file_record.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(status_code=403, detail="Access denied")
 
     try:
         # Delete from storage
-        storage_service.delete_file(file_record.storage_path)
+        await run_in_threadpool(storage_service.delete_file, file_record.storage_path)
 
         # Remove file_id from any responses
-        responses = db.query(ApplicationResponse).filter(
-            ApplicationResponse.file_id == file_id
-        ).all()
-        for response in responses:
-            response.file_id = None
+        application = await _lock_application(db, application.id)
+        await response_service.clear_file(db, application, file_record.id)
 
         # Delete file record
-        db.delete(file_record)
-        db.commit()
+        await db.delete(file_record)
+        await db.commit()
 
         return {
             "success": True,
@@ -412,5 +426,5 @@ async def delete_file(
         }
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete file: {str(e)}")
@@ -4,10 +4,12 @@ Medications and Allergies API endpoints
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.core.database import get_async_db
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.models.application import Application, Medication, MedicationDose, Allergy
 from app.schemas.medication import (
     Medication as MedicationSchema,
@@ -24,6 +26,17 @@ from app.schemas.medication import (
 router = APIRouter()
 
 
+async def _get_medication(db: AsyncSession, medication_id) -> Medication:
+    """Load a medication with its doses (async sessions can't lazy-load)"""
+    result = await db.execute(
+        select(Medication)
+        .options(selectinload(Medication.doses))
+        .where(Medication.id == medication_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
 # ============================================================================
 # MEDICATIONS ENDPOINTS
 # ============================================================================
@@ -31,15 +44,16 @@ router = APIRouter()
 @router.get("/medications/{application_id}", response_model=List[MedicationSchema])
 async def get_medications_for_application(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all medications for an application"""
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -47,9 +61,12 @@ async def get_medications_for_application(
             detail="Application not found"
         )
 
-    medications = db.query(Medication).filter(
+    result = await db.execute(select(Medication).options(
+        selectinload(Medication.doses)
+    ).where(
         Medication.application_id == application_id
-    ).order_by(Medication.order_index).all()
+    ).order_by(Medication.order_index))
+    medications = result.scalars().all()
 
     return medications
 
@@ -58,15 +75,16 @@ async def get_medications_for_application(
 async def get_medications_for_question(
     application_id: str,
     question_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all medications for a specific question in an application"""
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -74,10 +92,13 @@ async def get_medications_for_question(
             detail="Application not found"
         )
 
-    medications = db.query(Medication).filter(
+    result = await db.execute(select(Medication).options(
+        selectinload(Medication.doses)
+    ).where(
         Medication.application_id == application_id,
         Medication.question_id == question_id
-    ).order_by(Medication.order_index).all()
+    ).order_by(Medication.order_index))
+    medications = result.scalars().all()
 
     return medications
 
@@ -85,15 +106,16 @@ async def get_medications_for_question(
 @router.post("/medications", response_model=MedicationSchema, status_code=status.HTTP_201_CREATED)
 async def create_medication(
     medication_data: MedicationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new medication entry"""
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == medication_data.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -112,7 +134,7 @@ async def create_medication(
         order_index=medication_data.order_index
     )
     db.add(medication)
-    db.flush()  # Get the medication ID
+    await db.flush()  # Get the medication ID
 
     # Create doses
     for dose_data in medication_data.doses:
@@ -125,21 +147,21 @@ async def create_medication(
         )
         db.add(dose)
 
-    db.commit()
-    db.refresh(medication)
+    await db.commit()
 
-    return medication
+    return await _get_medication(db, medication.id)
 
 
 @router.put("/medications/{medication_id}", response_model=MedicationSchema)
 async def update_medication(
     medication_id: str,
     medication_data: MedicationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a medication entry"""
-    medication = db.query(Medication).filter(Medication.id == medication_id).first()
+    result = await db.execute(select(Medication).where(Medication.id == medication_id))
+    medication = result.scalars().first()
 
     if not medication:
         raise HTTPException(
@@ -148,10 +170,11 @@ async def update_medication(
         )
 
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == medication.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -171,20 +194,20 @@ async def update_medication(
     if medication_data.order_index is not None:
         medication.order_index = medication_data.order_index
 
-    db.commit()
-    db.refresh(medication)
+    await db.commit()
 
-    return medication
+    return await _get_medication(db, medication.id)
 
 
 @router.delete("/medications/{medication_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_medication(
     medication_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a medication entry"""
-    medication = db.query(Medication).filter(Medication.id == medication_id).first()
+    result = await db.execute(select(Medication).where(Medication.id == medication_id))
+    medication = result.scalars().first()
 
     if not medication:
         raise HTTPException(
@@ -193,10 +216,11 @@ async def delete_medication(
         )
 
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == medication.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -204,8 +228,8 @@ async def delete_medication(
             detail="Not authorized to delete this medication"
         )
 
-    db.delete(medication)
-    db.commit()
+    await db.delete(medication)
+    await db.commit()
 
 
 # ============================================================================
@@ -216,11 +240,12 @@ async def delete_medication(
 async def create_medication_dose(
     medication_id: str,
     dose_data: MedicationDoseCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new dose for a medication"""
-    medication = db.query(Medication).filter(Medication.id == medication_id).first()
+    result = await db.execute(select(Medication).where(Medication.id == medication_id))
+    medication = result.scalars().first()
 
     if not medication:
         raise HTTPException(
@@ -229,10 +254,11 @@ async def create_medication_dose(
         )
 
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == medication.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -248,8 +274,8 @@ async def create_medication_dose(
         order_index=dose_data.order_index
     )
     db.add(dose)
-    db.commit()
-    db.refresh(dose)
+    await db.commit()
+    await db.refresh(dose)
 
     return dose
 
@@ -258,11 +284,12 @@ async def create_medication_dose(
 async def update_medication_dose(
     dose_id: str,
     dose_data: MedicationDoseUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a medication dose"""
-    dose = db.query(MedicationDose).filter(MedicationDose.id == dose_id).first()
+    result = await db.execute(select(MedicationDose).where(MedicationDose.id == dose_id))
+    dose = result.scalars().first()
 
     if not dose:
         raise HTTPException(
@@ -271,11 +298,13 @@ async def update_medication_dose(
         )
 
     # Verify application belongs to user
-    medication = db.query(Medication).filter(Medication.id == dose.medication_id).first()
-    application = db.query(Application).filter(
+    result = await db.execute(select(Medication).where(Medication.id == dose.medication_id))
+    medication = result.scalars().first()
+    result = await db.execute(select(Application).where(
         Application.id == medication.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -293,8 +322,8 @@ async def update_medication_dose(
     if dose_data.order_index is not None:
         dose.order_index = dose_data.order_index
 
-    db.commit()
-    db.refresh(dose)
+    await db.commit()
+    await db.refresh(dose)
 
     return dose
 
@@ -302,11 +331,12 @@ async def update_medication_dose(
 @router.delete("/doses/{dose_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_medication_dose(
     dose_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a medication dose"""
-    dose = db.query(MedicationDose).filter(MedicationDose.id == dose_id).first()
+    result = await db.execute(select(MedicationDose).where(MedicationDose.id == dose_id))
+    dose = result.scalars().first()
 
     if not dose:
         raise HTTPException(
@@ -315,11 +345,13 @@ async def delete_medication_dose(
         )
 
     # Verify application belongs to user
-    medication = db.query(Medication).filter(Medication.id == dose.medication_id).first()
-    application = db.query(Application).filter(
+    result = await db.execute(select(Medication).where(Medication.id == dose.medication_id))
+    medication = result.scalars().first()
+    result = await db.execute(select(Application).where(
         Application.id == medication.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -327,8 +359,8 @@ async def delete_medication_dose(
             detail="Not authorized to delete this dose"
         )
 
-    db.delete(dose)
-    db.commit()
+    await db.delete(dose)
+    await db.commit()
 
 
 # ============================================================================
@@ -338,15 +370,16 @@ async def delete_medication_dose(
 @router.get("/allergies/{application_id}", response_model=List[AllergySchema])
 async def get_allergies_for_application(
     application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all allergies for an application"""
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -354,9 +387,10 @@ async def get_allergies_for_application(
             detail="Application not found"
         )
 
-    allergies = db.query(Allergy).filter(
+    result = await db.execute(select(Allergy).where(
         Allergy.application_id == application_id
-    ).order_by(Allergy.order_index).all()
+    ).order_by(Allergy.order_index))
+    allergies = result.scalars().all()
 
     return allergies
 
@@ -365,15 +399,16 @@ async def get_allergies_for_application(
 async def get_allergies_for_question(
     application_id: str,
     question_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all allergies for a specific question in an application"""
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -381,10 +416,11 @@ async def get_allergies_for_question(
             detail="Application not found"
         )
 
-    allergies = db.query(Allergy).filter(
+    result = await db.execute(select(Allergy).where(
         Allergy.application_id == application_id,
         Allergy.question_id == question_id
-    ).order_by(Allergy.order_index).all()
+    ).order_by(Allergy.order_index))
+    allergies = result.scalars().all()
 
     return allergies
 
@@ -392,15 +428,16 @@ async def get_allergies_for_question(
 @router.post("/allergies", response_model=AllergySchema, status_code=status.HTTP_201_CREATED)
 async def create_allergy(
     allergy_data: AllergyCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new allergy entry"""
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == allergy_data.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -418,8 +455,8 @@ async def create_allergy(
         order_index=allergy_data.order_index
     )
     db.add(allergy)
-    db.commit()
-    db.refresh(allergy)
+    await db.commit()
+    await db.refresh(allergy)
 
     return allergy
 
@@ -428,11 +465,12 @@ async def create_allergy(
 async def update_allergy(
     allergy_id: str,
     allergy_data: AllergyUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update an allergy entry"""
-    allergy = db.query(Allergy).filter(Allergy.id == allergy_id).first()
+    result = await db.execute(select(Allergy).where(Allergy.id == allergy_id))
+    allergy = result.scalars().first()
 
     if not allergy:
         raise HTTPException(
@@ -441,10 +479,11 @@ async def update_allergy(
         )
 
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == allergy.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -464,8 +503,8 @@ async def update_allergy(
     if allergy_data.order_index is not None:
         allergy.order_index = allergy_data.order_index
 
-    db.commit()
-    db.refresh(allergy)
+    await db.commit()
+    await db.refresh(allergy)
 
     return allergy
 
@@ -473,11 +512,12 @@ async def update_allergy(
 @router.delete("/allergies/{allergy_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_allergy(
     allergy_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete an allergy entry"""
-    allergy = db.query(Allergy).filter(Allergy.id == allergy_id).first()
+    result = await db.execute(select(Allergy).where(Allergy.id == allergy_id))
+    allergy = result.scalars().first()
 
     if not allergy:
         raise HTTPException(
@@ -486,10 +526,11 @@ async def delete_allergy(
         )
 
     # Verify application belongs to user
-    application = db.query(Application).filter(
+    result = await db.execute(select(Application).where(
         Application.id == allergy.application_id,
         Application.user_id == current_user.id
-    ).first()
+    ))
+    application = result.scalars().first()
 
     if not application:
         raise HTTPException(
@@ -497,5 +538,5 @@ async def delete_allergy(
             detail="Not authorized to delete this allergy"
         )
 
-    db.delete(allergy)
-    db.commit()
+    await db.delete(allergy)
+    await db.commit()
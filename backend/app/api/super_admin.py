@@ -10,9 +10,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, or_, and_
 from app.core.database import get_db
 from app.core.deps import get_current_super_admin_user
+from app.core.principal_cache import Principal, principal_cache
 from app.models.user import User
 from app.models.application import Application
 from app.models.super_admin import SystemConfiguration, AuditLog, EmailTemplate, Team
+from app.models.types import days_between
 from app.schemas.super_admin import (
     SystemConfiguration as SystemConfigurationSchema,
     SystemConfigurationCreate,
@@ -39,6 +41,11 @@ from app.schemas.user import UserResponse
 router = APIRouter()
 
 
+def _revoke_user_tokens(user: User) -> None:
+    """Bump the user's token_version so tokens carrying the old role/team/status stop working"""
+    user.token_version = (user.token_version or 0) + 1
+
+
 # ============================================================================
 # DASHBOARD & STATISTICS
 # ============================================================================
@@ -46,7 +53,7 @@ router = APIRouter()
 @router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get comprehensive dashboard statistics for super admin"""
 
@@ -103,7 +110,7 @@ async def get_dashboard_stats(
 
     # Average completion time (from created to submitted)
     avg_completion_result = db.query(
-        func.avg(func.extract('epoch', Application.updated_at - Application.created_at) / 86400)
+        func.avg(days_between(Application.updated_at, Application.created_at))
     ).filter(
         Application.status.in_(['under_review', 'accepted', 'paid', 'declined'])
     ).scalar()
@@ -111,7 +118,7 @@ async def get_dashboard_stats(
 
     # Average review time (from submitted to accepted)
     avg_review_result = db.query(
-        func.avg(func.extract('epoch', Application.accepted_at - Application.updated_at) / 86400)
+        func.avg(days_between(Application.accepted_at, Application.updated_at))
     ).filter(
         Application.accepted_at.isnot(None)
     ).scalar()
@@ -141,7 +148,7 @@ async def get_dashboard_stats(
 @router.get("/dashboard/team-performance", response_model=List[TeamPerformance])
 async def get_team_performance(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get performance metrics for each team"""
 
@@ -183,7 +190,7 @@ async def get_all_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get all users with filtering and pagination"""
 
@@ -223,7 +230,7 @@ async def update_user(
     user_id: str,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Update user information"""
 
@@ -241,6 +248,8 @@ async def update_user(
             detail="Cannot modify your own role"
         )
 
+    old_access = (user.role, user.team, user.status)
+
     # Update fields
     if user_data.first_name is not None:
         user.first_name = user_data.first_name
@@ -267,9 +276,16 @@ async def update_user(
             user.suspended_at = datetime.now(timezone.utc)
             user.suspended_by = current_user.id
 
+    # Role and team are signed into access tokens; status changes revoke them too
+    if (user.role, user.team, user.status) != old_access:
+        _revoke_user_tokens(user)
+
     db.commit()
     db.refresh(user)
 
+    # Drop the cached principal so the new role/team/status applies immediately
+    principal_cache.invalidate(user.id)
+
     # Create audit log
     audit_log = AuditLog(
         entity_type='user',
@@ -289,7 +305,7 @@ async def change_user_role(
     user_id: str,
     role_data: UserRoleUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Change user role with team assignment"""
 
@@ -329,9 +345,14 @@ async def change_user_role(
     else:
         user.team = None
 
+    _revoke_user_tokens(user)
+
     db.commit()
     db.refresh(user)
 
+    # Drop the cached principal so the new role/team/status applies immediately
+    principal_cache.invalidate(user.id)
+
     # Create audit log
     audit_log = AuditLog(
         entity_type='user',
@@ -351,7 +372,7 @@ async def suspend_user(
     user_id: str,
     status_data: UserStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Suspend or activate user"""
 
@@ -381,9 +402,15 @@ async def suspend_user(
         user.suspended_by = None
         user.suspension_reason = None
 
+    if old_status != status_data.status:
+        _revoke_user_tokens(user)
+
     db.commit()
     db.refresh(user)
 
+    # Drop the cached principal so the new role/team/status applies immediately
+    principal_cache.invalidate(user.id)
+
     # Create audit log
     audit_log = AuditLog(
         entity_type='user',
@@ -406,7 +433,7 @@ async def suspend_user(
 async def get_all_configurations(
     category: Optional[str] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get all system configurations"""
 
@@ -423,7 +450,7 @@ async def get_all_configurations(
 async def get_configuration(
     key: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get single configuration by key"""
 
@@ -442,7 +469,7 @@ async def update_configuration(
     key: str,
     config_data: SystemConfigurationUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Update system configuration"""
 
@@ -492,7 +519,7 @@ async def update_configuration(
 @router.get("/email-templates", response_model=List[EmailTemplateSchema])
 async def get_all_email_templates(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get all email templates"""
 
@@ -504,7 +531,7 @@ async def get_all_email_templates(
 async def get_email_template(
     key: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get single email template by key"""
 
@@ -523,7 +550,7 @@ async def update_email_template(
     key: str,
     template_data: EmailTemplateUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Update email template"""
 
@@ -575,7 +602,7 @@ async def update_email_template(
 @router.get("/teams", response_model=List[TeamWithAdminCount])
 async def get_all_teams(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get all teams with admin counts"""
 
@@ -599,7 +626,7 @@ async def get_all_teams(
 async def create_team(
     team_data: TeamCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Create new team"""
 
@@ -635,7 +662,7 @@ async def update_team(
     team_id: str,
     team_data: TeamUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Update team"""
 
@@ -690,7 +717,7 @@ async def get_audit_logs(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
+    current_user: Principal = Depends(get_current_super_admin_user)
 ):
     """Get audit logs with filtering"""
 
@@ -3,7 +3,7 @@ Configuration settings for the application
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 
@@ -19,16 +19,36 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # How long get_current_user trusts a cached user
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    FORM_SCHEMA_MAX_AGE_SECONDS: int = 60  # How long a worker serves the cached form without re-reading it
+    BCRYPT_ROUNDS: int = 12  # Cost factor for new hashes; older hashes are upgraded on login
+    PASSWORD_HASH_WORKERS: int = 4  # Threads reserved for bcrypt so logins can't starve the event loop
 
     # Database
     DATABASE_URL: str
-    SUPABASE_URL: str
-    SUPABASE_KEY: str
+    SUPABASE_URL: Optional[str] = None  # Storage is disabled when unset
+    SUPABASE_KEY: Optional[str] = None
+
+    # Database connection pool (applies to both the sync and async engines)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # Wait for a free connection before erroring
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # Postgres statement_timeout, 0 = no limit
+
+    # Health check
+    HEALTH_CHECK_CACHE_SECONDS: int = 5  # Reuse DB/storage probe results for this long
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 3.0
+
+    # Metrics
+    METRICS_TOKEN: Optional[str] = None  # Bearer token for scraping /api/metrics; admins' JWTs always work
 
     # OAuth
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str = "http://localhost:3000/auth/callback/google"
+    GOOGLE_CERTS_FILE: Optional[str] = None  # JSON {kid: PEM cert} used instead of Google's certs (tests/offline)
 
     # Stripe
     STRIPE_SECRET_KEY: str
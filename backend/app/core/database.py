@@ -3,20 +3,102 @@ Database connection and session management
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+# Pool settings shared by the sync and async engines
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+}
+
+
+# SQLite (local tests and benchmarks) uses SQLAlchemy's default pooling
+IS_SQLITE = make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def _sync_connect_args() -> dict:
+    """psycopg2 connect args (statement timeout via libpq options)"""
+    if IS_SQLITE:
+        return {"check_same_thread": False}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    """asyncpg connect args (statement timeout via server settings)"""
+    if IS_SQLITE:
+        return {"check_same_thread": False}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    connect_args=_sync_connect_args(),
+    **({} if IS_SQLITE else POOL_OPTIONS),
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Convert the (sync) DATABASE_URL into its asyncpg equivalent
+
+    asyncpg does not understand libpq's ``sslmode`` parameter, so it is
+    translated to asyncpg's ``ssl`` argument. SQLite URLs are switched to
+    aiosqlite.
+
+    Args:
+        database_url: postgresql:// (or sqlite://) URL used by the sync engine
+
+    Returns:
+        postgresql+asyncpg:// (or sqlite+aiosqlite://) URL string
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if url.get_backend_name() != "postgresql":
+        return database_url
+
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+
+    url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url.render_as_string(hide_password=False)
+
+
+# Create async database engine (asyncpg) for the high-traffic routers
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+    connect_args=_async_connect_args(),
+    **({} if IS_SQLITE else POOL_OPTIONS),
+)
+
+# Create async session factory
+# expire_on_commit=False so ORM objects can still be serialized after commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -32,4 +114,40 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an async database session
+
+    Use this in async routes so queries don't block the event loop.
+
+    Yields:
+        AsyncSession
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pool_status(pool) -> dict:
+    """
+    Snapshot of a connection pool's usage
+
+    Args:
+        pool: SQLAlchemy pool (engine.pool)
+
+    Returns:
+        dict with size, checked_in, checked_out and overflow counts
+    """
+    if not hasattr(pool, "checkedout"):
+        # Pools without usage counters (e.g. SQLite's)
+        return {}
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool reports overflow relative to pool_size (negative until the pool is full)
+        "overflow": max(pool.overflow(), 0),
+    }
@@ -2,60 +2,120 @@
 Dependency injection for FastAPI routes
 """
 
+import secrets
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import decode_access_token
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.principal_cache import Principal, principal_cache
+from app.core.security import decode_access_token_claims
 from app.models.user import User
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
 
+def _credentials_exception(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """
     Get current authenticated user from JWT token
 
+    Tokens carrying role/team/ver claims are authorized from the token
+    itself; the only lookup is the user's current token_version (and
+    status), which is cached in-process (see app.core.principal_cache).
+    A token whose ``ver`` is older than the user's token_version has
+    been revoked. Older tokens without claims fall back to loading the
+    principal from the users table.
+
     Args:
         credentials: Bearer token from Authorization header
         db: Database session
 
     Returns:
-        User model instance
+        Principal for the authenticated user
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or revoked, user not found or suspended
     """
     token = credentials.credentials
-    user_id = decode_access_token(token)
-
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    user = db.query(User).filter(User.id == user_id).first()
-
-    if user is None:
+    claims = decode_access_token_claims(token)
+
+    if claims is None:
+        raise _credentials_exception("Could not validate credentials")
+
+    user_id = claims["sub"]
+    has_claims = "role" in claims and "ver" in claims
+
+    principal = principal_cache.get(user_id)
+
+    if principal is not None and has_claims and claims["ver"] != principal.token_version:
+        # The cached version may be stale (changed by another worker) - re-check the database
+        principal = None
+
+    if principal is None:
+        if has_claims:
+            # Role/team come from the signed token; only the version and status are needed
+            result = await db.execute(
+                select(User.id, User.status, User.token_version).where(User.id == user_id)
+            )
+            row = result.first()
+            if row is not None:
+                principal = Principal(
+                    id=row.id,
+                    role=claims["role"],
+                    team=claims.get("team"),
+                    status=row.status,
+                    token_version=row.token_version,
+                )
+        else:
+            result = await db.execute(
+                select(User.id, User.role, User.team, User.status, User.token_version)
+                .where(User.id == user_id)
+            )
+            row = result.first()
+            if row is not None:
+                principal = Principal(
+                    id=row.id,
+                    role=row.role,
+                    team=row.team,
+                    status=row.status,
+                    token_version=row.token_version,
+                )
+
+        if principal is None:
+            raise _credentials_exception("User not found")
+
+        if not has_claims or claims["ver"] == principal.token_version:
+            principal_cache.set(principal)
+
+    if has_claims and claims["ver"] != principal.token_version:
+        raise _credentials_exception("Token has been revoked")
+
+    if principal.status == "suspended":
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account suspended"
         )
 
-    return user
+    return principal
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Get current active user (email verified)
 
@@ -63,7 +123,7 @@ async def get_current_active_user(
         current_user: Current user from token
 
     Returns:
-        User model instance
+        Principal for the authenticated user
 
     Raises:
         HTTPException: If user email is not verified
@@ -79,8 +139,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Get current user if they are admin or super_admin
 
@@ -88,7 +148,7 @@ async def get_current_admin_user(
         current_user: Current user from token
 
     Returns:
-        User model instance
+        Principal for the authenticated user
 
     Raises:
         HTTPException: If user is not an admin
@@ -101,9 +161,30 @@ async def get_current_admin_user(
     return current_user
 
 
+async def require_metrics_access(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> None:
+    """
+    Allow the metrics scraper (Bearer METRICS_TOKEN) or an admin
+
+    Args:
+        credentials: Bearer token from Authorization header
+        db: Database session (only used for admin tokens)
+
+    Raises:
+        HTTPException: If the token is neither METRICS_TOKEN nor an admin's
+    """
+    if settings.METRICS_TOKEN and secrets.compare_digest(
+        credentials.credentials.encode("utf-8"), settings.METRICS_TOKEN.encode("utf-8")
+    ):
+        return
+    await get_current_admin_user(await get_current_user(credentials, db))
+
+
 async def get_current_super_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Get current user if they are super_admin
 
@@ -111,7 +192,7 @@ async def get_current_super_admin_user(
         current_user: Current user from token
 
     Returns:
-        User model instance
+        Principal for the authenticated user
 
     Raises:
         HTTPException: If user is not a super admin
@@ -0,0 +1,174 @@
+"""
+Conditional question visibility
+
+A question with show_if_question_id/show_if_answer is shown only when its
+trigger question is itself shown and was answered with show_if_answer. The
+edges are compiled once per form snapshot into a topological order
+(triggers before the questions they control), so visibility for a whole
+application is one pass over the questions with dictionary lookups, and
+hiding a trigger hides everything chained off it.
+
+The application builder rejects edits that would create a cycle; questions
+caught in a cycle that already exists in the data are treated as hidden.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+
+def find_condition_cycle(
+    triggers: Mapping[UUID, Optional[UUID]],
+    question_id: UUID,
+    trigger_id: Optional[UUID],
+) -> Optional[List[UUID]]:
+    """
+    The cycle that making `trigger_id` the trigger of `question_id` would close
+
+    `triggers` maps every question id to its current show_if_question_id.
+    Returns the question ids along the cycle (starting and ending with
+    `question_id`), or None if the edit is safe.
+    """
+    if trigger_id is None:
+        return None
+
+    # A question has at most one trigger, so following triggers upwards from
+    # the new trigger either ends at an unconditional question or comes back
+    path = [question_id]
+    current = trigger_id
+    seen = {question_id}
+    while current is not None:
+        path.append(current)
+        if current == question_id:
+            return path
+        if current in seen:
+            # An existing cycle further up; not one this edit creates
+            return None
+        seen.add(current)
+        current = triggers.get(current)
+    return None
+
+
+@dataclass(frozen=True)
+class _Condition:
+    question_id: UUID
+    trigger_id: Optional[UUID]
+    answer: Optional[str]
+
+
+@dataclass(frozen=True)
+class VisibilityGraph:
+    """show_if edges in topological order"""
+    order: Tuple[_Condition, ...]
+    # Questions on (or hanging off) a cycle; never visible
+    cyclic: FrozenSet[UUID]
+    conditions: Mapping[UUID, _Condition]
+    dependents: Mapping[UUID, Tuple[UUID, ...]]
+
+    @classmethod
+    def compile(cls, questions: Iterable) -> "VisibilityGraph":
+        """Build the graph from objects with id, show_if_question_id and show_if_answer"""
+        conditions: Dict[UUID, _Condition] = {}
+        for question in questions:
+            conditional = question.show_if_question_id and question.show_if_answer
+            conditions[question.id] = _Condition(
+                question_id=question.id,
+                trigger_id=question.show_if_question_id if conditional else None,
+                answer=question.show_if_answer if conditional else None,
+            )
+
+        # Kahn's algorithm over trigger -> dependent edges
+        dependents: Dict[UUID, List[UUID]] = {}
+        pending: Dict[UUID, int] = {}
+        for condition in conditions.values():
+            if condition.trigger_id is not None and condition.trigger_id in conditions:
+                dependents.setdefault(condition.trigger_id, []).append(condition.question_id)
+                pending[condition.question_id] = 1
+
+        ready = [question_id for question_id in conditions if question_id not in pending]
+        order: List[_Condition] = []
+        while ready:
+            question_id = ready.pop()
+            order.append(conditions[question_id])
+            for dependent in dependents.get(question_id, ()):
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
+
+        placed = {condition.question_id for condition in order}
+        return cls(
+            order=tuple(order),
+            cyclic=frozenset(question_id for question_id in conditions if question_id not in placed),
+            conditions=MappingProxyType(conditions),
+            dependents=MappingProxyType({trigger: tuple(ids) for trigger, ids in dependents.items()}),
+        )
+
+    def ancestors(self, question_ids: Iterable[UUID]) -> Set[UUID]:
+        """Triggers of the given questions, their triggers, and so on"""
+        found: Set[UUID] = set()
+        for question_id in question_ids:
+            condition = self.conditions.get(question_id)
+            while condition is not None and condition.trigger_id is not None and condition.trigger_id not in found:
+                found.add(condition.trigger_id)
+                condition = self.conditions.get(condition.trigger_id)
+        return found
+
+    def descendants(self, question_ids: Iterable[UUID]) -> Set[UUID]:
+        """Questions whose visibility depends, directly or through a chain, on the given ones"""
+        found: Set[UUID] = set()
+        stack = list(question_ids)
+        while stack:
+            for dependent in self.dependents.get(stack.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    stack.append(dependent)
+        return found
+
+    def is_visible(
+        self,
+        question_id: UUID,
+        shown: Callable[[UUID], bool],
+        answers: Mapping[UUID, Optional[str]],
+    ) -> bool:
+        """Visibility of a single question, walking up its trigger chain (same rules as visible())"""
+        if question_id in self.cyclic:
+            return False
+        condition = self.conditions.get(question_id)
+        if condition is None or not shown(question_id):
+            return False
+        while condition.trigger_id is not None:
+            if answers.get(condition.trigger_id) != condition.answer:
+                return False
+            condition = self.conditions.get(condition.trigger_id)
+            if condition is None or not shown(condition.question_id):
+                return False
+        return True
+
+    def visible(
+        self,
+        shown: Callable[[UUID], bool],
+        answers: Mapping[UUID, Optional[str]],
+    ) -> FrozenSet[UUID]:
+        """
+        Ids of every visible question
+
+        Args:
+            shown: whether a question passes the non-conditional filters
+                (active, status, its section shown)
+            answers: question id -> response value for the application
+        """
+        visible = set()
+        for condition in self.order:
+            if not shown(condition.question_id):
+                continue
+            if condition.trigger_id is None or (
+                condition.trigger_id in visible and answers.get(condition.trigger_id) == condition.answer
+            ):
+                visible.add(condition.question_id)
+        return frozenset(visible)
+
+
+def describe_cycle(cycle: Sequence[UUID], labels: Mapping[UUID, str]) -> str:
+    """Human-readable cycle, e.g. 'Q1 -> Q2 -> Q1'"""
+    return " -> ".join(labels.get(question_id, str(question_id)) for question_id in cycle)
@@ -0,0 +1,272 @@
+"""
+In-process snapshot of the application form
+
+The form (sections, headers, questions) is read on every family page load
+but only changes when a super admin edits it in the application builder.
+The snapshot loads the whole form in a fixed number of queries and keeps it
+in memory as immutable objects; every builder mutation bumps the version,
+which makes the next read rebuild it.
+
+Edits made through another worker process are picked up once the snapshot
+is older than FORM_SCHEMA_MAX_AGE_SECONDS.
+
+The family view (active sections and questions filtered by application
+status) is pre-rendered to JSON once per status when a snapshot is built,
+so serving it is a dictionary lookup. The show_if conditions are compiled
+into a VisibilityGraph at the same time (see app.core.form_logic).
+
+Each snapshot carries a fingerprint of its content. The version counter is
+per process, so HTTP validators (ETags) use the fingerprint, which every
+worker computes identically for the same form.
+"""
+
+import dataclasses
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.form_logic import VisibilityGraph
+from app.models.application import ApplicationHeader, ApplicationQuestion, ApplicationSection, File
+from app.schemas.application import ApplicationSectionWithQuestions
+
+# Application statuses whose family view is rendered with every snapshot
+# (None is a family without an application); others are rendered on first use
+PRERENDERED_STATUSES = (None, "in_progress", "under_review", "accepted", "paid")
+
+_sections_adapter = TypeAdapter(List[ApplicationSectionWithQuestions])
+
+
+@dataclass(frozen=True)
+class FormQuestion:
+    id: UUID
+    section_id: UUID
+    question_text: str
+    question_type: str
+    options: Any
+    is_required: bool
+    reset_annually: bool
+    order_index: int
+    validation_rules: Any
+    help_text: Optional[str]
+    description: Optional[str]
+    placeholder: Optional[str]
+    is_active: bool
+    show_when_status: Optional[str]
+    template_file_id: Optional[UUID]
+    show_if_question_id: Optional[UUID]
+    show_if_answer: Optional[str]
+    detail_prompt_trigger: Any
+    detail_prompt_text: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    template_filename: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class FormHeader:
+    id: UUID
+    section_id: UUID
+    header_text: str
+    order_index: int
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class FormSection:
+    id: UUID
+    title: str
+    description: Optional[str]
+    order_index: int
+    is_active: bool
+    visible_before_acceptance: bool
+    show_when_status: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    questions: Tuple[FormQuestion, ...] = ()
+    headers: Tuple[FormHeader, ...] = ()
+
+
+@dataclass(frozen=True)
+class _StatusView:
+    sections: Tuple[FormSection, ...]
+    question_ids: FrozenSet[UUID]
+    json: bytes
+
+
+@dataclass(frozen=True)
+class FormSnapshot:
+    """The whole form at one version; sections, questions and headers are ordered by order_index"""
+    version: int
+    fingerprint: str
+    sections: Tuple[FormSection, ...]
+    questions: Mapping[UUID, FormQuestion]
+    visibility: VisibilityGraph
+    built_at: float
+    # status -> family view; filled once per status
+    _views: Dict[Optional[str], _StatusView] = field(default_factory=dict, repr=False, compare=False)
+
+    def _view(self, status: Optional[str]) -> _StatusView:
+        view = self._views.get(status)
+        if view is None:
+            def shown(item) -> bool:
+                return item.is_active and (item.show_when_status is None or item.show_when_status == status)
+
+            sections = tuple(
+                dataclasses.replace(section, questions=tuple(q for q in section.questions if shown(q)))
+                for section in self.sections
+                if shown(section)
+            )
+            models = _sections_adapter.validate_python(sections, from_attributes=True)
+            view = self._views[status] = _StatusView(
+                sections=sections,
+                question_ids=frozenset(q.id for section in sections for q in section.questions),
+                json=_sections_adapter.dump_json(models),
+            )
+        return view
+
+    def visible_sections(self, status: Optional[str]) -> Tuple[FormSection, ...]:
+        """
+        Active sections and questions a family sees for an application status
+
+        Items with a show_when_status are only shown when it matches `status`;
+        with no status only unconditional items are shown.
+        """
+        return self._view(status).sections
+
+    def visible_sections_json(self, status: Optional[str]) -> bytes:
+        """visible_sections(status) serialized as List[ApplicationSectionWithQuestions]"""
+        return self._view(status).json
+
+    def shown_question_ids(self, status: Optional[str]) -> FrozenSet[UUID]:
+        """Ids of the questions in visible_sections(status), before conditional logic"""
+        return self._view(status).question_ids
+
+    def visible_question_ids(self, status: Optional[str], answers: Mapping[UUID, Optional[str]]) -> FrozenSet[UUID]:
+        """
+        Questions an application actually shows: in visible_sections(status)
+        and, for conditional questions, with a visible trigger answered with
+        show_if_answer
+
+        Args:
+            answers: question id -> response value for the application
+        """
+        return self.visibility.visible(self.shown_question_ids(status).__contains__, answers)
+
+
+def _freeze(cls, row, **extra):
+    """Copy an ORM row's columns into a frozen dataclass"""
+    values = {
+        field.name: getattr(row, field.name)
+        for field in dataclasses.fields(cls)
+        if field.name not in extra and field.default is dataclasses.MISSING
+    }
+    return cls(**values, **extra)
+
+
+async def load_form_snapshot(db: AsyncSession, version: int = 0) -> FormSnapshot:
+    """Read the whole form (three queries, plus one when questions have template files)"""
+    sections = (await db.execute(
+        select(ApplicationSection).order_by(ApplicationSection.order_index)
+    )).scalars().all()
+    questions = (await db.execute(
+        select(ApplicationQuestion).order_by(ApplicationQuestion.order_index)
+    )).scalars().all()
+    headers = (await db.execute(
+        select(ApplicationHeader).order_by(ApplicationHeader.order_index)
+    )).scalars().all()
+
+    template_ids = {q.template_file_id for q in questions if q.template_file_id}
+    template_names = {}
+    if template_ids:
+        result = await db.execute(select(File.id, File.file_name).where(File.id.in_(template_ids)))
+        template_names = dict(result.all())
+
+    questions_by_section = {}
+    frozen_questions = {}
+    for q in questions:
+        frozen = _freeze(FormQuestion, q, template_filename=template_names.get(q.template_file_id))
+        frozen_questions[frozen.id] = frozen
+        questions_by_section.setdefault(frozen.section_id, []).append(frozen)
+
+    headers_by_section = {}
+    for h in headers:
+        headers_by_section.setdefault(h.section_id, []).append(_freeze(FormHeader, h))
+
+    frozen_sections = tuple(
+        _freeze(
+            FormSection,
+            s,
+            questions=tuple(questions_by_section.get(s.id, ())),
+            headers=tuple(headers_by_section.get(s.id, ())),
+        )
+        for s in sections
+    )
+
+    snapshot = FormSnapshot(
+        version=version,
+        # repr covers every column (timestamps included) of every row, in order
+        fingerprint=hashlib.sha256(repr(frozen_sections).encode()).hexdigest()[:32],
+        sections=frozen_sections,
+        questions=MappingProxyType(frozen_questions),
+        visibility=VisibilityGraph.compile(frozen_questions.values()),
+        built_at=time.monotonic(),
+    )
+    for status in PRERENDERED_STATUSES:
+        snapshot.visible_sections_json(status)
+    return snapshot
+
+
+class FormSchemaCache:
+    """Holds the current FormSnapshot and the version it must match"""
+
+    def __init__(self, max_age_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self._version = 0
+        self._snapshot: Optional[FormSnapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _fresh(self, snapshot: Optional[FormSnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self._version
+            and time.monotonic() - snapshot.built_at < self.max_age_seconds
+        )
+
+    async def get(self, db: AsyncSession) -> FormSnapshot:
+        """Return the current snapshot, rebuilding it from the database if stale"""
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+
+        version = self._version
+        snapshot = await load_form_snapshot(db, version)
+        with self._lock:
+            # Don't publish a snapshot that a concurrent edit already made stale
+            if self._version == version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Bump the version (call after committing any change to the form)"""
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+
+form_schema_cache = FormSchemaCache(max_age_seconds=settings.FORM_SCHEMA_MAX_AGE_SECONDS)
@@ -0,0 +1,67 @@
+"""
+Conditional GET helpers (ETag / If-None-Match)
+
+Endpoints whose payload is derived from a versioned snapshot set a strong
+ETag and answer a matching If-None-Match with 304 Not Modified, so clients
+that already hold the payload don't download it again.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Responses depend on the caller (authorization, application status), so only
+# the browser may store them, and it must revalidate before every reuse.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: str) -> str:
+    """Quoted strong entity tag built from the given parts"""
+    return '"' + "-".join(parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches `etag`
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/ prefix added by an intermediary (e.g. after compression) still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = PRIVATE_REVALIDATE,
+) -> Optional[Response]:
+    """
+    Set validator headers and check the request's If-None-Match
+
+    Returns a 304 response when the client's copy is current; otherwise sets
+    the ETag and Cache-Control headers on `response` and returns None.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def cached_json_response(request: Request, etag: str, body: bytes, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    """Pre-rendered JSON `body` with validator headers, or 304 if the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
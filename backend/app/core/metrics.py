@@ -0,0 +1,228 @@
+"""
+Request instrumentation
+
+Records, per request: route template, SQL statement count and time (via
+SQLAlchemy engine events), Supabase storage time and total latency. Each
+response gets a Server-Timing header, and the numbers are aggregated into
+histograms exposed in Prometheus text format at /api/metrics (scraper
+token or admin only, see app.core.deps.require_metrics_access).
+
+Metrics are per process; with several uvicorn workers each one reports its
+own counts.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Latency buckets in seconds (Prometheus client defaults)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 200)
+
+# Label used for requests that did not match any route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestMetrics:
+    """Counters for the request currently being handled"""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    storage_calls: int = 0
+    storage_seconds: float = 0.0
+
+
+# Mutable per-request counters. Worker threads and SQLAlchemy's async greenlets
+# run with a copy of the request's context, so they update the same object.
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    """Counters for the active request, or None outside a request"""
+    return _current.get()
+
+
+class Histogram:
+    """Minimal thread-safe labelled histogram rendered in Prometheus text format"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        for labels, series in sorted(snapshot.items()):
+            label_text = ",".join(
+                f'{name}="{_escape_label(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+
+        return "\n".join(lines)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Total request latency",
+    ("method", "route", "status"),
+    DURATION_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL per request",
+    ("method", "route"),
+    DURATION_BUCKETS,
+)
+REQUEST_STORAGE_DURATION = Histogram(
+    "http_request_storage_duration_seconds",
+    "Time spent in Supabase storage calls per request",
+    ("method", "route"),
+    DURATION_BUCKETS,
+)
+
+HISTOGRAMS = (REQUEST_DURATION, REQUEST_DB_QUERIES, REQUEST_DB_DURATION, REQUEST_STORAGE_DURATION)
+
+
+def render_metrics() -> str:
+    """All histograms in Prometheus text exposition format"""
+    return "\n".join(histogram.render() for histogram in HISTOGRAMS) + "\n"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count and time every SQL statement executed on `engine`
+
+    For an AsyncEngine pass `async_engine.sync_engine`.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_times"].pop()
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.db_queries += 1
+            metrics.db_seconds += time.perf_counter() - started
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # after_cursor_execute is skipped for failed statements
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_times"):
+            conn.info["query_start_times"].pop()
+
+
+def track_storage(func):
+    """Decorator adding a storage call's duration to the current request's metrics"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return func(*args, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.storage_calls += 1
+            metrics.storage_seconds += time.perf_counter() - started
+
+    return wrapper
+
+
+def _server_timing(metrics: RequestMetrics, total_seconds: float) -> str:
+    return ", ".join([
+        f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.db_queries} queries"',
+        f'storage;dur={metrics.storage_seconds * 1000:.1f};desc="{metrics.storage_calls} calls"',
+        f"total;dur={total_seconds * 1000:.1f}",
+    ])
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware that collects RequestMetrics for each HTTP request
+
+    The Server-Timing header covers work done before the response headers are
+    sent; the histograms are recorded once the response body has finished.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    _server_timing(metrics, time.perf_counter() - started).encode("latin-1"),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+
+            REQUEST_DURATION.observe(time.perf_counter() - started, method, route_path, str(status_code))
+            REQUEST_DB_QUERIES.observe(metrics.db_queries, method, route_path)
+            REQUEST_DB_DURATION.observe(metrics.db_seconds, method, route_path)
+            REQUEST_STORAGE_DURATION.observe(metrics.storage_seconds, method, route_path)
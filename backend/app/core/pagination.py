@@ -0,0 +1,45 @@
+"""
+Opaque cursors for keyset pagination
+
+A cursor is the sort key of the last row on a page (e.g. its updated_at and
+id), JSON-encoded and base64url'd. The next page is the rows after that key
+in the same order, so each page is an index range scan and pages don't
+shift when rows are inserted in front of them, unlike OFFSET.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+from uuid import UUID
+
+
+class InvalidCursor(ValueError):
+    """A cursor that wasn't produced by encode_cursor (or is for another sort)"""
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Cursor for a row's sort key (datetimes and UUIDs become strings)"""
+    raw = json.dumps([_plain(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """The sort key values in a cursor; raises InvalidCursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor("Malformed cursor")
+    return values
@@ -0,0 +1,79 @@
+"""
+In-process cache of authenticated principals
+
+get_current_user runs on every request. Caching the handful of columns
+needed for authorization (id, role, team, status) avoids a users-table
+lookup per request. Entries expire after a short TTL so changes made by
+other worker processes are picked up; super admin user edits invalidate
+the local entry immediately.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by authorization checks"""
+    id: UUID
+    role: str
+    team: Optional[str] = None
+    status: Optional[str] = None
+    token_version: int = 0
+
+
+class PrincipalCache:
+    """Bounded LRU cache with a per-entry TTL, keyed by user id"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        """Return the cached principal, or None if missing or expired"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def set(self, principal: Principal) -> None:
+        """Cache a principal, evicting the least recently used entry when full"""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        key = str(principal.id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        """Drop a user's cached principal (call after changing role/team/status)"""
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        """Drop every cached principal"""
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -2,20 +2,44 @@
 Security utilities for password hashing and JWT tokens
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import jwt
 import bcrypt
 from app.core.config import settings
 
-
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+# Dedicated, size-limited pool for bcrypt work. bcrypt is deliberately slow
+# (hundreds of ms per call), so running it on the event loop stalls every
+# other request; a separate pool also keeps a login burst from exhausting
+# the default threadpool used by the rest of the app.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
+
+def create_access_token(
+    subject: str,
+    expires_delta: Optional[timedelta] = None,
+    role: Optional[str] = None,
+    team: Optional[str] = None,
+    token_version: Optional[int] = None
+) -> str:
     """
     Create a JWT access token
 
+    When role and token_version are given they are signed into the token
+    (``role``, ``team``, ``ver`` claims) so routes can authorize without a
+    users-table lookup. Bumping the user's token_version revokes the token.
+
     Args:
         subject: The subject (usually user ID) to encode in the token
         expires_delta: Optional custom expiration time
+        role: User role claim
+        team: User team claim (admins only)
+        token_version: User's current token_version
 
     Returns:
         Encoded JWT token string
@@ -28,6 +52,8 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
         )
 
     to_encode = {"exp": expire, "sub": str(subject)}
+    if role is not None and token_version is not None:
+        to_encode.update({"role": role, "team": team, "ver": token_version})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.JWT_SECRET,
@@ -65,20 +91,59 @@ def get_password_hash(password: str) -> str:
         Hashed password string
     """
     # Generate salt and hash password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
-def decode_access_token(token: str) -> Optional[str]:
+def password_needs_rehash(hashed_password: str) -> bool:
     """
-    Decode a JWT access token and return the subject (user ID)
+    Check whether a hash was made with a different cost factor than BCRYPT_ROUNDS
+
+    Args:
+        hashed_password: Stored bcrypt hash ($2b$<cost>$...)
+
+    Returns:
+        True if the password should be re-hashed with the current cost
+    """
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password, run on the password-hash worker pool
+
+    Use this from async routes so bcrypt doesn't block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash, run on the password-hash worker pool
+
+    Use this from async routes so bcrypt doesn't block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
+def decode_access_token_claims(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a JWT access token and return all of its claims
 
     Args:
         token: JWT token string
 
     Returns:
-        User ID from token subject, or None if invalid
+        Claims dict (sub, exp and, for newer tokens, role/team/ver), or None if invalid
     """
     try:
         payload = jwt.decode(
@@ -86,7 +151,26 @@ def decode_access_token(token: str) -> Optional[str]:
             settings.JWT_SECRET,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        user_id: str = payload.get("sub")
-        return user_id
     except jwt.JWTError:
         return None
+
+    if not payload.get("sub"):
+        return None
+    return payload
+
+
+def decode_access_token(token: str) -> Optional[str]:
+    """
+    Decode a JWT access token and return the subject (user ID)
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        User ID from token subject, or None if invalid
+    """
+    payload = decode_access_token_claims(token)
+    if payload is None:
+        return None
+    user_id: str = payload.get("sub")
+    return user_id
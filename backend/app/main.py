@@ -2,9 +2,13 @@
 CAMP FASD Application Portal - Main FastAPI Application
 """
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
+from app.core.database import async_engine, engine
+from app.core.deps import require_metrics_access
+from app.core.metrics import RequestMetricsMiddleware, instrument_engine, render_metrics
 
 app = FastAPI(
     title="CAMP FASD Application Portal API",
@@ -21,8 +25,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag"],
 )
 
+# Per-request SQL count/time, storage time and latency (Server-Timing + /api/metrics)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+app.add_middleware(RequestMetricsMiddleware)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -34,12 +44,27 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "storage": "connected"
-    }
+    """
+    Detailed health check
+
+    Reports live connection pool usage plus database and storage round-trip
+    latency (cached for a few seconds). Returns 503 if the database is unreachable.
+    """
+    from app.services.health_service import get_health_report
+
+    report = await get_health_report()
+    status_code = 503 if report["status"] == "unhealthy" else 200
+    return JSONResponse(content=report, status_code=status_code)
+
+@app.get("/api/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    """
+    Request latency and SQL/storage histograms in Prometheus text format
+
+    Route names and traffic are not public: scrape with
+    `Authorization: Bearer <METRICS_TOKEN>`, or call as an admin.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 # Import and include routers
 from app.api import auth, auth_google, applications, files, admin, super_admin, application_builder, medications
@@ -2,10 +2,13 @@
 Application-related database models
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, DECIMAL, text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, DECIMAL, text, ForeignKey, Index, UniqueConstraint, func, true, false
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.models.search import camper_search_document
+from app.models.types import UUID, JSONB
 
 
 class ApplicationSection(Base):
@@ -13,15 +16,15 @@ class ApplicationSection(Base):
 
     __tablename__ = "application_sections"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     order_index = Column(Integer, nullable=False)
-    is_active = Column(Boolean, default=True, server_default="true")
-    visible_before_acceptance = Column(Boolean, default=True, server_default="true")
+    is_active = Column(Boolean, default=True, server_default=true())
+    visible_before_acceptance = Column(Boolean, default=True, server_default=true())
     show_when_status = Column(String(20), nullable=True)  # 'accepted', 'paid', or NULL for always visible
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     questions = relationship("ApplicationQuestion", back_populates="section", order_by="ApplicationQuestion.order_index")
@@ -36,13 +39,13 @@ class ApplicationHeader(Base):
 
     __tablename__ = "application_headers"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     section_id = Column(UUID(as_uuid=True), ForeignKey("application_sections.id", ondelete="CASCADE"))
     header_text = Column(String(255), nullable=False)
     order_index = Column(Integer, nullable=False)
-    is_active = Column(Boolean, default=True, server_default="true")
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    is_active = Column(Boolean, default=True, server_default=true())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationship
     section = relationship("ApplicationSection", back_populates="headers")
@@ -56,27 +59,27 @@ class ApplicationQuestion(Base):
 
     __tablename__ = "application_questions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     section_id = Column(UUID(as_uuid=True), ForeignKey("application_sections.id", ondelete="CASCADE"))
     question_text = Column(Text, nullable=False)
     question_type = Column(String(50), nullable=False)  # text, textarea, dropdown, etc.
     options = Column(JSONB)  # For dropdown/multiple choice options
-    is_required = Column(Boolean, default=False, server_default="false")
-    reset_annually = Column(Boolean, default=False, server_default="false")
+    is_required = Column(Boolean, default=False, server_default=false())
+    reset_annually = Column(Boolean, default=False, server_default=false())
     order_index = Column(Integer, nullable=False)
     validation_rules = Column(JSONB)
     help_text = Column(Text)
     description = Column(Text)  # Long-form markdown description displayed above question
     placeholder = Column(Text)
-    is_active = Column(Boolean, default=True, server_default="true")
+    is_active = Column(Boolean, default=True, server_default=true())
     show_when_status = Column(String(20), nullable=True)  # 'accepted', 'paid', or NULL for always visible
     template_file_id = Column(UUID(as_uuid=True), ForeignKey("files.id", ondelete="SET NULL"), nullable=True)  # Optional template file to download
     show_if_question_id = Column(UUID(as_uuid=True), ForeignKey("application_questions.id", ondelete="CASCADE"), nullable=True)  # Show only if this question has specific answer
     show_if_answer = Column(Text, nullable=True)  # The answer value that triggers showing this question
     detail_prompt_trigger = Column(JSONB, nullable=True)  # Array of answers that trigger showing detail prompt
     detail_prompt_text = Column(Text, nullable=True)  # Text for the detail prompt textarea
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     section = relationship("ApplicationSection", back_populates="questions")
@@ -91,20 +94,21 @@ class Application(Base):
 
     __tablename__ = "applications"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
     camper_first_name = Column(String(100))
     camper_last_name = Column(String(100))
     status = Column(String(50), default="in_progress", server_default="in_progress")
     completion_percentage = Column(Integer, default=0, server_default="0")
-    is_returning_camper = Column(Boolean, default=False, server_default="false")
+    is_returning_camper = Column(Boolean, default=False, server_default=false())
     cabin_assignment = Column(String(50))
-    application_data = Column(JSONB, default={}, server_default=text("'{}'::jsonb"))
+    application_data = Column(JSONB, default={}, server_default=text("'{}'"))  # Copy of the responses, by question id
+    completion_state = Column(JSONB, nullable=True)  # Completion counters maintained by completion_service
 
     # Approval tracking
-    ops_approved = Column(Boolean, default=False, server_default="false")
-    behavioral_approved = Column(Boolean, default=False, server_default="false")
-    medical_approved = Column(Boolean, default=False, server_default="false")
+    ops_approved = Column(Boolean, default=False, server_default=false())
+    behavioral_approved = Column(Boolean, default=False, server_default=false())
+    medical_approved = Column(Boolean, default=False, server_default=false())
     ops_approved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     behavioral_approved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     medical_approved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
@@ -113,12 +117,21 @@ class Application(Base):
     medical_approved_at = Column(DateTime(timezone=True))
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True))  # When application reached 100%
     accepted_at = Column(DateTime(timezone=True))
     declined_at = Column(DateTime(timezone=True))
 
+    __table_args__ = (
+        # Admin search by camper name (Postgres full-text; see models/search.py)
+        Index(
+            "idx_applications_camper_search",
+            camper_search_document(camper_first_name, camper_last_name),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
     responses = relationship("ApplicationResponse", back_populates="application", cascade="all, delete-orphan")
@@ -128,6 +141,14 @@ class Application(Base):
     medications = relationship("Medication", foreign_keys="[Medication.application_id]", cascade="all, delete-orphan")
     allergies = relationship("Allergy", foreign_keys="[Allergy.application_id]", cascade="all, delete-orphan")
 
+    @property
+    def stored_responses(self) -> list:
+        """Responses as kept in application_data (see services/response_service.py)"""
+        return [
+            {"question_id": question_id, "application_id": self.id, **entry}
+            for question_id, entry in (self.application_data or {}).items()
+        ]
+
     def __repr__(self):
         return f"<Application {self.camper_first_name} {self.camper_last_name} - {self.status}>"
 
@@ -136,14 +157,20 @@ class ApplicationResponse(Base):
     """User's response to a specific question"""
 
     __tablename__ = "application_responses"
+    __table_args__ = (
+        # One response per question per application (from 001_initial_schema); autosave upserts on it
+        UniqueConstraint("application_id", "question_id", name="application_responses_application_id_question_id_key"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"))
     question_id = Column(UUID(as_uuid=True), ForeignKey("application_questions.id", ondelete="CASCADE"))
     response_value = Column(Text)
     file_id = Column(UUID(as_uuid=True), ForeignKey("files.id", ondelete="SET NULL"))
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    # Bumped whenever response_value or file_id changes (delta autosave conflict detection)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     application = relationship("Application", back_populates="responses")
@@ -158,7 +185,7 @@ class File(Base):
 
     __tablename__ = "files"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"))
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     file_name = Column(String(255), nullable=False)
@@ -166,7 +193,7 @@ class File(Base):
     file_size = Column(Integer)
     storage_path = Column(String(500), nullable=False)
     section = Column(String(100))
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     application = relationship("Application", back_populates="files")
@@ -180,12 +207,12 @@ class AdminNote(Base):
 
     __tablename__ = "admin_notes"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"))
     admin_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     note = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     application = relationship("Application", back_populates="notes")
@@ -200,11 +227,11 @@ class ApplicationApproval(Base):
 
     __tablename__ = "application_approvals"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
     admin_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     approved = Column(Boolean, nullable=False)  # True = approve, False = decline
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     application = relationship("Application", back_populates="approvals")
@@ -219,7 +246,7 @@ class Medication(Base):
 
     __tablename__ = "medications"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
     question_id = Column(UUID(as_uuid=True), ForeignKey("application_questions.id", ondelete="CASCADE"), nullable=False)
     medication_name = Column(Text, nullable=False)
@@ -227,8 +254,8 @@ class Medication(Base):
     dose_amount = Column(Text)
     dose_form = Column(Text)
     order_index = Column(Integer, default=0, server_default="0")
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     application = relationship("Application", foreign_keys=[application_id], overlaps="medications")
@@ -244,14 +271,14 @@ class MedicationDose(Base):
 
     __tablename__ = "medication_doses"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     medication_id = Column(UUID(as_uuid=True), ForeignKey("medications.id", ondelete="CASCADE"), nullable=False)
     given_type = Column(Text, nullable=False)  # 'At specific time' or 'As needed'
     time = Column(Text)  # Specific time or 'N/A'
     notes = Column(Text)
     order_index = Column(Integer, default=0, server_default="0")
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     medication = relationship("Medication", back_populates="doses")
@@ -265,7 +292,7 @@ class Allergy(Base):
 
     __tablename__ = "allergies"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
     question_id = Column(UUID(as_uuid=True), ForeignKey("application_questions.id", ondelete="CASCADE"), nullable=False)
     allergen = Column(Text, nullable=False)
@@ -273,8 +300,8 @@ class Allergy(Base):
     severity = Column(Text)  # 'Mild', 'Moderate', 'Severe'
     notes = Column(Text)
     order_index = Column(Integer, default=0, server_default="0")
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     application = relationship("Application", foreign_keys=[application_id], overlaps="allergies")
@@ -0,0 +1,40 @@
+"""
+Full-text search documents for the admin application search
+
+Camper names (applications) and the parent's name and email (users) are
+indexed as tsvector expressions with GIN indexes, on Postgres only (see the
+models' __table_args__ and supabase/migrations/016). Being expressions over
+each table's own columns, they can't drift from the data and no write path
+has to maintain them. Queries must build the same expressions, from the
+functions here, for Postgres to use the indexes.
+
+The 'simple' configuration lowercases without stemming, which suits names.
+Emails are split on punctuation so "jane.doe@example.com" is found by
+"jane", "doe" or "example".
+"""
+
+from sqlalchemy import func, literal_column
+
+# Constants are inline SQL, not bound parameters: an expression index is only
+# used when the query's expression matches it exactly
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+_EMPTY = literal_column("''")
+_SPACE = literal_column("' '")
+
+
+def _words(*columns):
+    text = func.coalesce(columns[0], _EMPTY)
+    for column in columns[1:]:
+        text = text.concat(_SPACE).concat(func.coalesce(column, _EMPTY))
+    return text
+
+
+def camper_search_document(first_name, last_name):
+    """tsvector of the camper's first and last name (applications columns)"""
+    return func.to_tsvector(SEARCH_CONFIG, _words(first_name, last_name))
+
+
+def parent_search_document(first_name, last_name, email):
+    """tsvector of the account holder's first and last name and email (users columns)"""
+    email_words = func.regexp_replace(email, literal_column("'[^[:alnum:]]+'"), _SPACE, literal_column("'g'"))
+    return func.to_tsvector(SEARCH_CONFIG, _words(first_name, last_name, email_words))
@@ -2,10 +2,12 @@
 Super Admin related database models
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.models.types import UUID, JSONB
 
 
 class SystemConfiguration(Base):
@@ -13,14 +15,14 @@ class SystemConfiguration(Base):
 
     __tablename__ = "system_configuration"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     key = Column(String(100), unique=True, nullable=False, index=True)
     value = Column(JSONB, nullable=False)
     description = Column(Text)
     data_type = Column(String(20), nullable=False)  # 'string', 'number', 'boolean', 'date', 'json'
     category = Column(String(50), default='general')  # 'camp', 'workflow', 'files', 'email', 'contact'
     is_public = Column(Boolean, default=False)  # Can non-admins see this setting?
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
 
     # Relationship
@@ -35,7 +37,7 @@ class AuditLog(Base):
 
     __tablename__ = "audit_logs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     entity_type = Column(String(50), nullable=False, index=True)
     entity_id = Column(UUID(as_uuid=True), index=True)
     action = Column(String(50), nullable=False, index=True)
@@ -43,7 +45,7 @@ class AuditLog(Base):
     details = Column(JSONB)
     ip_address = Column(String(45))
     user_agent = Column(Text)
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationship
     actor = relationship("User", foreign_keys=[actor_id])
@@ -57,7 +59,7 @@ class EmailTemplate(Base):
 
     __tablename__ = "email_templates"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     key = Column(String(100), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     subject = Column(String(255), nullable=False)
@@ -65,8 +67,8 @@ class EmailTemplate(Base):
     text_content = Column(Text)
     variables = Column(JSONB)  # Array of available variables
     is_active = Column(Boolean, default=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
 
     # Relationship
@@ -81,15 +83,15 @@ class Team(Base):
 
     __tablename__ = "teams"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     key = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=False)
     description = Column(Text)
     color = Column(String(7), default='#3B82F6')  # Hex color
     is_active = Column(Boolean, default=True, index=True)
     order_index = Column(Integer, default=0, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
         return f"<Team {self.key}: {self.name}>"
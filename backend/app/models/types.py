@@ -0,0 +1,137 @@
+"""
+Dialect-portable column types and SQL helpers
+
+On Postgres these compile to the native UUID and JSONB types, exactly as
+before. On other databases (SQLite for local tests and benchmarks) they fall
+back to SQLAlchemy's generic Uuid and JSON types, so the same models and
+queries run on both.
+"""
+
+import uuid
+
+from sqlalchemy import JSON, DateTime, Float, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator, Uuid
+
+# JSONB on Postgres, JSON (text) elsewhere
+JSONB = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+class UUID(TypeDecorator):
+    """
+    Native UUID on Postgres, CHAR(32) elsewhere
+
+    Postgres accepts UUID strings as-is; on other databases string ids (e.g.
+    path parameters compared against a UUID column) are coerced to uuid.UUID.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    def __init__(self, as_uuid: bool = True):
+        super().__init__(as_uuid=True)
+        self.as_uuid = as_uuid
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=self.as_uuid))
+        return dialect.type_descriptor(Uuid(as_uuid=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql" or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql" or self.as_uuid:
+            return value
+        return str(value)
+
+
+class days_between(FunctionElement):
+    """Fractional days from `start` to `end` (two timestamp expressions)"""
+
+    type = Float()
+    inherit_cache = True
+    name = "days_between"
+
+    def __init__(self, end, start):
+        super().__init__(end, start)
+
+
+@compiles(days_between)
+def _days_between_default(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return f"(EXTRACT(EPOCH FROM {compiler.process(end, **kw)} - {compiler.process(start, **kw)}) / 86400)"
+
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return f"(julianday({compiler.process(end, **kw)}) - julianday({compiler.process(start, **kw)}))"
+
+
+class sortable_timestamp(FunctionElement):
+    """
+    A timestamp expression that compares the same way it sorts
+
+    SQLite keeps timestamps as text, written either by SQLAlchemy
+    ('... 12:00:00.000000') or by CURRENT_TIMESTAMP defaults ('... 12:00:00'),
+    which don't compare equal as strings. There it is normalized to
+    millisecond text; on Postgres it is the expression unchanged. Keyset
+    pagination compares and orders by it.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+    name = "sortable_timestamp"
+
+
+@compiles(sortable_timestamp)
+def _sortable_timestamp_default(element, compiler, **kw):
+    return compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(sortable_timestamp, "sqlite")
+def _sortable_timestamp_sqlite(element, compiler, **kw):
+    return f"strftime('%Y-%m-%d %H:%M:%f', {compiler.process(list(element.clauses)[0], **kw)})"
+
+
+class StringList(TypeDecorator):
+    """text[] on Postgres; elsewhere the comma-joined text of group_concat, split back into a list"""
+
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.ARRAY(String()))
+        return dialect.type_descriptor(String())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return value.split(",") if value else []
+        return list(value)
+
+
+class distinct_values(FunctionElement):
+    """Aggregate: the distinct non-null values of a text expression in each group, as a list"""
+
+    type = StringList()
+    inherit_cache = True
+    name = "distinct_values"
+
+
+@compiles(distinct_values)
+def _distinct_values_default(element, compiler, **kw):
+    return f"array_remove(array_agg(DISTINCT {compiler.process(list(element.clauses)[0], **kw)}), NULL)"
+
+
+@compiles(distinct_values, "sqlite")
+def _distinct_values_sqlite(element, compiler, **kw):
+    # group_concat skips NULLs; values must not contain commas (team keys don't)
+    return f"group_concat(DISTINCT {compiler.process(list(element.clauses)[0], **kw)})"
@@ -2,9 +2,12 @@
 User database model
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, text
-from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Index, func, false
 from app.core.database import Base
+from app.models.search import parent_search_document
+from app.models.types import UUID
 
 
 class User(Base):
@@ -12,7 +15,7 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=True)  # Nullable for OAuth users
     role = Column(String(20), nullable=False, server_default="user")  # user, admin, super_admin
@@ -21,10 +24,24 @@ class User(Base):
     first_name = Column(String(100))
     last_name = Column(String(100))
     phone = Column(String(20))
-    created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
-    updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
-    email_verified = Column(Boolean, default=False, server_default="false")
+    email_verified = Column(Boolean, default=False, server_default=false())
+    status = Column(String(20), default="active", server_default="active")  # active, inactive, suspended
+    suspended_at = Column(DateTime(timezone=True), nullable=True)
+    suspended_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    suspension_reason = Column(Text, nullable=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped to revoke issued tokens
+
+    __table_args__ = (
+        # Admin application search by parent name or email (Postgres full-text; see models/search.py)
+        Index(
+            "idx_users_parent_search",
+            parent_search_document(first_name, last_name, email),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __repr__(self):
         return f"<User {self.email} ({self.role})>"
\ No newline at end of file
@@ -4,7 +4,7 @@ Application Pydantic schemas
 
 from typing import Optional, List, Any, Dict, Union
 from datetime import datetime
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, Field, UUID4
 
 
 # Application Section Schemas
@@ -82,6 +82,7 @@ class ApplicationResponseCreate(ApplicationResponseBase):
 class ApplicationResponse(ApplicationResponseBase):
     id: UUID4
     application_id: UUID4
+    version: int = 1
     created_at: datetime
     updated_at: datetime
 
@@ -105,6 +106,39 @@ class ApplicationUpdate(BaseModel):
     responses: Optional[List[ApplicationResponseCreate]] = None
 
 
+class ResponseChange(ApplicationResponseBase):
+    """A changed response, with the version of it the client last saw (None if it had none)"""
+    base_version: Optional[int] = None
+
+
+class ApplicationDeltaUpdate(BaseModel):
+    """Delta autosave: only the responses that changed since the last save"""
+    camper_first_name: Optional[str] = None
+    camper_last_name: Optional[str] = None
+    changes: List[ResponseChange] = []
+
+
+class SavedResponse(BaseModel):
+    question_id: UUID4
+    version: int
+
+
+class ResponseConflict(ApplicationResponseBase):
+    """A response someone else changed since base_version; the client's value was not saved"""
+    # None when the response no longer exists
+    version: Optional[int] = None
+
+
+class ApplicationDeltaResult(BaseModel):
+    """What a delta autosave did"""
+    saved: List[SavedResponse]
+    # Already saved with the same value (current version included)
+    unchanged: List[SavedResponse]
+    conflicts: List[ResponseConflict]
+    completion_percentage: int
+    status: str
+
+
 class Application(ApplicationBase):
     id: UUID4
     user_id: UUID4
@@ -122,7 +156,8 @@ class Application(ApplicationBase):
 
 class ApplicationWithResponses(Application):
     """Application with all responses"""
-    responses: List[ApplicationResponse] = []
+    # Read from the application_data copy rather than the responses relationship
+    responses: List[ApplicationResponse] = Field(default=[], validation_alias="stored_responses")
 
     class Config:
         from_attributes = True
@@ -132,8 +167,8 @@ class UserInfo(BaseModel):
     """Basic user info for admin views"""
     id: UUID4
     email: str
-    first_name: str
-    last_name: str
+    first_name: Optional[str] = None  # optional at registration
+    last_name: Optional[str] = None
     phone: Optional[str] = None
 
     class Config:
@@ -148,6 +183,33 @@ class ApplicationWithUser(ApplicationWithResponses):
         from_attributes = True
 
 
+class ApplicationListItem(Application):
+    """Admin list row: application columns, family contact and approval stats (no responses)"""
+    user: Optional[UserInfo] = None
+    approval_count: int = 0
+    approved_by_teams: List[str] = []
+
+
+class ApplicationSearchResult(ApplicationListItem):
+    """Admin search match; higher rank is a better match"""
+    rank: float
+
+
+class ApplicationListFacets(BaseModel):
+    """Application counts for the current search, whatever the status filter or page"""
+    total: int = 0
+    status: Dict[str, int] = {}
+    completion: Dict[str, int] = {}  # by completion bucket: "0", "1-49", "50-99", "100"
+    approved_by_team: Dict[str, int] = {}  # applications each team has approved
+
+
+class ApplicationListPage(BaseModel):
+    """One page of the admin list; pass next_cursor back as `cursor` for the next page"""
+    items: List[ApplicationListItem]
+    next_cursor: Optional[str] = None
+    facets: Optional[ApplicationListFacets] = None  # only when requested
+
+
 # Progress tracking
 class SectionProgress(BaseModel):
     """Progress for a single section"""
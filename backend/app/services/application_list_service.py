@@ -0,0 +1,368 @@
+"""
+Admin application list
+
+The list selects only the columns it shows (application fields and the
+family's contact details), never responses, one page at a time in one of the
+SORTS orders (most recently updated first by default). Pages are
+keyset-paginated: the cursor is the last row's sort key and id, so fetching
+page N costs the same as page 1.
+
+Approval stats are aggregated in the same query (a subquery grouped by
+application), so approvals are never loaded as objects.
+
+Search matches word prefixes of the camper's and parent's names and the
+parent's email with Postgres full-text search over the GIN expression
+indexes in models/search.py; every search word must match somewhere. On
+SQLite (tests, local benchmarks) it falls back to ILIKE substring matching.
+
+With facets requested, counts by status, completion bucket and approving
+team over every application matching the search (whatever the status
+filter or page) come back in the same statement as the page: the facet
+counts are UNION ALL'd onto the page rows.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, and_, case, func, literal, literal_column, null, or_, select, tuple_, union, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from ..core.database import IS_SQLITE
+from ..core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from ..models.application import Application, ApplicationApproval
+from ..models.search import SEARCH_CONFIG, camper_search_document, parent_search_document
+from ..models.types import distinct_values, sortable_timestamp
+from ..models.user import User
+from ..schemas.application import (
+    ApplicationListFacets,
+    ApplicationListItem,
+    ApplicationListPage,
+    ApplicationSearchResult,
+    UserInfo,
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_SEARCH_RESULTS = 20
+
+STATUSES = ("in_progress", "under_review", "accepted", "declined", "paid")
+# (label, lowest, highest completion_percentage)
+COMPLETION_BUCKETS = (("0", 0, 0), ("1-49", 1, 49), ("50-99", 50, 99), ("100", 100, 100))
+
+_APPLICATION_COLUMNS = (
+    Application.id,
+    Application.user_id,
+    Application.camper_first_name,
+    Application.camper_last_name,
+    Application.status,
+    Application.completion_percentage,
+    Application.is_returning_camper,
+    Application.cabin_assignment,
+    Application.created_at,
+    Application.updated_at,
+    Application.completed_at,
+)
+
+_USER_COLUMNS = (
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone,
+)
+
+
+def approval_stats():
+    """
+    Subquery: application_id, approval_count and approved_by_teams (distinct
+    teams of the approving admins) for applications with at least one approval
+    """
+    admin = aliased(User)
+    return (
+        select(
+            ApplicationApproval.application_id,
+            func.count(ApplicationApproval.id).label("approval_count"),
+            distinct_values(admin.team).label("approved_by_teams"),
+        )
+        .outerjoin(admin, ApplicationApproval.admin_id == admin.id)
+        .where(ApplicationApproval.approved.is_(True))
+        .group_by(ApplicationApproval.application_id)
+        .subquery("approval_stats")
+    )
+
+
+def search_terms(search: Optional[str]) -> List[str]:
+    """Lowercased words of a search string (letters and digits only)"""
+    return re.findall(r"[^\W_]+", (search or "").lower())
+
+
+def _prefix_query(terms: List[str], operator: str):
+    """tsquery matching words starting with each term, joined with & or |"""
+    return func.to_tsquery(SEARCH_CONFIG, literal(f" {operator} ".join(f"{term}:*" for term in terms)))
+
+
+def _search_document():
+    """Camper names (weight A, ranked first) and parent name/email (weight B)"""
+    camper = camper_search_document(Application.camper_first_name, Application.camper_last_name)
+    parent = parent_search_document(User.first_name, User.last_name, User.email)
+    return func.setweight(camper, literal_column("'A'")).op("||")(func.setweight(parent, literal_column("'B'")))
+
+
+def search_condition(terms: List[str]):
+    """WHERE clause for applications matching every search term (query must join User)"""
+    if IS_SQLITE:
+        fields = (Application.camper_first_name, Application.camper_last_name, User.email, User.first_name, User.last_name)
+        return and_(*(or_(*(field.ilike(f"%{term}%") for field in fields)) for term in terms))
+
+    # Candidates from the two GIN indexes (any term), then every term across both documents
+    any_term = _prefix_query(terms, "|")
+    candidates = union(
+        select(Application.id).where(
+            camper_search_document(Application.camper_first_name, Application.camper_last_name).bool_op("@@")(any_term)
+        ),
+        select(Application.id).join(User, Application.user_id == User.id).where(
+            parent_search_document(User.first_name, User.last_name, User.email).bool_op("@@")(any_term)
+        ),
+    )
+    return and_(Application.id.in_(candidates), _search_document().bool_op("@@")(_prefix_query(terms, "&")))
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a sort: its SQL expression, and how a cursor value becomes a bound value again"""
+    expression: Any
+    parse: Callable[[Any], Any]
+    bound: Callable[[Any], Any]
+
+
+def _timestamp_key(column) -> SortKey:
+    return SortKey(
+        sortable_timestamp(column),
+        datetime.fromisoformat,
+        lambda value: sortable_timestamp(literal(value, DateTime(timezone=True))),
+    )
+
+
+def _plain_key(expression, kind: type) -> SortKey:
+    def parse(value):
+        if type(value) is not kind:
+            raise TypeError(f"expected {kind.__name__}")
+        return value
+    return SortKey(expression, parse, lambda value: literal(value, expression.type))
+
+
+# Inline constants, so Postgres matches the expression indexes in migration 017
+_EPOCH = literal_column("'1970-01-01 00:00:00+00:00'")
+_EMPTY = literal_column("''")
+
+
+@dataclass(frozen=True)
+class Sort:
+    keys: Tuple[SortKey, ...]  # compared as a tuple, then id breaks ties
+    descending: bool = True  # default order
+
+
+SORTS: Dict[str, Sort] = {
+    "updated_at": Sort((_timestamp_key(Application.updated_at),)),
+    "completion": Sort((_plain_key(Application.completion_percentage, int),)),
+    # Not yet completed sorts as oldest
+    "completed_at": Sort((_timestamp_key(func.coalesce(Application.completed_at, _EPOCH)),)),
+    "camper_name": Sort((
+        _plain_key(func.lower(func.coalesce(Application.camper_last_name, _EMPTY)), str),
+        _plain_key(func.lower(func.coalesce(Application.camper_first_name, _EMPTY)), str),
+    ), descending=False),
+}
+
+
+def _ordering(sort: Sort, descending: bool):
+    expressions = [key.expression for key in sort.keys] + [Application.id]
+    return [e.desc() if descending else e.asc() for e in expressions]
+
+
+def _after(cursor: str, sort_name: str, descending: bool):
+    """WHERE clause for rows after the cursor's sort key and id"""
+    sort = SORTS[sort_name]
+    name, order, *values, application_id = decode_cursor(cursor, len(sort.keys) + 3)
+    if name != sort_name or order != _order_name(descending):
+        raise InvalidCursor("Cursor is for another sort")
+    try:
+        bounds = [key.bound(key.parse(value)) for key, value in zip(sort.keys, values)]
+        application_id = UUID(application_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    row = tuple_(*(key.expression for key in sort.keys), Application.id)
+    bound = tuple_(*bounds, literal(application_id, Application.id.type))
+    return row < bound if descending else row > bound
+
+
+def _order_name(descending: bool) -> str:
+    return "desc" if descending else "asc"
+
+
+async def list_applications(
+    db: AsyncSession,
+    status_filter: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    sort: str = "updated_at",
+    descending: Optional[bool] = None,
+    facets: bool = False,
+) -> ApplicationListPage:
+    """
+    A page of applications in a SORTS order (descending=None: the sort's default)
+
+    Raises:
+        InvalidCursor: the cursor wasn't returned by this function for the same sort
+    """
+    if descending is None:
+        descending = SORTS[sort].descending
+    sort_keys = [key.expression.label(f"sort_{i}") for i, key in enumerate(SORTS[sort].keys)]
+    ordering = _ordering(SORTS[sort], descending)
+    query = _list_query().add_columns(*sort_keys)
+
+    if status_filter:
+        query = query.where(Application.status == status_filter)
+
+    terms = search_terms(search)
+    if terms:
+        query = query.where(search_condition(terms))
+
+    if cursor:
+        query = query.where(_after(cursor, sort, descending))
+
+    # One extra row tells whether there is a next page
+    query = query.order_by(*ordering).limit(limit + 1)
+    if facets:
+        rows, facet_counts = await _with_facets(db, query, ordering, terms)
+    else:
+        rows, facet_counts = (await db.execute(query)).all(), None
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor([sort, _order_name(descending), *(getattr(last, k.key) for k in sort_keys), last.id])
+    return ApplicationListPage(items=[_item(row) for row in rows], next_cursor=next_cursor, facets=facet_counts)
+
+
+async def _with_facets(db: AsyncSession, page_query, ordering, terms: List[str]):
+    """
+    Run the page query and the facet counts as one statement
+
+    Page rows come first, in page order, with NULL facet columns; each facet
+    count is a row with NULL page columns.
+    """
+    page = page_query.add_columns(func.row_number().over(order_by=ordering).label("position")).subquery("page")
+    counts = facet_counts(terms).subquery("facet_counts")
+    statement = union_all(
+        select(*page.c, null().label("facet"), null().label("value"), null().label("count")),
+        select(*(null().label(column.key) for column in page.c), counts.c.facet, counts.c.value, counts.c.count),
+    )
+    statement = statement.order_by(statement.selected_columns.position)
+    rows = (await db.execute(statement)).all()
+
+    facets = ApplicationListFacets(
+        status={status: 0 for status in STATUSES},
+        completion={label: 0 for label, _, _ in COMPLETION_BUCKETS},
+    )
+    page_rows = []
+    for row in rows:
+        if row.facet is None:
+            page_rows.append(row)
+        else:
+            getattr(facets, row.facet)[row.value] = row.count
+    facets.total = sum(facets.status.values())
+    return page_rows, facets
+
+
+def facet_counts(terms: List[str]):
+    """
+    (facet, value, count) rows over the applications matching the search:
+    one per status, completion bucket and team that approved any of them
+    """
+    matched = select(
+        Application.id,
+        Application.status,
+        case(
+            *((Application.completion_percentage.between(lowest, highest), literal_column(f"'{label}'"))
+              for label, lowest, highest in COMPLETION_BUCKETS),
+            else_=literal_column("'0'"),
+        ).label("bucket"),
+    )
+    if terms:
+        matched = matched.join(User, Application.user_id == User.id).where(search_condition(terms))
+    matched = matched.cte("matched")
+
+    admin = aliased(User)
+    return union_all(
+        select(literal_column("'status'").label("facet"), matched.c.status.label("value"), func.count().label("count"))
+        .group_by(matched.c.status),
+        select(literal_column("'completion'"), matched.c.bucket, func.count())
+        .group_by(matched.c.bucket),
+        select(literal_column("'approved_by_team'"), admin.team, func.count(ApplicationApproval.application_id.distinct()))
+        .join(admin, ApplicationApproval.admin_id == admin.id)
+        .where(
+            ApplicationApproval.approved.is_(True),
+            admin.team.isnot(None),
+            ApplicationApproval.application_id.in_(select(matched.c.id)),
+        )
+        .group_by(admin.team),
+    )
+
+
+async def search_applications(
+    db: AsyncSession,
+    search: str,
+    limit: int = DEFAULT_SEARCH_RESULTS,
+) -> List[ApplicationSearchResult]:
+    """
+    Best matches for a search, camper-name matches first
+
+    Ranked by ts_rank on Postgres; on SQLite all matches rank equally.
+    Ties (and SQLite) fall back to most recently updated first.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return []
+
+    rank = literal(0.0) if IS_SQLITE else func.ts_rank(_search_document(), _prefix_query(terms, "&"))
+    query = (
+        _list_query()
+        .add_columns(rank.label("rank"))
+        .where(search_condition(terms))
+        .order_by(rank.desc(), sortable_timestamp(Application.updated_at).desc(), Application.id.desc())
+        .limit(limit)
+    )
+    rows = (await db.execute(query)).all()
+    return [ApplicationSearchResult(**_item(row).model_dump(), rank=row.rank) for row in rows]
+
+
+def _list_query():
+    """Projection shared by the list and search: application, parent and approval stats columns"""
+    approvals = approval_stats()
+    return (
+        select(
+            *_APPLICATION_COLUMNS,
+            *_USER_COLUMNS,
+            func.coalesce(approvals.c.approval_count, 0).label("approval_count"),
+            approvals.c.approved_by_teams,
+        )
+        .join(User, Application.user_id == User.id)
+        .outerjoin(approvals, approvals.c.application_id == Application.id)
+    )
+
+
+def _item(row) -> ApplicationListItem:
+    return ApplicationListItem(
+        **{column.key: getattr(row, column.key) for column in _APPLICATION_COLUMNS},
+        user=UserInfo(id=row.user_id, email=row.email, first_name=row.first_name,
+                      last_name=row.last_name, phone=row.phone),
+        approval_count=row.approval_count,
+        # NULL (no approvals) comes back as an empty list
+        approved_by_teams=row.approved_by_teams,
+    )
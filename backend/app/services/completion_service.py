@@ -0,0 +1,155 @@
+"""
+Application completion counters
+
+An application's completion_percentage is the share of visible required
+questions that have a response (visibility per the form snapshot: status,
+active flags and show-if chains). Computing it from scratch reads every
+response, so each application keeps counters in completion_state:
+
+    {"form": <snapshot fingerprint>, "status": <application status>,
+     "sections": {"<section id>": [required, answered_required], ...}}
+
+Autosave adjusts them using only the questions in the PATCH (plus their
+triggers and the questions chained off them). They are rebuilt from scratch
+when the form or the application status changed since they were computed,
+or when another write path cleared them.
+"""
+
+from typing import Dict, Mapping, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.form_schema import FormSnapshot, form_schema_cache
+from ..models.application import Application, ApplicationResponse
+
+
+async def load_answers(
+    db: AsyncSession,
+    application_id,
+    question_ids: Optional[Set[UUID]] = None,
+) -> Dict[UUID, Optional[str]]:
+    """question id -> response value for an application (optionally only some questions)"""
+    query = select(ApplicationResponse.question_id, ApplicationResponse.response_value).where(
+        ApplicationResponse.application_id == application_id
+    )
+    if question_ids is not None:
+        if not question_ids:
+            return {}
+        query = query.where(ApplicationResponse.question_id.in_(question_ids))
+    result = await db.execute(query)
+    return dict(result.all())
+
+
+def compute_state(snapshot: FormSnapshot, status: Optional[str], answers: Mapping[UUID, Optional[str]]) -> dict:
+    """Counters computed from all of an application's answers"""
+    sections: Dict[str, list] = {}
+    for question_id in snapshot.visible_question_ids(status, answers):
+        question = snapshot.questions[question_id]
+        if question.is_required:
+            counts = sections.setdefault(str(question.section_id), [0, 0])
+            counts[0] += 1
+            if question_id in answers:
+                counts[1] += 1
+    return {"form": snapshot.fingerprint, "status": status, "sections": sections}
+
+
+def is_current(state: Optional[dict], snapshot: FormSnapshot, status: Optional[str]) -> bool:
+    """Whether stored counters were computed for this form and status"""
+    return bool(state) and state.get("form") == snapshot.fingerprint and state.get("status") == status
+
+
+def questions_to_load(snapshot: FormSnapshot, changed_ids: Set[UUID]) -> Set[UUID]:
+    """Questions whose previous answers apply_changes needs"""
+    affected = changed_ids | snapshot.visibility.descendants(changed_ids)
+    return affected | snapshot.visibility.ancestors(affected)
+
+
+def apply_changes(
+    state: dict,
+    snapshot: FormSnapshot,
+    changes: Mapping[UUID, Optional[str]],
+    previous: Mapping[UUID, Optional[str]],
+) -> dict:
+    """
+    Counters after saving `changes` (question id -> new response value)
+
+    Args:
+        previous: answers before the change, for at least questions_to_load()
+    """
+    graph = snapshot.visibility
+    shown = snapshot.shown_question_ids(state["status"]).__contains__
+    after = {**previous, **changes}
+    sections = {section_id: list(counts) for section_id, counts in state["sections"].items()}
+
+    for question_id in set(changes) | graph.descendants(set(changes)):
+        question = snapshot.questions.get(question_id)
+        if question is None or not question.is_required:
+            continue
+        # Take out the question's old contribution and add its new one
+        for answers, sign in ((previous, -1), (after, 1)):
+            if graph.is_visible(question_id, shown, answers):
+                counts = sections.setdefault(str(question.section_id), [0, 0])
+                counts[0] += sign
+                if question_id in answers:
+                    counts[1] += sign
+
+    return {**state, "sections": sections}
+
+
+def percentage(state: dict) -> int:
+    """Completion percentage from counters (100 when nothing is required)"""
+    required = sum(counts[0] for counts in state["sections"].values())
+    answered = sum(counts[1] for counts in state["sections"].values())
+    if required == 0:
+        return 100
+    return int((answered / required) * 100)
+
+
+class CompletionUpdate:
+    """
+    Keeps completion counters in step with a write to an application's responses
+
+    Call start() before the responses are changed and finish() after
+    (before committing):
+
+        update = await CompletionUpdate.start(db, application, changes)
+        ... save responses ...
+        await update.finish()
+    """
+
+    def __init__(self, db: AsyncSession, application: Application, snapshot: FormSnapshot,
+                 changes: Mapping[UUID, Optional[str]], previous: Optional[Mapping[UUID, Optional[str]]]):
+        self.db = db
+        self.application = application
+        self.snapshot = snapshot
+        self.changes = changes
+        self.previous = previous
+
+    @classmethod
+    async def start(cls, db: AsyncSession, application: Application,
+                    changes: Mapping[UUID, Optional[str]]) -> "CompletionUpdate":
+        snapshot = await form_schema_cache.get(db)
+        previous = None
+        if is_current(application.completion_state, snapshot, application.status):
+            previous = await load_answers(db, application.id, questions_to_load(snapshot, set(changes)))
+        return cls(db, application, snapshot, changes, previous)
+
+    @property
+    def incremental(self) -> bool:
+        return self.previous is not None
+
+    async def finish(self) -> int:
+        """Store the new counters and completion percentage on the application; returns the percentage"""
+        if self.incremental:
+            state = apply_changes(self.application.completion_state, self.snapshot, self.changes, self.previous)
+        else:
+            # Sessions don't autoflush; make the saved responses visible to the query
+            await self.db.flush()
+            answers = await load_answers(self.db, self.application.id)
+            state = compute_state(self.snapshot, self.application.status, answers)
+
+        self.application.completion_state = state
+        self.application.completion_percentage = percentage(state)
+        return self.application.completion_percentage
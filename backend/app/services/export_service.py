@@ -0,0 +1,152 @@
+"""
+Application export (CSV or NDJSON)
+
+One row per application: the application's fields and the family's contact
+details, then one column per question of the form, headed by the question
+text, in form order. Answers come from applications.application_data (see
+response_service.py), so each application is a single row and no response
+rows are grouped.
+
+Rows are streamed from a server-side cursor (yield_per) and written out a
+batch at a time, so memory stays the same however many applications there
+are. The export opens its own session: the response body is sent after the
+request's dependencies have been closed.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from ..core.database import AsyncSessionLocal
+from ..models.application import Application, ApplicationQuestion, ApplicationSection
+from ..models.user import User
+from .application_list_service import search_condition, search_terms
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+BATCH_SIZE = 500
+
+# Spreadsheets run a cell starting with one of these as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# (header, column) for the fields ahead of the answers
+_FIXED_COLUMNS = (
+    ("Application ID", Application.id),
+    ("Camper First Name", Application.camper_first_name),
+    ("Camper Last Name", Application.camper_last_name),
+    ("Status", Application.status),
+    ("Completion %", Application.completion_percentage),
+    ("Returning Camper", Application.is_returning_camper),
+    ("Cabin", Application.cabin_assignment),
+    ("Parent First Name", User.first_name),
+    ("Parent Last Name", User.last_name),
+    ("Parent Email", User.email),
+    ("Parent Phone", User.phone),
+    ("Created", Application.created_at),
+    ("Completed", Application.completed_at),
+    ("Accepted", Application.accepted_at),
+)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _csv_cell(value):
+    """Quote family-entered text that a spreadsheet would run as a formula (CSV injection)"""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _unique(headers: List[str]) -> List[str]:
+    """
+    Number repeated headers ("Allergies", "Allergies (2)") so NDJSON keys don't
+    collide, skipping numbers another header already uses
+    """
+    counts: Dict[str, int] = {}
+    used = set()
+    unique = []
+    for header in headers:
+        name = header
+        while name in used:
+            counts[header] = counts.get(header, 1) + 1
+            name = f"{header} ({counts[header]})"
+        used.add(name)
+        unique.append(name)
+    return unique
+
+
+async def _questions(db) -> List[Tuple[str, str]]:
+    """(question id, question text) for every question, in form order"""
+    result = await db.execute(
+        select(ApplicationQuestion.id, ApplicationQuestion.question_text)
+        .join(ApplicationSection, ApplicationQuestion.section_id == ApplicationSection.id)
+        .order_by(ApplicationSection.order_index, ApplicationQuestion.order_index, ApplicationQuestion.id)
+    )
+    return [(str(question_id), text) for question_id, text in result.all()]
+
+
+def _answer(entry: Optional[dict]):
+    """The exported value of an application_data entry (file questions export the file id)"""
+    if not entry:
+        return None
+    if entry.get("response_value") is not None:
+        return entry["response_value"]
+    return entry.get("file_id")
+
+
+async def export_applications(
+    format: str,
+    status_filter: Optional[str] = None,
+    search: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    The export as text chunks: a header line (CSV) then one line per
+    application, most recently updated first, a batch per chunk
+    """
+    async with AsyncSessionLocal() as db:
+        questions = await _questions(db)
+        headers = _unique([header for header, _ in _FIXED_COLUMNS] + [text for _, text in questions])
+
+        query = (
+            select(*(column for _, column in _FIXED_COLUMNS), Application.application_data)
+            .join(User, Application.user_id == User.id)
+            .order_by(Application.updated_at.desc(), Application.id.desc())
+        )
+        if status_filter:
+            query = query.where(Application.status == status_filter)
+        terms = search_terms(search)
+        if terms:
+            query = query.where(search_condition(terms))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(headers)
+            yield buffer.getvalue()
+
+        result = await db.stream(query.execution_options(yield_per=BATCH_SIZE))
+        async for rows in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                data = row.application_data or {}
+                values = [_plain(value) for value in row[:len(_FIXED_COLUMNS)]]
+                values += [_answer(data.get(question_id)) for question_id, _ in questions]
+                if format == "csv":
+                    writer.writerow([_csv_cell(value) for value in values])
+                else:
+                    buffer.write(json.dumps(dict(zip(headers, values))) + "\n")
+            yield buffer.getvalue()
@@ -0,0 +1,174 @@
+"""
+Google ID token verification
+Verifies Google sign-in tokens against a cached copy of Google's signing certificates
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from fastapi.concurrency import run_in_threadpool
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+from google.auth.transport import requests as google_requests
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Used when Google's response has no Cache-Control max-age
+DEFAULT_CERTS_MAX_AGE_SECONDS = 300
+
+# A token with an unknown key id refetches the certificates at most this often,
+# so forged tokens with random key ids can't make every sign-in wait on Google
+UNKNOWN_KID_REFRESH_INTERVAL_SECONDS = 60
+
+
+def _build_transport() -> google_requests.Request:
+    """Create a google-auth transport backed by a pooled, keep-alive requests.Session"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10)
+    session.mount("https://", adapter)
+    return google_requests.Request(session=session)
+
+
+# Shared transport so sign-ins reuse the TLS connection to Google (see _get_transport)
+_transport: Optional[google_requests.Request] = None
+_transport_lock = threading.Lock()
+
+# Cached {key id: x509 cert}; expiry follows Google's Cache-Control header
+_certs: Optional[Dict[str, str]] = None
+_certs_expire_at: float = 0.0
+_certs_fetched_at: float = float("-inf")
+_certs_pinned = False  # True when using a local stub key set (never refetched)
+_certs_lock = asyncio.Lock()
+
+
+def _get_transport() -> google_requests.Request:
+    """Return the process-wide transport, creating it on first use"""
+    global _transport
+
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = _build_transport()
+
+    return _transport
+
+
+def _parse_max_age(cache_control: Optional[str]) -> int:
+    """Extract max-age (seconds) from a Cache-Control header"""
+    if cache_control:
+        match = re.search(r"max-age=(\d+)", cache_control)
+        if match:
+            return int(match.group(1))
+    return DEFAULT_CERTS_MAX_AGE_SECONDS
+
+
+def _fetch_certs() -> tuple:
+    """
+    Download Google's current signing certificates
+
+    Returns:
+        (certs dict, max-age seconds)
+    """
+    response = _get_transport()(GOOGLE_CERTS_URL, method="GET")
+    if response.status != 200:
+        raise google_exceptions.TransportError(
+            f"Could not fetch Google certificates (status {response.status})"
+        )
+
+    certs = json.loads(response.data.decode("utf-8"))
+    return certs, _parse_max_age(response.headers.get("cache-control"))
+
+
+def use_stub_certs(certs: Dict[str, str]) -> None:
+    """
+    Pin a local key set instead of fetching Google's certificates
+
+    For tests and offline development: sign tokens with a locally generated
+    RSA key and pass its x509 certificate here as {key id: PEM cert}.
+    """
+    global _certs, _certs_expire_at, _certs_pinned
+    _certs = dict(certs)
+    _certs_expire_at = float("inf")
+    _certs_pinned = True
+
+
+def clear_cert_cache() -> None:
+    """Forget cached (or stub) certificates so the next sign-in refetches them"""
+    global _certs, _certs_expire_at, _certs_fetched_at, _certs_pinned
+    _certs = None
+    _certs_expire_at = 0.0
+    _certs_fetched_at = float("-inf")
+    _certs_pinned = False
+
+
+def _load_stub_certs_file() -> None:
+    """Pin the key set from GOOGLE_CERTS_FILE, if configured"""
+    if settings.GOOGLE_CERTS_FILE:
+        with open(settings.GOOGLE_CERTS_FILE) as f:
+            use_stub_certs(json.load(f))
+
+
+_load_stub_certs_file()
+
+
+async def _get_certs(required_kid: Optional[str] = None) -> Dict[str, str]:
+    """
+    Return cached certificates, refreshing them when expired
+
+    Google rotates keys ahead of the cache expiry, so a token signed with an
+    unknown key id also triggers a refresh, unless the certificates were
+    fetched in the last UNKNOWN_KID_REFRESH_INTERVAL_SECONDS.
+    """
+    global _certs, _certs_expire_at, _certs_fetched_at
+
+    async with _certs_lock:
+        now = time.monotonic()
+        fresh = _certs is not None and now < _certs_expire_at
+        has_key = required_kid is None or (_certs is not None and required_kid in _certs)
+        may_refresh = now - _certs_fetched_at >= UNKNOWN_KID_REFRESH_INTERVAL_SECONDS
+
+        if not _certs_pinned and (not fresh or (not has_key and may_refresh)):
+            certs, max_age = await run_in_threadpool(_fetch_certs)
+            _certs = certs
+            _certs_fetched_at = time.monotonic()
+            _certs_expire_at = _certs_fetched_at + max_age
+
+        return _certs or {}
+
+
+async def verify_google_id_token(token: str) -> dict:
+    """
+    Verify a Google ID token and return its claims
+
+    Checks signature, expiry, audience (GOOGLE_CLIENT_ID) and issuer.
+
+    Args:
+        token: Encoded Google ID token (the "credential" from Google sign-in)
+
+    Returns:
+        Decoded token claims
+
+    Raises:
+        ValueError: If the token is malformed, expired or fails verification
+    """
+    kid = google_jwt.decode_header(token).get("kid")
+    certs = await _get_certs(kid)
+    if kid is not None and kid not in certs:
+        raise ValueError(f"Unknown key id: {kid}")
+
+    idinfo = google_jwt.decode(token, certs=certs, audience=settings.GOOGLE_CLIENT_ID)
+
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+
+    return idinfo
@@ -0,0 +1,104 @@
+"""
+Health check service
+Reports connection pool usage and measured database/storage latency
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from ..core.config import get_settings
+from ..core.database import async_engine, engine, get_pool_status
+from . import storage_service
+
+settings = get_settings()
+
+# Last probe results, reused for HEALTH_CHECK_CACHE_SECONDS
+_cached_probes: Optional[dict] = None
+_cached_at: float = 0.0
+_probe_lock = asyncio.Lock()
+
+
+async def _timed(probe) -> dict:
+    """
+    Run a probe coroutine and measure its round-trip latency
+
+    Returns:
+        dict with status ("ok"/"error"), latency_ms and error message if any
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+        result = {"status": "ok"}
+    except asyncio.TimeoutError:
+        result = {"status": "error", "error": "timeout"}
+    except Exception as exc:
+        # Exception type only - this endpoint is unauthenticated
+        result = {"status": "error", "error": type(exc).__name__}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+async def _ping_database() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _ping_storage() -> None:
+    await run_in_threadpool(storage_service.check_connection)
+
+
+async def _get_probes() -> dict:
+    """Return cached probe results, re-running the probes when they are stale"""
+    global _cached_probes, _cached_at
+
+    async with _probe_lock:
+        age = time.monotonic() - _cached_at
+        if _cached_probes is None or age >= settings.HEALTH_CHECK_CACHE_SECONDS:
+            if storage_service.is_configured():
+                database, storage = await asyncio.gather(
+                    _timed(_ping_database),
+                    _timed(_ping_storage),
+                )
+            else:
+                database = await _timed(_ping_database)
+                storage = {"status": "not_configured"}
+            _cached_probes = {"database": database, "storage": storage}
+            _cached_at = time.monotonic()
+            age = 0.0
+
+    return {**_cached_probes, "checked_seconds_ago": round(age, 2)}
+
+
+async def get_health_report() -> dict:
+    """
+    Build the /api/health payload
+
+    Pool counts are read live on every call; the database and storage
+    round-trips are cached briefly so frequent health polling stays cheap.
+
+    Returns:
+        dict with overall status, pool usage and probe results
+    """
+    probes = await _get_probes()
+
+    if probes["database"]["status"] != "ok":
+        overall = "unhealthy"
+    elif probes["storage"]["status"] not in ("ok", "not_configured"):
+        overall = "degraded"
+    else:
+        overall = "healthy"
+
+    return {
+        "status": overall,
+        "database": probes["database"],
+        "storage": probes["storage"],
+        "checked_seconds_ago": probes["checked_seconds_ago"],
+        "pool": {
+            "sync": get_pool_status(engine.pool),
+            "async": get_pool_status(async_engine.pool),
+        },
+    }
@@ -0,0 +1,71 @@
+"""
+Application progress (per-section and overall)
+
+Shared by the family and admin progress endpoints. Sections and questions
+come from the in-memory form snapshot, so the only query is the
+application's responses; every per-question check is a set or dict lookup.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.form_schema import form_schema_cache
+from ..models.application import Application
+from ..schemas.application import ApplicationProgress, SectionProgress
+from .completion_service import load_answers
+
+
+async def get_application_progress(db: AsyncSession, application: Application) -> ApplicationProgress:
+    """
+    Completion status for each section the application can see, plus overall progress
+
+    A section is complete when all of its visible required questions are answered;
+    overall_percentage is the share of complete sections.
+    """
+    answers = await load_answers(db, application.id)
+    snapshot = await form_schema_cache.get(db)
+    visible_ids = snapshot.visible_question_ids(application.status, answers)
+
+    section_progress_list = []
+    completed_sections = 0
+    sections = snapshot.visible_sections(application.status)
+
+    for section in sections:
+        visible_questions = [q for q in section.questions if q.id in visible_ids]
+
+        total_questions = len(visible_questions)
+        required_questions = sum(1 for q in visible_questions if q.is_required)
+        answered_questions = sum(1 for q in visible_questions if q.id in answers)
+        answered_required = sum(1 for q in visible_questions if q.is_required and q.id in answers)
+
+        # Calculate section completion
+        if required_questions > 0:
+            section_percentage = int((answered_required / required_questions) * 100)
+        else:
+            section_percentage = 100 if answered_questions == total_questions else 0
+
+        is_complete = answered_required == required_questions
+        if is_complete:
+            completed_sections += 1
+
+        section_progress_list.append(SectionProgress(
+            section_id=section.id,
+            section_title=section.title,
+            total_questions=total_questions,
+            required_questions=required_questions,
+            answered_questions=answered_questions,
+            answered_required=answered_required,
+            completion_percentage=section_percentage,
+            is_complete=is_complete
+        ))
+
+    # Calculate overall percentage
+    total_sections = len(sections)
+    overall_percentage = int((completed_sections / total_sections) * 100) if total_sections > 0 else 0
+
+    return ApplicationProgress(
+        application_id=application.id,
+        total_sections=total_sections,
+        completed_sections=completed_sections,
+        overall_percentage=overall_percentage,
+        section_progress=section_progress_list
+    )
@@ -0,0 +1,222 @@
+"""
+Bulk writes of application responses
+
+Autosave, admin edits and file uploads all set "the response to question Q
+of application A". Each batch is written with a single
+INSERT ... ON CONFLICT (application_id, question_id) DO UPDATE instead of a
+SELECT plus INSERT/UPDATE per response.
+
+Every response carries a version that goes up each time its value or file
+changes. Writes that would leave a response as it is are skipped, so they
+neither touch the row nor bump its version.
+
+applications.application_data holds a copy of an application's responses,
+
+    {"<question id>": {"id", "response_value", "file_id", "version",
+                       "created_at", "updated_at"}, ...}
+
+so reading a whole application is one row. The functions here update it in
+the same transaction as the responses; callers must hold the application
+row lock (SELECT ... FOR UPDATE) with the application loaded after taking it.
+check_application_data.py compares it with the responses and rebuilds it.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, Mapping, Optional
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.database import IS_SQLITE
+from ..models.application import Application, ApplicationResponse
+
+# Response columns copied into application_data
+_DATA_COLUMNS = (
+    ApplicationResponse.id,
+    ApplicationResponse.question_id,
+    ApplicationResponse.response_value,
+    ApplicationResponse.file_id,
+    ApplicationResponse.version,
+    ApplicationResponse.created_at,
+    ApplicationResponse.updated_at,
+)
+
+# Entry fields that must agree with the responses table (timestamps are informational)
+_CHECKED_FIELDS = ("id", "response_value", "file_id", "version")
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def build_application_data(rows: Iterable) -> dict:
+    """application_data document for response rows (objects with the response columns)"""
+    return {
+        str(row.question_id): {
+            "id": str(row.id),
+            "response_value": row.response_value,
+            "file_id": str(row.file_id) if row.file_id is not None else None,
+            "version": row.version,
+            "created_at": _isoformat(row.created_at),
+            "updated_at": _isoformat(row.updated_at),
+        }
+        # Responses of deleted questions are not part of the application
+        for row in rows if row.question_id is not None
+    }
+
+
+def same_application_data(stored: Mapping, expected: Mapping) -> bool:
+    """Whether a stored document agrees with the one built from the responses"""
+    if stored.keys() != expected.keys():
+        return False
+    return all(
+        stored[key].get(field) == entry[field]
+        for key, entry in expected.items()
+        for field in _CHECKED_FIELDS
+    )
+
+
+def _store(application: Application, rows: Iterable) -> None:
+    """Merge written response rows into the application's document"""
+    entries = build_application_data(rows)
+    if entries:
+        # Reassign (not mutate) so the ORM sees the change
+        application.application_data = {**(application.application_data or {}), **entries}
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A response as currently saved"""
+    response_value: Optional[str]
+    file_id: Optional[UUID]
+    version: int
+
+    def matches(self, response_value: Optional[str], file_id: Optional[UUID]) -> bool:
+        return self.response_value == response_value and self.file_id == file_id
+
+
+async def load_stored_responses(
+    db: AsyncSession,
+    application_id,
+    question_ids: Collection[UUID],
+) -> Dict[UUID, StoredResponse]:
+    """question id -> saved response, for the given questions that have one"""
+    if not question_ids:
+        return {}
+    result = await db.execute(
+        select(
+            ApplicationResponse.question_id,
+            ApplicationResponse.response_value,
+            ApplicationResponse.file_id,
+            ApplicationResponse.version,
+        ).where(
+            ApplicationResponse.application_id == application_id,
+            ApplicationResponse.question_id.in_(question_ids),
+        )
+    )
+    return {
+        question_id: StoredResponse(response_value, file_id, version)
+        for question_id, response_value, file_id, version in result.all()
+    }
+
+
+async def upsert_responses(
+    db: AsyncSession,
+    application: Application,
+    responses: Iterable[tuple],
+) -> Dict[UUID, int]:
+    """
+    Insert or overwrite responses for one application in one statement
+
+    Args:
+        responses: (question_id, response_value, file_id) tuples; when a
+            question appears more than once the last value wins
+
+    Returns:
+        question id -> new version, for the responses actually written
+        (unchanged ones are left out)
+    """
+    rows = {}
+    for question_id, response_value, file_id in responses:
+        rows[question_id] = {
+            "id": uuid.uuid4(),
+            "application_id": application.id,
+            "question_id": question_id,
+            "response_value": response_value,
+            "file_id": file_id,
+        }
+    if not rows:
+        return {}
+
+    insert = (sqlite if IS_SQLITE else postgresql).insert
+    statement = insert(ApplicationResponse).values(list(rows.values()))
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[ApplicationResponse.application_id, ApplicationResponse.question_id],
+        set_={
+            "response_value": excluded.response_value,
+            "file_id": excluded.file_id,
+            "version": ApplicationResponse.version + 1,
+            "updated_at": func.now(),
+        },
+        where=or_(
+            ApplicationResponse.response_value.is_distinct_from(excluded.response_value),
+            ApplicationResponse.file_id.is_distinct_from(excluded.file_id),
+        ),
+    ).returning(*_DATA_COLUMNS)
+    written = (await db.execute(statement)).all()
+    _store(application, written)
+    return {row.question_id: row.version for row in written}
+
+
+async def upsert_response(
+    db: AsyncSession,
+    application: Application,
+    question_id: UUID,
+    response_value: Optional[str] = None,
+    file_id: Optional[UUID] = None,
+) -> Dict[UUID, int]:
+    """Insert or overwrite a single response"""
+    return await upsert_responses(db, application, [(question_id, response_value, file_id)])
+
+
+async def clear_file(db: AsyncSession, application: Application, file_id: UUID) -> None:
+    """Unlink a deleted file from the application's responses"""
+    result = await db.execute(
+        update(ApplicationResponse)
+        .where(
+            ApplicationResponse.application_id == application.id,
+            ApplicationResponse.file_id == file_id,
+        )
+        .values(file_id=None, version=ApplicationResponse.version + 1, updated_at=func.now())
+        .returning(*_DATA_COLUMNS)
+    )
+    _store(application, result.all())
+
+
+def forget_questions(db: Session, question_ids: Collection[UUID]) -> None:
+    """Drop deleted questions from every application's document (application builder, sync session)"""
+    keys = [str(question_id) for question_id in question_ids]
+    if not keys:
+        return
+    if IS_SQLITE:
+        for key in keys:
+            db.execute(
+                text(
+                    "UPDATE applications SET application_data = json_remove(application_data, :path) "
+                    "WHERE json_type(application_data, :path) IS NOT NULL"
+                ),
+                {"path": f'$."{key}"'},
+            )
+    else:
+        db.execute(
+            text(
+                "UPDATE applications SET application_data = application_data - CAST(:keys AS text[]) "
+                "WHERE application_data ?| CAST(:keys AS text[])"
+            ),
+            {"keys": keys},
+        )
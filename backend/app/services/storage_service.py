@@ -4,19 +4,59 @@ Handles file uploads and downloads to Supabase Storage
 """
 
 import re
-from typing import BinaryIO, Optional, Union
-from supabase import create_client, Client
+import threading
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union
 from ..core.config import get_settings
+from ..core.metrics import track_storage
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 settings = get_settings()
 
-# Initialize Supabase client
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# Supabase client, created on first use (see get_supabase_client)
+_supabase: Optional["Client"] = None
+_supabase_lock = threading.Lock()
 
 # Bucket name for application files
 BUCKET_NAME = "application-files"
 
 
+class StorageNotConfiguredError(Exception):
+    """Raised when storage is used without SUPABASE_URL/SUPABASE_KEY set"""
+
+
+def is_configured() -> bool:
+    """Whether Supabase storage credentials are present"""
+    return bool(settings.SUPABASE_URL and settings.SUPABASE_KEY)
+
+
+def get_supabase_client() -> "Client":
+    """
+    Return the process-wide Supabase client, creating it on first use
+
+    The supabase package and client are only loaded when storage is actually
+    used, which keeps cold starts fast and lets the API boot without storage
+    credentials.
+
+    Raises:
+        StorageNotConfiguredError: If SUPABASE_URL or SUPABASE_KEY is missing
+    """
+    global _supabase
+
+    if _supabase is None:
+        with _supabase_lock:
+            if _supabase is None:
+                if not is_configured():
+                    raise StorageNotConfiguredError(
+                        "File storage is not configured (set SUPABASE_URL and SUPABASE_KEY)"
+                    )
+                from supabase import create_client
+                _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+
+    return _supabase
+
+
 def _storage_error_status(exc: Exception) -> Optional[int]:
     """
     Attempt to extract an HTTP status code from a Supabase storage exception.
@@ -65,7 +105,7 @@ def ensure_bucket_exists() -> None:
     """
     try:
         # Try to get bucket info
-        supabase.storage.get_bucket(BUCKET_NAME)
+        get_supabase_client().storage.get_bucket(BUCKET_NAME)
         return
     except Exception as exc:
         # Only attempt to create the bucket when it truly does not exist
@@ -79,7 +119,7 @@ def ensure_bucket_exists() -> None:
             raise
 
     try:
-        supabase.storage.create_bucket(
+        get_supabase_client().storage.create_bucket(
             BUCKET_NAME,
             options={
                 "public": False,
@@ -95,7 +135,7 @@ def ensure_bucket_exists() -> None:
             },
         )
         # Verify bucket is now accessible; raises if not
-        supabase.storage.get_bucket(BUCKET_NAME)
+        get_supabase_client().storage.get_bucket(BUCKET_NAME)
     except Exception as exc:
         # Ignore conflict errors caused by race conditions; re-raise everything else
         status = _storage_error_status(exc)
@@ -108,6 +148,7 @@ def ensure_bucket_exists() -> None:
             raise
 
 
+@track_storage
 def upload_file(
     file: Union[bytes, BinaryIO],
     filename: str,
@@ -144,7 +185,7 @@ def upload_file(
             file.seek(0)
 
     def _upload_once(payload: bytes) -> None:
-        supabase.storage.from_(BUCKET_NAME).upload(
+        get_supabase_client().storage.from_(BUCKET_NAME).upload(
             path=file_path,
             file=payload,
             file_options={
@@ -158,7 +199,7 @@ def upload_file(
         _upload_once(file_bytes)
 
         # Get signed URL (valid for 1 year)
-        signed_url = supabase.storage.from_(BUCKET_NAME).create_signed_url(
+        signed_url = get_supabase_client().storage.from_(BUCKET_NAME).create_signed_url(
             file_path,
             expires_in=31536000  # 1 year in seconds
         )
@@ -176,7 +217,7 @@ def upload_file(
             ensure_bucket_exists()
             try:
                 _upload_once(file_bytes)
-                signed_url = supabase.storage.from_(BUCKET_NAME).create_signed_url(
+                signed_url = get_supabase_client().storage.from_(BUCKET_NAME).create_signed_url(
                     file_path,
                     expires_in=31536000
                 )
@@ -193,6 +234,7 @@ def upload_file(
         ) from exc
 
 
+@track_storage
 def download_file(file_path: str) -> bytes:
     """
     Download a file from Supabase Storage
@@ -204,12 +246,13 @@ def download_file(file_path: str) -> bytes:
         File binary data
     """
     try:
-        result = supabase.storage.from_(BUCKET_NAME).download(file_path)
+        result = get_supabase_client().storage.from_(BUCKET_NAME).download(file_path)
         return result
     except Exception as e:
         raise Exception(f"Failed to download file: {str(e)}")
 
 
+@track_storage
 def delete_file(file_path: str) -> bool:
     """
     Delete a file from Supabase Storage
@@ -221,12 +264,13 @@ def delete_file(file_path: str) -> bool:
         True if successful
     """
     try:
-        supabase.storage.from_(BUCKET_NAME).remove([file_path])
+        get_supabase_client().storage.from_(BUCKET_NAME).remove([file_path])
         return True
     except Exception as e:
         raise Exception(f"Failed to delete file: {str(e)}")
 
 
+@track_storage
 def get_signed_url(file_path: str, expires_in: int = 3600) -> str:
     """
     Get a signed URL for accessing a private file
@@ -239,10 +283,21 @@ def get_signed_url(file_path: str, expires_in: int = 3600) -> str:
         Signed URL
     """
     try:
-        result = supabase.storage.from_(BUCKET_NAME).create_signed_url(
+        result = get_supabase_client().storage.from_(BUCKET_NAME).create_signed_url(
             file_path,
             expires_in=expires_in
         )
         return result.get("signedURL", "")
     except Exception as e:
         raise Exception(f"Failed to generate signed URL: {str(e)}")
+
+
+@track_storage
+def check_connection() -> None:
+    """
+    Round-trip to Supabase Storage (used by the health check)
+
+    Raises:
+        Exception: If the storage API is unreachable or rejects the request
+    """
+    get_supabase_client().storage.get_bucket(BUCKET_NAME)
@@ -0,0 +1 @@
+"""Synthetic data generator and in-process load benchmarks"""
@@ -0,0 +1,98 @@
+"""
+Progress endpoint benchmark on a large form
+
+Seeds a form with 300 questions (20 sections x 15 by default) and measures
+the family and admin progress endpoints: latency percentiles, throughput
+and SQL statements per request. The statement count should stay flat as
+sections and questions grow.
+
+Usage (from backend/, DATABASE_URL pointing at a throwaway "bench" database):
+    python -m benchmarks.progress
+    python -m benchmarks.progress --sections 30 --questions 20 --requests 500
+"""
+
+import argparse
+import asyncio
+import random
+
+import httpx
+from sqlalchemy import event
+
+from app.core.database import async_engine, engine
+from app.main import app
+
+from .run import _headers, print_results, run_scenario
+from .seed import generate, reset_schema
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+async def benchmark(summary, requests: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    families = summary.family_applications
+    family_headers = {user_id: _headers(user_id, "user") for user_id, _, _ in families}
+    admin_headers = _headers(summary.admin_ids[0], "admin", "ops")
+
+    results = {}
+    counter = _StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+
+            async def family_progress(i):
+                user_id, application_id, _ = families[rng.randrange(len(families))]
+                return await client.get(f"/api/applications/{application_id}/progress", headers=family_headers[user_id])
+
+            async def admin_progress(i):
+                _, application_id, _ = families[rng.randrange(len(families))]
+                return await client.get(f"/api/admin/applications/{application_id}/progress", headers=admin_headers)
+
+            for name, make_request in (("progress", family_progress), ("admin_progress", admin_progress)):
+                await run_scenario(make_request, min(concurrency, requests), concurrency)
+                counter.count = 0
+                results[name] = await run_scenario(make_request, requests, concurrency)
+                results[name]["queries_per_request"] = round(counter.count / requests, 2)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    return results
+
+
+async def main_async(args) -> None:
+    reset_schema(engine)
+    summary = generate(
+        engine,
+        applications=args.applications,
+        sections=args.sections,
+        questions_per_section=args.questions,
+        seed=args.seed,
+    )
+    print(f"Seeded {args.applications} applications, {summary.questions} questions in {summary.seconds:.1f}s", flush=True)
+
+    results = await benchmark(summary, args.requests, args.concurrency, args.seed)
+    print_results(args.applications, results)
+    for name, r in results.items():
+        print(f"  {name}: {r['queries_per_request']} SQL statements per request")
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the progress endpoints on a large form")
+    parser.add_argument("--applications", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=15, help="Questions per section")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
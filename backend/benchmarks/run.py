@@ -0,0 +1,218 @@
+"""
+In-process load benchmarks
+
+Seeds a synthetic season at each requested size, then drives the app over
+httpx's ASGI transport (no network, no uvicorn) and reports throughput and
+p50/p95/p99 latency for the hot endpoints:
+
+    autosave   PATCH /api/applications/{id}           (family)
+    sections   GET   /api/applications/sections       (family)
+    progress   GET   /api/applications/{id}/progress  (family)
+    admin_list GET   /api/applications/admin/all      (admin)
+    dashboard  GET   /api/super-admin/dashboard/stats (super admin)
+
+Usage (from backend/, DATABASE_URL pointing at a throwaway "bench" database):
+    python -m benchmarks.run --sizes 1000,10000,50000
+    python -m benchmarks.run --sizes 1000 --requests 500 --concurrency 20 --json results.json
+
+Numbers include the database round trips but not network or TLS overhead, so
+compare runs against each other rather than against production dashboards.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy import select
+
+from app.core.database import async_engine, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.application import ApplicationQuestion
+
+from .seed import SeedSummary, generate, reset_schema
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_scenario(
+    make_request: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """
+    Issue `requests` calls with `concurrency` workers and time each one
+
+    Returns:
+        dict with request/error counts, throughput and latency percentiles (ms)
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await make_request(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def _headers(user_id, role: str, team: str = None) -> dict:
+    token = create_access_token(subject=str(user_id), role=role, team=team, token_version=0)
+    return {"Authorization": f"Bearer {token}"}
+
+
+SCENARIOS = ("autosave", "sections", "progress", "admin_list", "dashboard")
+
+
+async def benchmark(
+    summary: SeedSummary,
+    requests: int,
+    concurrency: int,
+    seed: int,
+    scenario_names=SCENARIOS,
+) -> Dict[str, dict]:
+    """Run every scenario against a seeded database"""
+    rng = random.Random(seed)
+    families = summary.family_applications
+    in_progress = [f for f in families if f[2] == "in_progress"] or families
+    family_headers = {user_id: _headers(user_id, "user") for user_id, _, _ in families}
+    admin_headers = _headers(summary.admin_ids[0], "admin", "ops")
+    super_admin_headers = _headers(summary.super_admin_id, "super_admin")
+
+    with engine.connect() as conn:
+        question_ids = [str(question_id) for question_id in conn.execute(select(ApplicationQuestion.id)).scalars()]
+
+    def pick(pool):
+        return pool[rng.randrange(len(pool))]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+        async def autosave(i):
+            user_id, application_id, _ = pick(in_progress)
+            payload = {"responses": [
+                {"question_id": question_id, "response_value": f"autosave {i}"}
+                for question_id in rng.sample(question_ids, k=min(3, len(question_ids)))
+            ]}
+            return await client.patch(f"/api/applications/{application_id}", json=payload, headers=family_headers[user_id])
+
+        async def sections(i):
+            user_id, application_id, _ = pick(families)
+            return await client.get(
+                "/api/applications/sections",
+                params={"application_id": str(application_id)},
+                headers=family_headers[user_id],
+            )
+
+        async def progress(i):
+            user_id, application_id, _ = pick(families)
+            return await client.get(f"/api/applications/{application_id}/progress", headers=family_headers[user_id])
+
+        async def admin_list(i):
+            return await client.get("/api/applications/admin/all", headers=admin_headers)
+
+        async def dashboard(i):
+            return await client.get("/api/super-admin/dashboard/stats", headers=super_admin_headers)
+
+        scenarios = {
+            "autosave": autosave,
+            "sections": sections,
+            "progress": progress,
+            "admin_list": admin_list,
+            "dashboard": dashboard,
+        }
+        for name in scenario_names:
+            make_request = scenarios[name]
+            # Warm up connection pools and caches before measuring
+            await run_scenario(make_request, min(concurrency, requests), concurrency)
+            results[name] = await run_scenario(make_request, requests, concurrency)
+            print(f"  {name}: done", flush=True)
+
+    return results
+
+
+def print_results(size: int, results: Dict[str, dict]) -> None:
+    print(f"\n{size} applications")
+    print(f"  {'scenario':<12} {'reqs':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, r in results.items():
+        print(
+            f"  {name:<12} {r['requests']:>6} {r['errors']:>6} {r['throughput_rps']:>8} "
+            f"{r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}"
+        )
+
+
+async def main_async(args) -> dict:
+    report = {}
+    for size in args.sizes:
+        reset_schema(engine)
+        summary = generate(
+            engine,
+            applications=size,
+            sections=args.sections,
+            questions_per_section=args.questions,
+            seed=args.seed,
+        )
+        print(f"Seeded {size} applications ({sum(summary.rows.values())} rows) in {summary.seconds:.1f}s", flush=True)
+
+        results = await benchmark(summary, args.requests, args.concurrency, args.seed, args.scenarios)
+        print_results(size, results)
+        report[str(size)] = results
+
+        # Start the next size with fresh pooled connections
+        await async_engine.dispose()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed synthetic data and benchmark hot endpoints in-process")
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=[1000],
+                        help="Comma-separated application counts, e.g. 1000,10000,50000")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument("--sections", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=12, help="Questions per section")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
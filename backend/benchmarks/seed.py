@@ -0,0 +1,346 @@
+"""
+Synthetic dataset generator
+
+Fills a database with a deterministic (seeded) camp season: families with one
+application each, a multi-section form with show_if_question_id chains,
+responses, medications and doses, allergies, admin approvals and audit logs.
+
+Rows are built in Python and bulk inserted in chunks, so 50k applications
+take minutes rather than hours.
+
+Usage (from backend/, DATABASE_URL pointing at a throwaway database):
+    python -m benchmarks.seed --applications 10000 --reset
+
+DATABASE_URL may be a SQLite file (sqlite:///camp_bench.db) for a quick
+run without Postgres.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, List
+
+import bcrypt
+from sqlalchemy.engine import Engine, make_url
+
+from app.core.database import Base
+from app.models.application import (
+    Allergy,
+    Application,
+    ApplicationApproval,
+    ApplicationHeader,
+    ApplicationQuestion,
+    ApplicationResponse,
+    ApplicationSection,
+    Medication,
+    MedicationDose,
+)
+from app.models.super_admin import AuditLog
+from app.models.user import User
+from app.services.response_service import build_application_data
+
+# Every seeded account uses this password
+SEED_PASSWORD = "BenchPass123!"
+
+ADMIN_TEAMS = ("ops", "behavioral", "med", "lit")
+
+# Share of applications in each status
+STATUS_WEIGHTS = {
+    "in_progress": 0.55,
+    "under_review": 0.25,
+    "accepted": 0.10,
+    "paid": 0.07,
+    "declined": 0.03,
+}
+
+INSERT_CHUNK_SIZE = 5000
+
+FIRST_NAMES = ("Avery", "Jordan", "Riley", "Casey", "Morgan", "Quinn", "Rowan", "Skyler", "Emerson", "Hayden")
+LAST_NAMES = ("Smith", "Johnson", "Lee", "Garcia", "Brown", "Martinez", "Davis", "Lopez", "Wilson", "Clark")
+MEDICATIONS = ("Methylphenidate", "Guanfacine", "Melatonin", "Sertraline", "Risperidone", "Albuterol")
+ALLERGENS = ("Peanuts", "Penicillin", "Bee stings", "Latex", "Shellfish", "Dairy")
+
+
+@dataclass
+class SeedSummary:
+    """What was created; the benchmark suite picks its callers from here"""
+    applications: int
+    questions: int
+    rows: Dict[str, int] = field(default_factory=dict)
+    family_applications: List[tuple] = field(default_factory=list)  # (user_id, application_id, status)
+    admin_ids: List[uuid.UUID] = field(default_factory=list)
+    super_admin_id: uuid.UUID = None
+    seconds: float = 0.0
+
+
+def reset_schema(engine: Engine) -> None:
+    """
+    Drop and recreate every table from the models
+
+    Refuses to run unless the database name contains "bench" or "test".
+    """
+    database = make_url(str(engine.url)).database or ""
+    if "bench" not in database and "test" not in database:
+        raise SystemExit(
+            f"Refusing to reset '{database}': use a database whose name contains 'bench' or 'test'"
+        )
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+class _Generator:
+    def __init__(self, rng: random.Random, now: datetime):
+        self.rng = rng
+        self.now = now
+        self.rows: Dict[str, list] = {}
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self, max_days_ago: int = 180) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, max_days_ago * 86400))
+
+    def add(self, model, **values) -> uuid.UUID:
+        values.setdefault("id", self.new_id())
+        self.rows.setdefault(model.__tablename__, []).append(values)
+        return values["id"]
+
+
+def _build_form(gen: _Generator, sections: int, questions_per_section: int) -> List[dict]:
+    """
+    Create sections, headers and questions
+
+    Each section opens with a Yes/No question followed by a chain of
+    conditional questions (each shown only if the previous one is "Yes").
+    The last section is only shown once an application is accepted.
+    """
+    form = []
+    medical_section = min(1, sections - 1)
+
+    for s in range(sections):
+        section_id = gen.add(
+            ApplicationSection,
+            title=f"Section {s + 1}",
+            description=f"Synthetic section {s + 1}",
+            order_index=s,
+            is_active=True,
+            visible_before_acceptance=True,
+            show_when_status="accepted" if sections > 1 and s == sections - 1 else None,
+        )
+        gen.add(ApplicationHeader, section_id=section_id, header_text=f"Part {s + 1}", order_index=0, is_active=True)
+
+        previous_id = None
+        for q in range(questions_per_section):
+            if s == medical_section and q == questions_per_section - 2:
+                question_type = "medication_list"
+            elif s == medical_section and q == questions_per_section - 1:
+                question_type = "allergy_list"
+            elif q % 4 == 0:
+                question_type = "dropdown"
+            else:
+                question_type = gen.rng.choice(("text", "textarea", "date", "phone"))
+
+            # Chain questions 1-3 of each section off their predecessor
+            conditional = previous_id is not None and 1 <= q <= 3
+            question_id = gen.add(
+                ApplicationQuestion,
+                section_id=section_id,
+                question_text=f"Question {s + 1}.{q + 1}",
+                question_type=question_type,
+                options=["Yes", "No"] if question_type == "dropdown" else None,
+                is_required=q % 3 != 2,
+                reset_annually=False,
+                order_index=q,
+                is_active=True,
+                show_if_question_id=previous_id if conditional else None,
+                show_if_answer="Yes" if conditional else None,
+            )
+            form.append({"id": question_id, "type": question_type, "conditional": conditional})
+            previous_id = question_id
+
+    return form
+
+
+def _answer(gen: _Generator, question_type: str) -> str:
+    if question_type == "dropdown":
+        return gen.rng.choice(("Yes", "Yes", "No"))
+    if question_type == "date":
+        return f"20{gen.rng.randint(10, 20)}-0{gen.rng.randint(1, 9)}-1{gen.rng.randint(0, 9)}"
+    if question_type == "phone":
+        return f"555-{gen.rng.randint(100, 999)}-{gen.rng.randint(1000, 9999)}"
+    if question_type in ("medication_list", "allergy_list"):
+        return "Yes"
+    return " ".join(gen.rng.choice(LAST_NAMES) for _ in range(gen.rng.randint(2, 12)))
+
+
+def generate(
+    engine: Engine,
+    applications: int = 1000,
+    sections: int = 10,
+    questions_per_section: int = 12,
+    admins: int = 8,
+    seed: int = 42,
+) -> SeedSummary:
+    """
+    Insert a synthetic season into an (empty) schema
+
+    Args:
+        engine: Sync engine for the target database
+        applications: Number of families (one application each)
+        sections: Form sections
+        questions_per_section: Questions in each section
+        admins: Admin users, spread across the review teams
+        seed: Random seed; the same arguments produce the same rows (timestamps are relative to now)
+
+    Returns:
+        SeedSummary
+    """
+    started = time.perf_counter()
+    gen = _Generator(random.Random(seed), datetime.now(timezone.utc))
+    # Low bcrypt cost: seeding speed matters more than hash strength here
+    password_hash = bcrypt.hashpw(SEED_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+    summary = SeedSummary(applications=applications, questions=sections * questions_per_section)
+
+    summary.super_admin_id = gen.add(
+        User, email="director@bench.fasdcamp.org", password_hash=password_hash, role="super_admin",
+        first_name="Camp", last_name="Director", status="active", token_version=0, email_verified=True,
+    )
+    for a in range(admins):
+        summary.admin_ids.append(gen.add(
+            User, email=f"admin{a}@bench.fasdcamp.org", password_hash=password_hash, role="admin",
+            team=ADMIN_TEAMS[a % len(ADMIN_TEAMS)], first_name="Admin", last_name=str(a),
+            status="active", token_version=0, email_verified=True,
+        ))
+
+    form = _build_form(gen, sections, questions_per_section)
+    medication_question = next((q["id"] for q in form if q["type"] == "medication_list"), form[0]["id"])
+    allergy_question = next((q["id"] for q in form if q["type"] == "allergy_list"), form[0]["id"])
+
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+
+    for i in range(applications):
+        created_at = gen.timestamp()
+        user_id = gen.add(
+            User, email=f"family{i}@bench.example.com", password_hash=password_hash, role="user",
+            first_name=gen.rng.choice(FIRST_NAMES), last_name=gen.rng.choice(LAST_NAMES),
+            status="active", token_version=0, email_verified=True, created_at=created_at,
+        )
+
+        app_status = gen.rng.choices(statuses, weights)[0]
+        answered_fraction = gen.rng.uniform(0.05, 0.95) if app_status == "in_progress" else 1.0
+        # Filled in below from the generated responses
+        application_data = {}
+        application_id = gen.add(
+            Application,
+            user_id=user_id,
+            camper_first_name=gen.rng.choice(FIRST_NAMES),
+            camper_last_name=gen.rng.choice(LAST_NAMES),
+            status=app_status,
+            completion_percentage=int(answered_fraction * 100),
+            is_returning_camper=gen.rng.random() < 0.3,
+            application_data=application_data,
+            created_at=created_at,
+            updated_at=created_at + timedelta(days=gen.rng.randint(0, 30)),
+            accepted_at=created_at + timedelta(days=30) if app_status in ("accepted", "paid") else None,
+            declined_at=created_at + timedelta(days=30) if app_status == "declined" else None,
+        )
+        summary.family_applications.append((user_id, application_id, app_status))
+
+        responses = []
+        for question in form:
+            if gen.rng.random() < answered_fraction:
+                gen.add(
+                    ApplicationResponse,
+                    application_id=application_id,
+                    question_id=question["id"],
+                    response_value=_answer(gen, question["type"]),
+                    file_id=None,
+                    version=1,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                responses.append(SimpleNamespace(**gen.rows[ApplicationResponse.__tablename__][-1]))
+        application_data.update(build_application_data(responses))
+
+        for m in range(gen.rng.choice((0, 0, 1, 1, 2, 3))):
+            medication_id = gen.add(
+                Medication, application_id=application_id, question_id=medication_question,
+                medication_name=gen.rng.choice(MEDICATIONS), strength=f"{gen.rng.choice((5, 10, 20))}mg",
+                dose_amount="1", dose_form="tablet", order_index=m,
+            )
+            for d in range(gen.rng.randint(1, 2)):
+                gen.add(
+                    MedicationDose, medication_id=medication_id,
+                    given_type=gen.rng.choice(("At specific time", "As needed")),
+                    time=gen.rng.choice(("8:00 AM", "12:00 PM", "8:00 PM", "N/A")), order_index=d,
+                )
+
+        for a in range(gen.rng.choice((0, 0, 0, 1, 2))):
+            gen.add(
+                Allergy, application_id=application_id, question_id=allergy_question,
+                allergen=gen.rng.choice(ALLERGENS), severity=gen.rng.choice(("Mild", "Moderate", "Severe")),
+                order_index=a,
+            )
+
+        if app_status != "in_progress":
+            for admin_id in gen.rng.sample(summary.admin_ids, k=min(len(summary.admin_ids), gen.rng.randint(0, 3))):
+                gen.add(
+                    ApplicationApproval, application_id=application_id, admin_id=admin_id,
+                    approved=app_status != "declined", created_at=gen.timestamp(30),
+                )
+
+        for action in ("created", "updated")[:gen.rng.randint(1, 2)]:
+            gen.add(
+                AuditLog, entity_type="application", entity_id=application_id, action=action,
+                actor_id=user_id, details={"source": "seed"}, created_at=created_at,
+            )
+
+    # sorted_tables inserts parents before children
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            rows = gen.rows.get(table.name)
+            if not rows:
+                continue
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                conn.execute(table.insert(), rows[start:start + INSERT_CHUNK_SIZE])
+            summary.rows[table.name] = len(rows)
+
+    summary.seconds = time.perf_counter() - started
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic camp season")
+    parser.add_argument("--applications", type=int, default=1000)
+    parser.add_argument("--sections", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=12, help="Questions per section")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate the schema first")
+    args = parser.parse_args()
+
+    from app.core.database import engine
+
+    if args.reset:
+        reset_schema(engine)
+
+    summary = generate(
+        engine,
+        applications=args.applications,
+        sections=args.sections,
+        questions_per_section=args.questions,
+        seed=args.seed,
+    )
+    print(f"Seeded {summary.applications} applications in {summary.seconds:.1f}s")
+    for table, count in summary.rows.items():
+        print(f"  {table:<24} {count:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Check applications.application_data against application_responses
+
+application_data is the copy of each application's responses that application
+reads are served from (see app/services/response_service.py). This rebuilds the
+expected document from the responses table and reports every application whose
+stored copy differs; with --fix the stored copy is replaced.
+
+Usage (from backend/):
+    python check_application_data.py
+    python check_application_data.py --fix
+"""
+
+import argparse
+from typing import List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.application import Application, ApplicationResponse
+from app.services.response_service import build_application_data, same_application_data
+
+BATCH_SIZE = 500
+
+
+def check_application_data(db: Session, fix: bool = False, batch_size: int = BATCH_SIZE) -> List:
+    """Ids of applications whose application_data disagrees with their responses (rebuilt when fix)"""
+    application_ids = db.execute(select(Application.id).order_by(Application.id)).scalars().all()
+    mismatched = []
+
+    for start in range(0, len(application_ids), batch_size):
+        batch = application_ids[start:start + batch_size]
+        stored = dict(db.execute(
+            select(Application.id, Application.application_data).where(Application.id.in_(batch))
+        ).all())
+        responses = {}
+        for row in db.execute(select(ApplicationResponse).where(ApplicationResponse.application_id.in_(batch))).scalars():
+            responses.setdefault(row.application_id, []).append(row)
+
+        for application_id in batch:
+            expected = build_application_data(responses.get(application_id, ()))
+            if same_application_data(stored[application_id] or {}, expected):
+                continue
+            mismatched.append(application_id)
+            if fix:
+                db.execute(update(Application).where(Application.id == application_id).values(application_data=expected))
+
+        if fix:
+            db.commit()
+        # Drop the batch's response objects before the next one
+        db.expunge_all()
+
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check application_data against application_responses")
+    parser.add_argument("--fix", action="store_true", help="Rebuild mismatched application_data documents")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        mismatched = check_application_data(db, fix=args.fix)
+    finally:
+        db.close()
+
+    for application_id in mismatched:
+        print(f"{'✓ Rebuilt' if args.fix else '✗ Out of sync'}: {application_id}")
+    print(f"\n{len(mismatched)} application(s) {'rebuilt' if args.fix else 'out of sync'}")
+    if mismatched and not args.fix:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
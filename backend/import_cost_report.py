@@ -0,0 +1,72 @@
+"""
+Startup import-cost report
+
+Imports app.main in a fresh interpreter with `python -X importtime` and
+prints the total cold-start import time plus the most expensive modules.
+
+Usage (from backend/):
+    python import_cost_report.py            # top 25 modules
+    python import_cost_report.py --top 50
+    python import_cost_report.py --app-only # only app.* modules
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+
+def run_importtime(target: str) -> tuple:
+    """
+    Import `target` in a subprocess with -X importtime
+
+    Returns:
+        (wall clock seconds, list of (module, self_us, cumulative_us))
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    if result.returncode != 0:
+        # Not an importtime line - show the real import error
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        print("\n".join(errors), file=sys.stderr)
+        sys.exit(result.returncode)
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-module import cost for app startup")
+    parser.add_argument("--target", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    parser.add_argument("--app-only", action="store_true", help="Only list app.* modules")
+    args = parser.parse_args()
+
+    elapsed, modules = run_importtime(args.target)
+
+    total_us = next((cumulative for name, _, cumulative in modules if name == args.target), 0)
+    print(f"Import of {args.target}: {total_us / 1000:.1f} ms (process wall clock {elapsed * 1000:.0f} ms)")
+    print()
+
+    if args.app_only:
+        modules = [m for m in modules if m[0] == "app" or m[0].startswith("app.")]
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@ if login_response.status_code == 200:
     )
 
     if apps_response.status_code == 200:
-        apps = apps_response.json()
+        apps = apps_response.json()['items']
         print(f'✓ Got {len(apps)} applications')
 
         if len(apps) > 0:
@@ -40,7 +40,7 @@ if apps_response.status_code != 200:
     print(apps_response.text)
     sys.exit(1)
 
-apps = apps_response.json()
+apps = apps_response.json()['items']
 if len(apps) == 0:
     print("✗ No applications found")
     sys.exit(1)
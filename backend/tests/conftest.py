@@ -0,0 +1,223 @@
+"""
+Shared pytest fixtures
+
+Tests run the app in-process against the database given by
+TEST_DATABASE_URL (its name must contain "test"; the schema is dropped and
+recreated from the models on every run). Without TEST_DATABASE_URL they use
+an in-memory SQLite database, so no external service is needed.
+"""
+
+import functools
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Shared-cache in-memory SQLite, visible to both the sync and async engines
+SQLITE_MEMORY_URL = "sqlite:///file:camp_test?mode=memory&cache=shared&uri=true"
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL") or SQLITE_MEMORY_URL
+
+# Settings are read at import time, so configure them before importing the app
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+for name, value in {
+    "DEBUG": "false",
+    "JWT_SECRET": "test-secret",
+    "GOOGLE_CLIENT_ID": "test-client-id",
+    "GOOGLE_CLIENT_SECRET": "test-client-secret",
+    "STRIPE_SECRET_KEY": "sk_test",
+    "STRIPE_PUBLISHABLE_KEY": "pk_test",
+    "STRIPE_WEBHOOK_SECRET": "whsec_test",
+    "SENDGRID_API_KEY": "test",
+    "SENDGRID_FROM_EMAIL": "test@example.com",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.core.form_schema import form_schema_cache  # noqa: E402
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.models.application import (  # noqa: E402
+    Application,
+    ApplicationHeader,
+    ApplicationQuestion,
+    ApplicationSection,
+)
+from app.models.user import User  # noqa: E402
+
+# Password of every user made by make_user
+PASSWORD = "Password1!"
+
+
+class QueryCounter:
+    """Records every SQL statement executed on the app's engines"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements = []
+
+    def report(self) -> str:
+        return "\n".join(f"  {i + 1}. {' '.join(s.split())[:200]}" for i, s in enumerate(self.statements))
+
+
+@pytest.fixture
+def query_counter():
+    """
+    Count SQL statements (sync and async engines) while the test runs
+
+    Call query_counter.reset() right before the request being measured.
+    """
+    counter = QueryCounter()
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", counter)
+    yield counter
+    for target in engines:
+        event.remove(target, "before_cursor_execute", counter)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Recreate the schema in the test database"""
+    if "test" not in (make_url(TEST_DATABASE_URL).database or ""):
+        pytest.exit("TEST_DATABASE_URL must point to a dedicated test database (name containing 'test')")
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database):
+    """Sync session for arranging test data"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+async def client(database):
+    """httpx client calling the app in-process"""
+    principal_cache.clear()
+    form_schema_cache.invalidate()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
+    # asyncpg connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+def auth_headers(user) -> dict:
+    """Bearer header for a user"""
+    token = create_access_token(
+        subject=str(user.id),
+        role=user.role,
+        team=user.team,
+        token_version=user.token_version,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@functools.lru_cache
+def _password_hash() -> str:
+    # bcrypt is slow on purpose; seeded users share one hash
+    return get_password_hash(PASSWORD)
+
+
+class Seeder:
+    """
+    Adds rows (committed) in a session of its own and deletes them, newest
+    first, on close
+
+    Applications take their responses, approvals, notes and medications with
+    them; sections take their questions and headers, including ones added
+    through the API.
+    """
+
+    def __init__(self):
+        self.db = SessionLocal(expire_on_commit=False)
+        self.rows = []
+
+    def add(self, row):
+        return self.add_all([row])[0]
+
+    def add_all(self, rows):
+        self.db.add_all(rows)
+        self.db.commit()
+        self.rows.extend(rows)
+        return rows
+
+    def close(self):
+        try:
+            for row in reversed(self.rows):
+                if isinstance(row, (ApplicationQuestion, ApplicationHeader)):
+                    continue
+                if isinstance(row, ApplicationSection):
+                    for child in (ApplicationQuestion, ApplicationHeader):
+                        self.db.query(child).filter(child.section_id == row.id).delete()
+                self.db.delete(row)
+                # In order, before a section's bulk delete cascades in the database
+                self.db.flush()
+            self.db.commit()
+        finally:
+            self.db.close()
+
+
+@pytest.fixture(scope="module")
+def seeder(database):
+    """Rows a test module seeds; removed when the module finishes (other modules count sections)"""
+    seeder = Seeder()
+    yield seeder
+    seeder.close()
+
+
+@pytest.fixture(scope="module")
+def make_user(seeder):
+    """make_user(email, role="user", **columns) -> User with password PASSWORD unless password_hash is given"""
+    def make(email, role="user", **columns):
+        if "password_hash" not in columns:
+            columns["password_hash"] = _password_hash()
+        return seeder.add(User(email=email, role=role, **columns))
+    return make
+
+
+@pytest.fixture(scope="module")
+def make_form(seeder):
+    """
+    make_form(title, order_index, question_texts, **question_columns) -> (section, questions)
+
+    One section of text questions, in the given order.
+    """
+    def make(title, order_index, question_texts, **question_columns):
+        section = seeder.add(ApplicationSection(title=title, order_index=order_index))
+        questions = seeder.add_all([
+            ApplicationQuestion(section_id=section.id, question_text=text, question_type="text",
+                                order_index=i, **question_columns)
+            for i, text in enumerate(question_texts)
+        ])
+        return section, questions
+    return make
+
+
+@pytest.fixture(scope="module")
+def make_application(seeder):
+    """make_application(user, **columns) -> Application"""
+    def make(user, **columns):
+        return seeder.add(Application(user_id=user.id, **columns))
+    return make
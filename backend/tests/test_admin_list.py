@@ -0,0 +1,149 @@
+"""
+Admin application list: keyset pages, sorts, facets and the column-only projection
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.application import Application, ApplicationApproval
+
+from .conftest import auth_headers
+
+URL = "/api/applications/admin/all"
+# Every application seeded here has this camper last name, so searching for it isolates them
+LAST_NAME = "Keysetpage"
+
+
+@pytest.fixture(scope="module")
+def seeded(seeder, make_user, make_application):
+    """Twelve applications, several sharing an updated_at, and reviewing admins"""
+    family = make_user("list-family@example.com")
+    admin = make_user("list-ops@fasdcamp.org", role="admin", team="ops")
+    reviewers = [
+        make_user(f"list-{team}{i}@fasdcamp.org", role="admin", team=team)
+        for i, team in enumerate(("ops", "behavioral", "medical"))
+    ]
+
+    tied = datetime(2026, 3, 1, 12, 0, 0)
+    applications = []
+    for i in range(12):
+        application = Application(
+            user_id=family.id, camper_first_name=f"Camper{i}", camper_last_name=LAST_NAME,
+            status="under_review" if i % 3 == 0 else "in_progress",
+            completion_percentage=100 if i == 11 else i * 9,
+            # Two completions share a timestamp; the rest haven't completed
+            completed_at=tied + timedelta(days=min(i, 9)) if i >= 8 else None,
+        )
+        if i < 6:
+            application.updated_at = tied
+        elif i < 10:
+            application.updated_at = tied + timedelta(minutes=i)
+        # The rest keep the database default
+        applications.append(application)
+    seeder.add_all(applications)
+    # Two ops approvals, one behavioral, and a medical decline
+    seeder.add_all([
+        ApplicationApproval(application_id=applications[0].id, admin_id=reviewer.id, approved=approved)
+        for reviewer, approved in zip([admin, *reviewers], (True, True, True, False))
+    ])
+    seeder.add(ApplicationApproval(application_id=applications[1].id, admin_id=reviewers[2].id, approved=False))
+
+    return {"admin": admin, "application_ids": {str(a.id) for a in applications}}
+
+
+async def _all_pages(client, headers, **params):
+    items, cursor, pages = [], None, 0
+    while True:
+        response = await client.get(URL, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        items.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+async def test_pages_cover_every_application_once_in_order(client, seeded):
+    headers = auth_headers(seeded["admin"])
+
+    whole = (await client.get(URL, params={"search": LAST_NAME, "limit": 100}, headers=headers)).json()
+    assert whole["next_cursor"] is None
+    assert {item["id"] for item in whole["items"]} == seeded["application_ids"]
+
+    items, pages = await _all_pages(client, headers, search=LAST_NAME, limit=5)
+
+    assert pages == 3
+    assert [item["id"] for item in items] == [item["id"] for item in whole["items"]]
+
+
+async def test_filters_apply_across_pages(client, seeded):
+    items, _ = await _all_pages(client, auth_headers(seeded["admin"]), search=LAST_NAME, status_filter="under_review", limit=1)
+
+    assert len(items) == 4
+    assert {item["status"] for item in items} == {"under_review"}
+
+
+async def test_items_are_a_projection(client, seeded):
+    response = await client.get(URL, params={"search": LAST_NAME, "limit": 100}, headers=auth_headers(seeded["admin"]))
+    items = response.json()["items"]
+
+    assert all("responses" not in item for item in items)
+    assert all(item["user"]["email"] == "list-family@example.com" for item in items)
+    approved = [item for item in items if item["approval_count"]]
+    assert len(approved) == 1
+    assert approved[0]["approval_count"] == 3
+    assert sorted(approved[0]["approved_by_teams"]) == ["behavioral", "ops"]
+    assert all(item["approved_by_teams"] == [] for item in items if not item["approval_count"])
+
+
+@pytest.mark.parametrize("sort, order, descending, key", [
+    ("completion", None, True, lambda item: (item["completion_percentage"],)),
+    ("camper_name", None, False, lambda item: (item["camper_first_name"].lower(),)),
+    ("camper_name", "desc", True, lambda item: (item["camper_first_name"].lower(),)),
+    # Not yet completed sorts last
+    ("completed_at", None, True, lambda item: (item["completed_at"] is not None, item["completed_at"] or "")),
+])
+async def test_sorts_page_in_order(client, seeded, sort, order, descending, key):
+    params = {"search": LAST_NAME, "limit": 5, "sort": sort, **({"order": order} if order else {})}
+    items, pages = await _all_pages(client, auth_headers(seeded["admin"]), **params)
+
+    assert pages == 3
+    assert {item["id"] for item in items} == seeded["application_ids"]
+    # Ties are broken by id, in the same direction
+    expected = sorted(items, key=lambda item: (*key(item), item["id"]), reverse=descending)
+    assert [item["id"] for item in items] == [item["id"] for item in expected]
+
+
+async def test_cursor_only_continues_its_sort(client, seeded):
+    headers = auth_headers(seeded["admin"])
+    page = (await client.get(URL, params={"search": LAST_NAME, "limit": 5, "sort": "completion"}, headers=headers)).json()
+
+    response = await client.get(URL, params={"search": LAST_NAME, "cursor": page["next_cursor"]}, headers=headers)
+
+    assert response.status_code == 400
+    assert (await client.get(URL, params={"sort": "email"}, headers=headers)).status_code == 422
+
+
+async def test_facets_count_the_whole_search(client, seeded):
+    params = {"search": LAST_NAME, "status_filter": "under_review", "limit": 2, "facets": "true"}
+    page = (await client.get(URL, params=params, headers=auth_headers(seeded["admin"]))).json()
+
+    assert len(page["items"]) == 2
+    assert page["facets"] == {
+        "total": 12,
+        "status": {"in_progress": 8, "under_review": 4, "accepted": 0, "declined": 0, "paid": 0},
+        "completion": {"0": 1, "1-49": 5, "50-99": 5, "100": 1},
+        "approved_by_team": {"ops": 1, "behavioral": 1},
+    }
+
+    following = (await client.get(URL, params={**params, "cursor": page["next_cursor"]}, headers=auth_headers(seeded["admin"]))).json()
+    assert following["facets"] == page["facets"]
+    assert {item["id"] for item in following["items"]}.isdisjoint(item["id"] for item in page["items"])
+
+
+async def test_rejects_malformed_cursor(client, seeded):
+    response = await client.get(URL, params={"cursor": "not-a-cursor"}, headers=auth_headers(seeded["admin"]))
+
+    assert response.status_code == 400
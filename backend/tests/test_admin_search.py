@@ -0,0 +1,59 @@
+"""
+Admin application search: every word matches a name or email, camper matches rank first
+"""
+
+import pytest
+
+from app.core.database import IS_SQLITE
+
+from .conftest import auth_headers
+
+URL = "/api/applications/admin/search"
+
+
+@pytest.fixture(scope="module")
+def seeded(make_user, make_application):
+    """
+    Two families: the Quillfeather camper belongs to the Brightwater parent,
+    and the Quillfeather parent's camper is a Brightwater
+    """
+    brightwater = make_user("sam.brightwater@example.com", first_name="Sam", last_name="Brightwater")
+    quillfeather = make_user("robin.quillfeather@example.com", first_name="Robin", last_name="Quillfeather")
+    camper_match = make_application(brightwater, camper_first_name="Jordan", camper_last_name="Quillfeather")
+    parent_match = make_application(quillfeather, camper_first_name="Avery", camper_last_name="Brightwater")
+    return {
+        "admin": make_user("search-ops@fasdcamp.org", role="admin", team="ops"),
+        "camper_match": str(camper_match.id),
+        "parent_match": str(parent_match.id),
+    }
+
+
+async def _search(client, seeded, q):
+    response = await client.get(URL, params={"q": q}, headers=auth_headers(seeded["admin"]))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_every_word_must_match(client, seeded):
+    assert [r["id"] for r in await _search(client, seeded, "jor quill")] == [seeded["camper_match"]]
+    assert [r["id"] for r in await _search(client, seeded, "Avery, robin")] == [seeded["parent_match"]]
+    assert await _search(client, seeded, "jordan robin") == []
+
+
+async def test_matches_email_words(client, seeded):
+    results = await _search(client, seeded, "sam.brightwater")
+
+    assert [r["id"] for r in results] == [seeded["camper_match"]]
+    assert results[0]["user"]["email"] == "sam.brightwater@example.com"
+
+
+@pytest.mark.skipif(IS_SQLITE, reason="ranking needs Postgres full-text search")
+async def test_camper_matches_rank_above_parent_matches(client, seeded):
+    results = await _search(client, seeded, "quillfeather")
+
+    assert [r["id"] for r in results] == [seeded["camper_match"], seeded["parent_match"]]
+    assert results[0]["rank"] > results[1]["rank"]
+
+
+async def test_punctuation_only_query_finds_nothing(client, seeded):
+    assert await _search(client, seeded, "@.") == []
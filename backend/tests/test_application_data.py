@@ -0,0 +1,106 @@
+"""
+applications.application_data stays in step with application_responses
+"""
+
+import uuid
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.application import Application, ApplicationResponse
+from check_application_data import check_application_data
+
+from .conftest import auth_headers
+
+
+@pytest.fixture(scope="module")
+def seeded(make_user, make_form, make_application):
+    """A family with an application on a three-question form, an admin and a super admin"""
+    family = make_user("data-family@example.com")
+    _, questions = make_form("Data", 91, [f"Data {i}" for i in range(3)])
+    return {
+        "family": family,
+        "admin": make_user("data-ops@fasdcamp.org", role="admin", team="ops"),
+        "super_admin": make_user("data-director@fasdcamp.org", role="super_admin"),
+        "application_id": str(make_application(family).id),
+        "question_ids": [str(q.id) for q in questions],
+    }
+
+
+def _rows(application_id):
+    db = SessionLocal()
+    try:
+        return {
+            str(r.question_id): (r.response_value, r.version)
+            for r in db.query(ApplicationResponse).filter(ApplicationResponse.application_id == uuid.UUID(application_id))
+            if r.question_id is not None
+        }
+    finally:
+        db.close()
+
+
+async def _served(client, seeded):
+    response = await client.get(f"/api/applications/{seeded['application_id']}", headers=auth_headers(seeded["family"]))
+    assert response.status_code == 200, response.text
+    return {r["question_id"]: (r["response_value"], r["version"]) for r in response.json()["responses"]}
+
+
+def _mismatched(application_id, fix=False):
+    db = SessionLocal()
+    try:
+        return uuid.UUID(application_id) in check_application_data(db, fix=fix)
+    finally:
+        db.close()
+
+
+async def test_reads_follow_every_write_path(client, seeded):
+    application_id = seeded["application_id"]
+    first, second, third = seeded["question_ids"]
+    family, admin = auth_headers(seeded["family"]), auth_headers(seeded["admin"])
+
+    await client.patch(f"/api/applications/{application_id}", json={"responses": [
+        {"question_id": first, "response_value": "one"},
+        {"question_id": second, "response_value": "two"},
+    ]}, headers=family)
+    await client.patch(f"/api/applications/{application_id}/responses", json={"changes": [
+        {"question_id": second, "response_value": "two, edited", "base_version": 1},
+    ]}, headers=family)
+    await client.patch(f"/api/admin/applications/{application_id}", json={"responses": [
+        {"question_id": third, "response_value": "three"},
+    ]}, headers=admin)
+
+    expected = {first: ("one", 1), second: ("two, edited", 2), third: ("three", 1)}
+    assert _rows(application_id) == expected
+    assert await _served(client, seeded) == expected
+
+    admin_view = await client.get(f"/api/applications/admin/{application_id}", headers=admin)
+    assert len(admin_view.json()["responses"]) == 3
+    assert not _mismatched(application_id)
+
+
+async def test_check_command_rebuilds_drifted_copy(client, seeded):
+    application_id = seeded["application_id"]
+    db = SessionLocal()
+    try:
+        db.query(Application).filter(Application.id == uuid.UUID(application_id)).update({"application_data": {}})
+        db.commit()
+    finally:
+        db.close()
+
+    assert await _served(client, seeded) == {}
+    assert _mismatched(application_id)
+    assert _mismatched(application_id, fix=True)
+
+    assert not _mismatched(application_id)
+    assert await _served(client, seeded) == _rows(application_id)
+
+
+async def test_deleted_question_leaves_the_copy(client, seeded):
+    application_id = seeded["application_id"]
+    deleted = seeded["question_ids"][2]
+
+    response = await client.delete(f"/api/application-builder/questions/{deleted}", headers=auth_headers(seeded["super_admin"]))
+
+    assert response.status_code == 200, response.text
+    assert deleted not in await _served(client, seeded)
+    assert not _mismatched(application_id)
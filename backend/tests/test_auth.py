@@ -0,0 +1,106 @@
+"""
+Password login and registration: bcrypt runs on its own pool, old hashes are upgraded
+"""
+
+import threading
+
+import bcrypt
+import pytest
+
+from app.core.config import settings
+from app.core.security import verify_password
+from app.models.user import User
+
+from .conftest import PASSWORD
+
+# Cheap cost factors keep the tests fast; only the difference matters
+OLD_ROUNDS = 4
+CURRENT_ROUNDS = 5
+REGISTERED_EMAIL = "auth-register@example.com"
+
+
+@pytest.fixture(autouse=True)
+def current_rounds(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", CURRENT_ROUNDS)
+
+
+def _hash(rounds):
+    return bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _rounds(hashed_password):
+    return int(hashed_password.split("$")[2])
+
+
+def _stored_hash(db, email):
+    return db.query(User.password_hash).filter(User.email == email).scalar()
+
+
+@pytest.fixture
+def bcrypt_threads(monkeypatch):
+    """Names of the threads each bcrypt hashpw/checkpw call ran on"""
+    threads = []
+    for name in ("hashpw", "checkpw"):
+        original = getattr(bcrypt, name)
+
+        def spy(*args, _name=name, _original=original):
+            threads.append((_name, threading.current_thread().name))
+            return _original(*args)
+
+        monkeypatch.setattr(bcrypt, name, spy)
+    return threads
+
+
+@pytest.fixture
+def registered(db):
+    """Deletes the user the test registers"""
+    yield REGISTERED_EMAIL
+    db.query(User).filter(User.email == REGISTERED_EMAIL).delete()
+    db.commit()
+
+
+async def _login(client, email, password=PASSWORD):
+    return await client.post("/api/auth/login", json={"email": email, "password": password})
+
+
+async def test_login_upgrades_an_old_hash(client, db, make_user):
+    make_user("auth-old-hash@example.com", password_hash=_hash(OLD_ROUNDS))
+
+    response = await _login(client, "auth-old-hash@example.com")
+
+    assert response.status_code == 200, response.text
+    upgraded = _stored_hash(db, "auth-old-hash@example.com")
+    assert _rounds(upgraded) == CURRENT_ROUNDS
+    assert verify_password(PASSWORD, upgraded)
+
+
+async def test_login_keeps_a_current_hash(client, db, make_user):
+    current = _hash(CURRENT_ROUNDS)
+    make_user("auth-current-hash@example.com", password_hash=current)
+
+    response = await _login(client, "auth-current-hash@example.com")
+
+    assert response.status_code == 200, response.text
+    assert _stored_hash(db, "auth-current-hash@example.com") == current
+
+
+async def test_wrong_password_leaves_the_hash_alone(client, db, make_user):
+    old = _hash(OLD_ROUNDS)
+    make_user("auth-wrong-password@example.com", password_hash=old)
+
+    response = await _login(client, "auth-wrong-password@example.com", password="not-the-password")
+
+    assert response.status_code == 401
+    assert _stored_hash(db, "auth-wrong-password@example.com") == old
+
+
+async def test_register_and_login_hash_on_the_password_pool(client, db, registered, bcrypt_threads):
+    response = await client.post("/api/auth/register", json={"email": registered, "password": PASSWORD})
+    assert response.status_code == 201, response.text
+    assert _rounds(_stored_hash(db, registered)) == CURRENT_ROUNDS
+
+    response = await _login(client, registered)
+    assert response.status_code == 200, response.text
+
+    assert [name for name, _ in bcrypt_threads] == ["hashpw", "checkpw"]
+    assert all(thread.startswith("password-hash") for _, thread in bcrypt_threads), bcrypt_threads
@@ -0,0 +1,94 @@
+"""
+Incremental completion counters agree with a full recompute
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+from app.core.form_logic import VisibilityGraph
+from app.core.form_schema import FormQuestion, FormSection, FormSnapshot
+from app.services import completion_service
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _question(section_id, index, required=True, trigger=None, answer=None, status=None):
+    return FormQuestion(
+        id=uuid.uuid4(), section_id=section_id, question_text=f"Q{index}", question_type="text",
+        options=None, is_required=required, reset_annually=False, order_index=index,
+        validation_rules=None, help_text=None, description=None, placeholder=None, is_active=True,
+        show_when_status=status, template_file_id=None,
+        show_if_question_id=trigger.id if trigger else None, show_if_answer=answer,
+        detail_prompt_trigger=None, detail_prompt_text=None, created_at=NOW, updated_at=NOW,
+    )
+
+
+def _section(index, questions, status=None):
+    return FormSection(
+        id=questions[0].section_id, title=f"S{index}", description=None, order_index=index, is_active=True,
+        visible_before_acceptance=True, show_when_status=status, created_at=NOW, updated_at=NOW,
+        questions=tuple(questions),
+    )
+
+
+def _snapshot():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    root = _question(first, 0)
+    middle = _question(first, 1, trigger=root, answer="Yes")
+    leaf = _question(first, 2, trigger=middle, answer="Yes")
+    other_branch = _question(first, 3, trigger=root, answer="No")
+    optional = _question(first, 4, required=False)
+    gated = _question(second, 0, status="accepted")
+    cross_section = _question(second, 1, trigger=leaf, answer="Yes")
+    sections = (
+        _section(0, [root, middle, leaf, other_branch, optional]),
+        _section(1, [gated, cross_section]),
+    )
+    questions = {q.id: q for section in sections for q in section.questions}
+    return FormSnapshot(
+        version=1, fingerprint="test", sections=sections, questions=MappingProxyType(questions),
+        visibility=VisibilityGraph.compile(questions.values()), built_at=time.monotonic(),
+    )
+
+
+def _normalized(state):
+    return {section_id: counts for section_id, counts in state["sections"].items() if counts != [0, 0]}
+
+
+def test_incremental_counters_match_full_recompute():
+    snapshot = _snapshot()
+    rng = random.Random(7)
+    question_ids = list(snapshot.questions)
+
+    for status in ("in_progress", "accepted"):
+        answers = {}
+        state = completion_service.compute_state(snapshot, status, answers)
+        for _ in range(200):
+            changes = {
+                question_id: rng.choice(["Yes", "No", "", None])
+                for question_id in rng.sample(question_ids, k=rng.randint(1, 3))
+            }
+            previous = {
+                question_id: answers[question_id]
+                for question_id in completion_service.questions_to_load(snapshot, set(changes))
+                if question_id in answers
+            }
+            state = completion_service.apply_changes(state, snapshot, changes, previous)
+            answers.update(changes)
+
+            expected = completion_service.compute_state(snapshot, status, answers)
+            assert _normalized(state) == _normalized(expected)
+            assert completion_service.percentage(state) == completion_service.percentage(expected)
+
+
+def test_state_is_stale_after_form_or_status_change():
+    snapshot = _snapshot()
+    state = completion_service.compute_state(snapshot, "in_progress", {})
+
+    assert completion_service.is_current(state, snapshot, "in_progress")
+    assert not completion_service.is_current(state, snapshot, "accepted")
+    assert not completion_service.is_current({**state, "form": "older"}, snapshot, "in_progress")
+    assert not completion_service.is_current(None, snapshot, "in_progress")
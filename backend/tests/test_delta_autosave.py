@@ -0,0 +1,138 @@
+"""
+Delta autosave: no-op skips, versions and conflicts with admin edits
+"""
+
+import uuid
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.application import Application, ApplicationResponse
+
+from .conftest import auth_headers
+
+
+@pytest.fixture(scope="module")
+def users(make_user, make_form, make_application):
+    """A family with an application on a two-question form, and an admin"""
+    family = make_user("delta-family@example.com")
+    _, questions = make_form("Delta", 90, ["Delta 0", "Delta 1"])
+    return {
+        "family": family,
+        "admin": make_user("delta-ops@fasdcamp.org", role="admin", team="ops"),
+        "application_id": str(make_application(family).id),
+        "question_ids": [str(q.id) for q in questions],
+    }
+
+
+def _stored(application_id, question_id):
+    db = SessionLocal()
+    try:
+        response = db.query(ApplicationResponse).filter(
+            ApplicationResponse.application_id == application_id,
+            ApplicationResponse.question_id == question_id,
+        ).one()
+        return response.response_value, response.version, response.updated_at
+    finally:
+        db.close()
+
+
+async def test_delta_saves_skips_and_reports_conflicts(client, users):
+    url = f"/api/applications/{users['application_id']}/responses"
+    headers = auth_headers(users["family"])
+    first, second = users["question_ids"]
+
+    created = await client.patch(url, json={"changes": [
+        {"question_id": first, "response_value": "a", "base_version": None},
+        {"question_id": second, "response_value": "b", "base_version": None},
+    ]}, headers=headers)
+    assert created.status_code == 200, created.text
+    body = created.json()
+    assert {r["question_id"]: r["version"] for r in body["saved"]} == {first: 1, second: 1}
+    assert body["unchanged"] == [] and body["conflicts"] == []
+
+    # Re-sending a saved value writes nothing
+    before = _stored(users["application_id"], first)
+    repeated = await client.patch(url, json={"changes": [
+        {"question_id": first, "response_value": "a", "base_version": 1},
+    ]}, headers=headers)
+    assert repeated.json()["saved"] == []
+    assert repeated.json()["unchanged"] == [{"question_id": first, "version": 1}]
+    assert _stored(users["application_id"], first) == before
+
+    changed = await client.patch(url, json={"changes": [
+        {"question_id": first, "response_value": "a2", "base_version": 1},
+    ]}, headers=headers)
+    assert changed.json()["saved"] == [{"question_id": first, "version": 2}]
+
+    # An admin edits the second answer while the family still has version 1
+    admin_edit = await client.patch(f"/api/admin/applications/{users['application_id']}", json={"responses": [
+        {"question_id": second, "response_value": "from admin"},
+    ]}, headers=auth_headers(users["admin"]))
+    assert admin_edit.status_code == 200, admin_edit.text
+
+    stale = await client.patch(url, json={"changes": [
+        {"question_id": second, "response_value": "b2", "base_version": 1},
+    ]}, headers=headers)
+    body = stale.json()
+    assert body["saved"] == []
+    assert body["conflicts"] == [
+        {"question_id": second, "response_value": "from admin", "file_id": None, "version": 2},
+    ]
+    assert _stored(users["application_id"], second)[:2] == ("from admin", 2)
+
+    # Resolved against the version the conflict reported
+    resolved = await client.patch(url, json={"changes": [
+        {"question_id": second, "response_value": "b2", "base_version": 2},
+    ]}, headers=headers)
+    assert resolved.json()["saved"] == [{"question_id": second, "version": 3}]
+
+
+async def test_delta_returns_completion(client, users):
+    url = f"/api/applications/{users['application_id']}/responses"
+    response = await client.patch(url, json={"camper_first_name": "Cammy", "changes": []},
+                                  headers=auth_headers(users["family"]))
+
+    assert response.status_code == 200, response.text
+    db = SessionLocal()
+    try:
+        application = db.get(Application, uuid.UUID(users["application_id"]))
+        assert application.camper_first_name == "Cammy"
+        assert response.json()["completion_percentage"] == application.completion_percentage
+        assert response.json()["status"] == application.status
+    finally:
+        db.close()
+
+
+async def test_edit_after_an_empty_saved_answer(client, users, make_application):
+    """
+    The old full-PATCH autosave stored "" for cleared fields; the page loads
+    their version like any other answer, so the first edit saves instead of
+    conflicting
+    """
+    application_id = str(make_application(users["family"]).id)
+    question_id = users["question_ids"][0]
+    headers = auth_headers(users["family"])
+    cleared = await client.patch(f"/api/applications/{application_id}", json={"responses": [
+        {"question_id": question_id, "response_value": ""},
+    ]}, headers=headers)
+    assert cleared.status_code == 200, cleared.text
+
+    loaded = await client.get(f"/api/applications/{application_id}", headers=headers)
+    [saved] = [r for r in loaded.json()["responses"] if r["question_id"] == question_id]
+    assert (saved["response_value"], saved["version"]) == ("", 1)
+
+    url = f"/api/applications/{application_id}/responses"
+    # Without the version the edit looks stale
+    untracked = await client.patch(url, json={"changes": [
+        {"question_id": question_id, "response_value": "typed", "base_version": None},
+    ]}, headers=headers)
+    assert untracked.json()["conflicts"] == [
+        {"question_id": question_id, "response_value": "", "file_id": None, "version": 1},
+    ]
+
+    edited = await client.patch(url, json={"changes": [
+        {"question_id": question_id, "response_value": "typed", "base_version": saved["version"]},
+    ]}, headers=headers)
+    assert edited.json()["saved"] == [{"question_id": question_id, "version": 2}]
+    assert _stored(application_id, question_id)[:2] == ("typed", 2)
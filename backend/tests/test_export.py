@@ -0,0 +1,109 @@
+"""
+Admin export: one row per application, one column per question
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from app.services import export_service
+
+from .conftest import auth_headers
+
+URL = "/api/applications/admin/export"
+# Every application seeded here has this camper last name, so searching for it isolates them
+LAST_NAME = "Exportrow"
+
+
+@pytest.fixture(scope="module")
+def seeded(make_user, make_form, make_application):
+    """Three applications on a form with a repeated question, and an admin"""
+    family = make_user("export-family@example.com")
+    _, questions = make_form("Export", 92, ["Favorite activity", "Notes", "Notes"])
+    applications = [
+        make_application(family, camper_first_name=f"Camper{i}", camper_last_name=LAST_NAME,
+                         status="under_review" if i == 0 else "in_progress")
+        for i in range(3)
+    ]
+    return {
+        "family": family,
+        "admin": make_user("export-ops@fasdcamp.org", role="admin", team="ops"),
+        "application_ids": [str(a.id) for a in applications],
+        "question_ids": [str(q.id) for q in questions],
+    }
+
+
+@pytest.fixture
+async def answered(client, seeded):
+    """The first application answers every question (a comma, a line break and a formula included; saving again is a no-op)"""
+    activity, notes, more_notes = seeded["question_ids"]
+    response = await client.patch(f"/api/applications/{seeded['application_ids'][0]}", json={"responses": [
+        {"question_id": activity, "response_value": "Canoeing, swimming"},
+        {"question_id": notes, "response_value": "Line one\nline two"},
+        {"question_id": more_notes, "response_value": "=HYPERLINK(\"http://evil.example\")"},
+    ]}, headers=auth_headers(seeded["family"]))
+    assert response.status_code == 200, response.text
+    return seeded
+
+
+async def _export(client, seeded, **params):
+    response = await client.get(URL, params={"search": LAST_NAME, **params}, headers=auth_headers(seeded["admin"]))
+    assert response.status_code == 200, response.text
+    return response
+
+
+async def test_csv_has_a_column_per_question(client, answered):
+    response = await _export(client, answered)
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header[-3:] == ["Favorite activity", "Notes", "Notes (2)"]
+    by_id = {row[0]: dict(zip(header, row)) for row in rows}
+    assert set(by_id) == set(answered["application_ids"])
+
+    first = by_id[answered["application_ids"][0]]
+    assert first["Favorite activity"] == "Canoeing, swimming"
+    assert first["Notes"] == "Line one\nline two"
+    # Formulas are quoted so spreadsheets show them as text
+    assert first["Notes (2)"] == "'=HYPERLINK(\"http://evil.example\")"
+    assert first["Parent Email"] == "export-family@example.com"
+    assert by_id[answered["application_ids"][1]]["Favorite activity"] == ""
+
+
+async def test_ndjson_has_an_object_per_application(client, answered, monkeypatch):
+    # A batch per application
+    monkeypatch.setattr(export_service, "BATCH_SIZE", 1)
+
+    response = await _export(client, answered, format="ndjson")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = {row["Application ID"]: row for row in map(json.loads, response.text.splitlines())}
+    assert set(rows) == set(answered["application_ids"])
+    assert rows[answered["application_ids"][0]]["Favorite activity"] == "Canoeing, swimming"
+    assert rows[answered["application_ids"][1]]["Favorite activity"] is None
+    # Only CSV needs formula quoting
+    assert rows[answered["application_ids"][0]]["Notes (2)"] == "=HYPERLINK(\"http://evil.example\")"
+
+
+async def test_export_applies_filters(client, answered):
+    response = await _export(client, answered, format="ndjson", status_filter="under_review")
+
+    assert [json.loads(line)["Application ID"] for line in response.text.splitlines()] == [answered["application_ids"][0]]
+
+
+async def test_export_is_admin_only(client, seeded):
+    response = await client.get(URL, headers=auth_headers(seeded["family"]))
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("texts, headers", [
+    (["X", "X", "X"], ["X", "X (2)", "X (3)"]),
+    (["X", "X", "X (2)"], ["X", "X (2)", "X (2) (2)"]),
+    (["X (2)", "X", "X"], ["X (2)", "X", "X (3)"]),
+])
+def test_headers_are_unique(texts, headers):
+    assert export_service._unique(texts) == headers
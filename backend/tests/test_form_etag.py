@@ -0,0 +1,86 @@
+"""
+Conditional GETs for the form definition endpoints
+"""
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.application import Application
+
+from .conftest import auth_headers
+
+SECTIONS_URL = "/api/applications/sections"
+BUILDER_URL = "/api/application-builder/sections"
+
+
+@pytest.fixture(scope="module")
+def users(make_user, make_application):
+    """A family with an application, and a super admin"""
+    family = make_user("etag-family@example.com")
+    return {
+        "family": family,
+        "super_admin": make_user("etag-director@fasdcamp.org", role="super_admin"),
+        "application": make_application(family),
+    }
+
+
+def _set_status(application_id, status):
+    db = SessionLocal()
+    try:
+        db.query(Application).filter(Application.id == application_id).update({"status": status})
+        db.commit()
+    finally:
+        db.close()
+
+
+async def test_matching_etag_returns_304(client, users):
+    headers = auth_headers(users["family"])
+    params = {"application_id": str(users["application"].id)}
+
+    first = await client.get(SECTIONS_URL, params=params, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        cached = await client.get(SECTIONS_URL, params=params, headers={**headers, "If-None-Match": if_none_match})
+        assert cached.status_code == 304, if_none_match
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    stale = await client.get(SECTIONS_URL, params=params, headers={**headers, "If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+async def test_etag_depends_on_application_status(client, users):
+    headers = auth_headers(users["family"])
+    application_id = users["application"].id
+    params = {"application_id": str(application_id)}
+
+    in_progress = (await client.get(SECTIONS_URL, params=params, headers=headers)).headers["etag"]
+    _set_status(application_id, "accepted")
+    try:
+        accepted = (await client.get(SECTIONS_URL, params=params, headers=headers)).headers["etag"]
+    finally:
+        _set_status(application_id, "in_progress")
+
+    assert accepted != in_progress
+
+
+async def test_builder_edit_changes_etag(client, users):
+    headers = auth_headers(users["super_admin"])
+    before = (await client.get(BUILDER_URL, headers=headers)).headers["etag"]
+
+    created = await client.post(BUILDER_URL, json={"title": "New section", "order_index": 99}, headers=headers)
+    assert created.status_code == 200, created.text
+    try:
+        after = await client.get(BUILDER_URL, headers={**headers, "If-None-Match": before})
+        assert after.status_code == 200
+        assert after.headers["etag"] != before
+        assert any(section["title"] == "New section" for section in after.json())
+    finally:
+        await client.delete(f"{BUILDER_URL}/{created.json()['id']}", headers=headers)
+
+    restored = await client.get(BUILDER_URL, headers=headers)
+    # The ETag is derived from content, so undoing the edit restores it
+    assert restored.headers["etag"] == before
@@ -0,0 +1,100 @@
+"""
+Conditional visibility graph and show-if cycle checks
+"""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.form_logic import VisibilityGraph, find_condition_cycle
+
+from .conftest import auth_headers
+
+
+def _question(trigger=None, answer=None):
+    return SimpleNamespace(id=uuid.uuid4(), show_if_question_id=trigger.id if trigger else None, show_if_answer=answer)
+
+
+def _everything_shown(question_id):
+    return True
+
+
+def test_chain_is_hidden_when_trigger_is_hidden():
+    root = _question()
+    middle = _question(root, "Yes")
+    leaf = _question(middle, "Yes")
+    # Listed leaf-first to check the graph, not the input, decides the order
+    graph = VisibilityGraph.compile([leaf, middle, root])
+
+    answers = {root.id: "Yes", middle.id: "Yes"}
+    assert graph.visible(_everything_shown, answers) == {root.id, middle.id, leaf.id}
+
+    # Changing the root answer hides middle, and with it leaf, despite middle's stale "Yes"
+    answers[root.id] = "No"
+    assert graph.visible(_everything_shown, answers) == {root.id}
+
+    # A trigger hidden by a non-conditional filter hides its dependents too
+    assert graph.visible(lambda question_id: question_id != root.id, {root.id: "Yes", middle.id: "Yes"}) == set()
+
+
+def test_question_without_answer_is_unconditional():
+    trigger = _question()
+    question = _question(trigger, None)
+    graph = VisibilityGraph.compile([trigger, question])
+
+    assert graph.visible(_everything_shown, {}) == {trigger.id, question.id}
+
+
+def test_existing_cycle_is_hidden():
+    a = _question()
+    b = _question(a, "Yes")
+    a.show_if_question_id, a.show_if_answer = b.id, "Yes"
+    dependent = _question(b, "Yes")
+    other = _question()
+    graph = VisibilityGraph.compile([a, b, dependent, other])
+
+    assert graph.cyclic == {a.id, b.id, dependent.id}
+    assert graph.visible(_everything_shown, {a.id: "Yes", b.id: "Yes"}) == {other.id}
+
+
+def test_find_condition_cycle():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    triggers = {a: None, b: a, c: b}
+
+    assert find_condition_cycle(triggers, a, c) == [a, c, b, a]
+    assert find_condition_cycle(triggers, a, a) == [a, a]
+    assert find_condition_cycle(triggers, c, a) is None
+    assert find_condition_cycle(triggers, a, None) is None
+
+
+@pytest.fixture(scope="module")
+def super_admin(make_user):
+    return make_user("logic-director@fasdcamp.org", role="super_admin")
+
+
+async def test_builder_rejects_condition_cycle(client, super_admin):
+    headers = auth_headers(super_admin)
+    section = (await client.post(
+        "/api/application-builder/sections", json={"title": "Loop", "order_index": 50}, headers=headers
+    )).json()
+    try:
+        async def create(text, **condition):
+            response = await client.post("/api/application-builder/questions", json={
+                "section_id": section["id"], "question_text": text, "question_type": "text", "order_index": 0, **condition,
+            }, headers=headers)
+            assert response.status_code == 200, response.text
+            return response.json()["id"]
+
+        first = await create("First")
+        second = await create("Second", show_if_question_id=first, show_if_answer="Yes")
+
+        response = await client.put(
+            f"/api/application-builder/questions/{first}",
+            json={"show_if_question_id": second, "show_if_answer": "Yes"},
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert "First -> Second -> First" in response.json()["detail"]
+    finally:
+        await client.delete(f"/api/application-builder/sections/{section['id']}", headers=headers)
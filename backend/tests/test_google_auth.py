@@ -0,0 +1,143 @@
+"""
+Google ID token verification against a local stub key set
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+from app.core.config import settings
+from app.services import google_auth_service
+from app.services.google_auth_service import use_stub_certs, verify_google_id_token
+
+KEY_ID = "stub-key"
+
+
+def _key_pair():
+    """A fresh RSA key (PEM) and its self-signed x509 certificate (PEM)"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "stub")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+@pytest.fixture(scope="module")
+def key_pair():
+    return _key_pair()
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    google_auth_service.clear_cert_cache()
+    yield
+    google_auth_service.clear_cert_cache()
+
+
+def _token(private_pem, kid=KEY_ID, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": settings.GOOGLE_CLIENT_ID,
+        "sub": "1234567890",
+        "email": "staff@fasdcamp.org",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return google_jwt.encode(crypt.RSASigner.from_string(private_pem, key_id=kid), payload).decode()
+
+
+@pytest.fixture
+def fetches(monkeypatch, key_pair):
+    """Serve the stub key set as if it were Google's (not pinned); the list records each fetch"""
+    calls = []
+
+    def fetch():
+        calls.append(time.monotonic())
+        return {KEY_ID: key_pair[1]}, 300
+
+    monkeypatch.setattr(google_auth_service, "_fetch_certs", fetch)
+    return calls
+
+
+async def test_valid_token(key_pair):
+    use_stub_certs({KEY_ID: key_pair[1]})
+
+    claims = await verify_google_id_token(_token(key_pair[0]))
+
+    assert claims["email"] == "staff@fasdcamp.org"
+
+
+@pytest.mark.parametrize("claims", [
+    {"aud": "someone-else.apps.googleusercontent.com"},
+    {"iss": "https://evil.example.com"},
+    {"iat": int(time.time()) - 7200, "exp": int(time.time()) - 3600},
+], ids=["wrong-aud", "wrong-iss", "expired"])
+async def test_rejects_bad_claims(key_pair, claims):
+    use_stub_certs({KEY_ID: key_pair[1]})
+
+    with pytest.raises(ValueError):
+        await verify_google_id_token(_token(key_pair[0], **claims))
+
+
+async def test_rejects_token_signed_by_another_key(key_pair):
+    use_stub_certs({KEY_ID: key_pair[1]})
+    other_private, _ = _key_pair()
+
+    with pytest.raises(ValueError):
+        await verify_google_id_token(_token(other_private))
+
+
+async def test_unknown_kid_with_pinned_certs_never_fetches(key_pair, fetches):
+    use_stub_certs({KEY_ID: key_pair[1]})
+
+    with pytest.raises(ValueError, match="Unknown key id"):
+        await verify_google_id_token(_token(key_pair[0], kid="forged"))
+
+    assert fetches == []
+
+
+async def test_unknown_kid_refetches_at_most_once_per_interval(key_pair, monkeypatch, fetches):
+    await verify_google_id_token(_token(key_pair[0]))
+    assert len(fetches) == 1
+
+    # Just fetched: forged key ids are rejected without asking Google again
+    for kid in ("forged-1", "forged-2", "forged-3"):
+        with pytest.raises(ValueError, match="Unknown key id"):
+            await verify_google_id_token(_token(key_pair[0], kid=kid))
+    assert len(fetches) == 1
+
+    # Once the interval has passed, one refetch (Google may have rotated keys)
+    monkeypatch.setattr(
+        google_auth_service, "_certs_fetched_at",
+        google_auth_service._certs_fetched_at - google_auth_service.UNKNOWN_KID_REFRESH_INTERVAL_SECONDS,
+    )
+    for kid in ("forged-4", "forged-5"):
+        with pytest.raises(ValueError, match="Unknown key id"):
+            await verify_google_id_token(_token(key_pair[0], kid=kid))
+    assert len(fetches) == 2
+
+    # Known keys still verify from the cache
+    await verify_google_id_token(_token(key_pair[0]))
+    assert len(fetches) == 2
@@ -0,0 +1,78 @@
+"""
+Request metrics: Server-Timing on each response, histograms at /api/metrics (scraper or admin only)
+"""
+
+import re
+
+import pytest
+
+from app.core.config import settings
+
+from .conftest import auth_headers
+
+URL = "/api/metrics"
+SCRAPE_TOKEN = "test-scrape-token"
+ROUTE = 'method="GET",route="/api/auth/me"'
+
+
+@pytest.fixture(scope="module")
+def seeded(make_user):
+    return {
+        "family": make_user("metrics-family@example.com"),
+        "admin": make_user("metrics-ops@fasdcamp.org", role="admin", team="ops"),
+    }
+
+
+@pytest.fixture
+def scrape_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", SCRAPE_TOKEN)
+    return SCRAPE_TOKEN
+
+
+def _sample(text, name):
+    """The value of `name{<ROUTE>}` in a scrape, 0 if the series doesn't exist yet"""
+    match = re.search(rf"^{name}\{{{re.escape(ROUTE)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+async def _scrape(client):
+    response = await client.get(URL, headers={"Authorization": f"Bearer {SCRAPE_TOKEN}"})
+    assert response.status_code == 200, response.text
+    return response.text
+
+
+async def test_metrics_need_the_scrape_token_or_an_admin(client, seeded, scrape_token):
+    assert (await client.get(URL)).status_code == 403
+    assert (await client.get(URL, headers={"Authorization": "Bearer wrong"})).status_code == 401
+    assert (await client.get(URL, headers=auth_headers(seeded["family"]))).status_code == 403
+
+    assert (await client.get(URL, headers=auth_headers(seeded["admin"]))).status_code == 200
+    assert (await client.get(URL, headers={"Authorization": f"Bearer {scrape_token}"})).status_code == 200
+
+
+async def test_without_a_scrape_token_only_admins_get_metrics(client, seeded, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+
+    assert (await client.get(URL, headers={"Authorization": "Bearer "})).status_code == 403
+    assert (await client.get(URL, headers=auth_headers(seeded["admin"]))).status_code == 200
+
+
+async def test_server_timing_matches_the_histograms(client, seeded, scrape_token, query_counter):
+    before = await _scrape(client)
+
+    query_counter.reset()
+    response = await client.get("/api/auth/me", headers=auth_headers(seeded["family"]))
+
+    assert response.status_code == 200, response.text
+    timing = re.search(r'db;dur=([\d.]+);desc="(\d+) queries"', response.headers["server-timing"])
+    assert timing, response.headers["server-timing"]
+    db_ms, db_queries = float(timing.group(1)), int(timing.group(2))
+    # Principal lookup (the client starts with an empty cache) and the user read
+    assert db_queries == query_counter.count == 2, query_counter.report()
+
+    after = await _scrape(client)
+    assert _sample(after, "http_request_db_queries_count") - _sample(before, "http_request_db_queries_count") == 1
+    assert _sample(after, "http_request_db_queries_sum") - _sample(before, "http_request_db_queries_sum") == db_queries
+    db_seconds = _sample(after, "http_request_db_duration_seconds_sum") - _sample(before, "http_request_db_duration_seconds_sum")
+    # Server-Timing rounds to a tenth of a millisecond
+    assert db_seconds * 1000 == pytest.approx(db_ms, abs=0.051)
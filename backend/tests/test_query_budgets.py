@@ -0,0 +1,135 @@
+"""
+SQL statement budgets per endpoint
+
+Each endpoint is requested once before it is measured, so per-process caches
+(the caller's principal, the form snapshot) are warm - the steady state. A
+test fails when an endpoint
+issues more statements than its budget - usually a sign of a new N+1 query.
+Tighten a budget when an endpoint gets cheaper; only raise one deliberately.
+"""
+
+import pytest
+
+from app.core.form_schema import form_schema_cache
+from app.models.application import (
+    AdminNote,
+    ApplicationApproval,
+    ApplicationHeader,
+    ApplicationResponse,
+    Medication,
+    MedicationDose,
+)
+
+from .conftest import auth_headers
+
+SECTION_COUNT = 3
+QUESTIONS_PER_SECTION = 5
+
+
+@pytest.fixture(scope="module")
+def seeded(seeder, make_user, make_form, make_application):
+    """One family with an in-progress application on a small multi-section form"""
+    family = make_user("family@example.com")
+    admin = make_user("ops@fasdcamp.org", role="admin", team="ops")
+    super_admin = make_user("director@fasdcamp.org", role="super_admin")
+
+    questions = []
+    for s in range(SECTION_COUNT):
+        section, section_questions = make_form(
+            f"Section {s + 1}", s, [f"Question {s + 1}.{q + 1}" for q in range(QUESTIONS_PER_SECTION)], is_required=True
+        )
+        seeder.add(ApplicationHeader(section_id=section.id, header_text=f"Header {s + 1}", order_index=0))
+        # Chain a conditional question off the previous one
+        section_questions[2].show_if_question_id = section_questions[1].id
+        section_questions[2].show_if_answer = "Yes"
+        questions.extend(section_questions)
+    seeder.db.commit()
+
+    application = make_application(family, camper_first_name="Cam", camper_last_name="Per")
+    seeder.add_all([
+        ApplicationResponse(application_id=application.id, question_id=question.id, response_value="Yes")
+        for question in questions[:QUESTIONS_PER_SECTION + 2]
+    ])
+    medication = seeder.add(Medication(application_id=application.id, question_id=questions[0].id, medication_name="Ibuprofen"))
+    seeder.add_all([
+        MedicationDose(medication_id=medication.id, given_type="As needed"),
+        AdminNote(application_id=application.id, admin_id=admin.id, note="Called family"),
+        ApplicationApproval(application_id=application.id, admin_id=admin.id, approved=True),
+    ])
+
+    return {
+        "family": family,
+        "admin": admin,
+        "super_admin": super_admin,
+        "application_id": str(application.id),
+        "question_ids": [str(q.id) for q in questions],
+    }
+
+
+# (method, path template, caller, statement budget)
+QUERY_BUDGETS = [
+    pytest.param("GET", "/api/auth/me", "family", 1),
+    pytest.param("GET", "/api/applications", "family", 1),
+    pytest.param("GET", "/api/applications/sections?application_id={application_id}", "family", 1),
+    pytest.param("GET", "/api/applications/{application_id}", "family", 1),
+    pytest.param("GET", "/api/applications/{application_id}/progress", "family", 2),
+    pytest.param("GET", "/api/medications/{application_id}", "family", 3),
+    pytest.param("GET", "/api/applications/admin/all", "admin", 1),
+    pytest.param("GET", "/api/applications/admin/{application_id}", "admin", 1),
+    pytest.param("GET", "/api/admin/applications/{application_id}/progress", "admin", 2),
+    pytest.param("GET", "/api/admin/applications/{application_id}/approval-status", "admin", 2),
+    pytest.param("GET", "/api/admin/applications/{application_id}/notes", "admin", 2),
+    pytest.param("GET", "/api/application-builder/sections", "super_admin", 0),
+    pytest.param("GET", "/api/super-admin/dashboard/stats", "super_admin", 15),
+]
+
+
+@pytest.mark.parametrize(
+    "method,path,caller,budget",
+    QUERY_BUDGETS,
+    ids=[f"{p.values[0]} {p.values[1]}" for p in QUERY_BUDGETS],
+)
+async def test_query_budget(client, query_counter, seeded, method, path, caller, budget):
+    url = path.format(application_id=seeded["application_id"])
+
+    headers = auth_headers(seeded[caller])
+    await client.request(method, url, headers=headers)
+    query_counter.reset()
+    response = await client.request(method, url, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert query_counter.count <= budget, (
+        f"{method} {path} ran {query_counter.count} SQL statements (budget {budget}):\n"
+        f"{query_counter.report()}"
+    )
+
+
+async def test_form_snapshot_rebuild_is_constant(client, query_counter, seeded):
+    """Rebuilding the form snapshot costs the same few statements however many sections there are"""
+    headers = auth_headers(seeded["super_admin"])
+    await client.get("/api/auth/me", headers=headers)
+    form_schema_cache.invalidate()
+    query_counter.reset()
+
+    response = await client.get("/api/application-builder/sections", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == SECTION_COUNT
+    assert query_counter.count <= 3, query_counter.report()
+
+
+async def test_autosave_statements_do_not_grow_with_fields(client, query_counter, seeded):
+    """A PATCH writes its whole batch of responses in one upsert"""
+    url = f"/api/applications/{seeded['application_id']}"
+    headers = auth_headers(seeded["family"])
+    payload = {"responses": [
+        {"question_id": question_id, "response_value": "Yes"} for question_id in seeded["question_ids"]
+    ]}
+    await client.patch(url, json=payload, headers=headers)
+    query_counter.reset()
+
+    response = await client.patch(url, json=payload, headers=headers)
+
+    assert response.status_code == 200, response.text
+    # application (locked), previous answers, upsert, application update, refresh
+    assert query_counter.count <= 5, query_counter.report()
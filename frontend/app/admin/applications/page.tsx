@@ -8,7 +8,7 @@
 import { useEffect, useState } from 'react'
 import { useRouter } from 'next/navigation'
 import { useAuth } from '@/lib/contexts/AuthContext'
-import { getAllApplications, ApplicationWithUser } from '@/lib/api-admin'
+import { exportApplications, listApplications, ApplicationWithUser, ApplicationListFacets, ApplicationSort } from '@/lib/api-admin'
 import { acceptApplication } from '@/lib/api-admin-actions'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
@@ -18,10 +18,14 @@ export default function AdminApplicationsPage() {
   const router = useRouter()
   const { token, user, logout } = useAuth()
   const [applications, setApplications] = useState<ApplicationWithUser[]>([])
-  const [allApplications, setAllApplications] = useState<ApplicationWithUser[]>([]) // For stats (unfiltered)
+  const [facets, setFacets] = useState<ApplicationListFacets | null>(null) // For stats (whole search, any status)
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [exporting, setExporting] = useState(false)
   const [statusFilter, setStatusFilter] = useState<string>('')
   const [searchTerm, setSearchTerm] = useState<string>('')
+  const [sort, setSort] = useState<ApplicationSort>('updated_at')
   const [error, setError] = useState<string>('')
 
   // Check if user is admin
@@ -32,23 +36,7 @@ export default function AdminApplicationsPage() {
     }
   }, [user, router])
 
-  // Load ALL applications once (for stats cards)
-  useEffect(() => {
-    if (!token) return
-
-    const loadAllApplications = async () => {
-      try {
-        const data = await getAllApplications(token)
-        setAllApplications(data)
-      } catch (err) {
-        console.error('Failed to load all applications for stats:', err)
-      }
-    }
-
-    loadAllApplications()
-  }, [token])
-
-  // Load filtered applications (for table)
+  // Load filtered applications (for table), with the counts for the stats cards
   useEffect(() => {
     if (!token) return
 
@@ -56,8 +44,15 @@ export default function AdminApplicationsPage() {
       try {
         setLoading(true)
         setError('')
-        const data = await getAllApplications(token, statusFilter || undefined, searchTerm || undefined)
-        setApplications(data)
+        const page = await listApplications(token, {
+          statusFilter: statusFilter || undefined,
+          search: searchTerm || undefined,
+          sort,
+          facets: true
+        })
+        setApplications(page.items)
+        setNextCursor(page.next_cursor)
+        setFacets(page.facets ?? null)
       } catch (err) {
         console.error('Failed to load applications:', err)
         setError(err instanceof Error ? err.message : 'Failed to load applications')
@@ -67,7 +62,52 @@ export default function AdminApplicationsPage() {
     }
 
     loadApplications()
-  }, [token, statusFilter, searchTerm])
+  }, [token, statusFilter, searchTerm, sort])
+
+  const loadMoreApplications = async () => {
+    if (!token || !nextCursor) return
+
+    try {
+      setLoadingMore(true)
+      const page = await listApplications(token, {
+        statusFilter: statusFilter || undefined,
+        search: searchTerm || undefined,
+        sort,
+        cursor: nextCursor
+      })
+      setApplications(prev => [...prev, ...page.items])
+      setNextCursor(page.next_cursor)
+    } catch (err) {
+      console.error('Failed to load more applications:', err)
+      setError(err instanceof Error ? err.message : 'Failed to load applications')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  // Download the filtered applications as a spreadsheet
+  const handleExport = async () => {
+    if (!token) return
+
+    try {
+      setExporting(true)
+      const blob = await exportApplications(token, {
+        statusFilter: statusFilter || undefined,
+        search: searchTerm || undefined
+      })
+      const url = window.URL.createObjectURL(blob)
+      const a = document.createElement('a')
+      a.href = url
+      a.download = `applications-${new Date().toISOString().split('T')[0]}.csv`
+      a.click()
+      window.URL.revokeObjectURL(url)
+    } catch (err) {
+      console.error('Failed to export applications:', err)
+      alert(err instanceof Error ? err.message : 'Failed to export applications')
+    } finally {
+      setExporting(false)
+    }
+  }
 
   const getStatusBadgeColor = (status: string) => {
     switch (status) {
@@ -100,13 +140,16 @@ export default function AdminApplicationsPage() {
     try {
       await acceptApplication(token, applicationId)
 
-      // Refresh both lists
-      const [allData, filteredData] = await Promise.all([
-        getAllApplications(token),
-        getAllApplications(token, statusFilter || undefined, searchTerm || undefined)
-      ])
-      setAllApplications(allData)
-      setApplications(filteredData)
+      // Refresh the list and the counts
+      const firstPage = await listApplications(token, {
+        statusFilter: statusFilter || undefined,
+        search: searchTerm || undefined,
+        sort,
+        facets: true
+      })
+      setApplications(firstPage.items)
+      setNextCursor(firstPage.next_cursor)
+      setFacets(firstPage.facets ?? null)
 
       alert('Application accepted successfully!')
     } catch (err) {
@@ -207,7 +250,7 @@ export default function AdminApplicationsPage() {
               <div className="flex items-center justify-between">
                 <div>
                   <p className="text-sm font-medium text-gray-600 mb-1">Total Applications</p>
-                  <p className="text-3xl font-bold text-camp-charcoal">{allApplications.length}</p>
+                  <p className="text-3xl font-bold text-camp-charcoal">{facets?.total ?? 0}</p>
                 </div>
                 <div className="w-12 h-12 bg-camp-green/10 rounded-lg flex items-center justify-center">
                   <svg className="w-6 h-6 text-camp-green" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -225,7 +268,7 @@ export default function AdminApplicationsPage() {
                 <div>
                   <p className="text-sm font-medium text-gray-600 mb-1">In Progress</p>
                   <p className="text-3xl font-bold text-blue-600">
-                    {allApplications.filter(a => a.status === 'in_progress').length}
+                    {facets?.status['in_progress'] ?? 0}
                   </p>
                 </div>
                 <div className="w-12 h-12 bg-blue-100 rounded-lg flex items-center justify-center">
@@ -244,7 +287,7 @@ export default function AdminApplicationsPage() {
                 <div>
                   <p className="text-sm font-medium text-gray-600 mb-1">Under Review</p>
                   <p className="text-3xl font-bold text-yellow-600">
-                    {allApplications.filter(a => a.status === 'under_review').length}
+                    {facets?.status['under_review'] ?? 0}
                   </p>
                 </div>
                 <div className="w-12 h-12 bg-yellow-100 rounded-lg flex items-center justify-center">
@@ -263,7 +306,7 @@ export default function AdminApplicationsPage() {
                 <div>
                   <p className="text-sm font-medium text-gray-600 mb-1">Accepted</p>
                   <p className="text-3xl font-bold text-green-600">
-                    {allApplications.filter(a => a.status === 'accepted').length}
+                    {facets?.status['accepted'] ?? 0}
                   </p>
                 </div>
                 <div className="w-12 h-12 bg-green-100 rounded-lg flex items-center justify-center">
@@ -288,7 +331,7 @@ export default function AdminApplicationsPage() {
             <CardDescription>Find specific applications quickly</CardDescription>
           </CardHeader>
           <CardContent className="pt-6">
-            <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+            <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
               {/* Search */}
               <div>
                 <label className="block text-sm font-medium text-gray-700 mb-2">
@@ -328,6 +371,23 @@ export default function AdminApplicationsPage() {
                   <option value="paid">Paid</option>
                 </select>
               </div>
+
+              {/* Sort */}
+              <div>
+                <label className="block text-sm font-medium text-gray-700 mb-2">
+                  Sort by
+                </label>
+                <select
+                  value={sort}
+                  onChange={(e) => setSort(e.target.value as ApplicationSort)}
+                  className="w-full px-4 py-2.5 border-2 border-gray-300 rounded-lg focus:border-camp-green focus:ring-2 focus:ring-camp-green/20 transition-colors bg-white"
+                >
+                  <option value="updated_at">Recently Updated</option>
+                  <option value="completion">Most Complete</option>
+                  <option value="completed_at">Recently Completed</option>
+                  <option value="camper_name">Camper Name (A-Z)</option>
+                </select>
+              </div>
             </div>
           </CardContent>
         </Card>
@@ -352,6 +412,9 @@ export default function AdminApplicationsPage() {
                   Showing {applications.length} {applications.length === 1 ? 'application' : 'applications'}
                 </CardDescription>
               </div>
+              <Button variant="outline" size="sm" onClick={handleExport} disabled={exporting}>
+                {exporting ? 'Exporting...' : 'Export CSV'}
+              </Button>
             </div>
           </CardHeader>
           <CardContent>
@@ -474,6 +537,13 @@ export default function AdminApplicationsPage() {
                     ))}
                   </tbody>
                 </table>
+                {nextCursor && (
+                  <div className="flex justify-center py-4">
+                    <Button variant="outline" onClick={loadMoreApplications} disabled={loadingMore}>
+                      {loadingMore ? 'Loading...' : 'Load more'}
+                    </Button>
+                  </div>
+                )}
               </div>
             )}
           </CardContent>
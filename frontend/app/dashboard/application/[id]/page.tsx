@@ -5,17 +5,17 @@
 
 'use client'
 
-import { useEffect, useState } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import { useParams, useRouter } from 'next/navigation'
 import { useAuth } from '@/lib/contexts/AuthContext'
 import {
   getApplicationSections,
   getApplicationProgress,
   getApplication,
-  updateApplication,
+  saveResponseChanges,
   ApplicationSection,
   ApplicationProgress,
-  ApplicationResponse
+  ResponseChange
 } from '@/lib/api-applications'
 import { uploadFile, deleteFile, getFile, getFilesBatch, getTemplateFile, FileInfo } from '@/lib/api-files'
 import { getMedicationsForQuestion, saveMedicationsForQuestion, getAllergiesForQuestion, saveAllergiesForQuestion } from '@/lib/api-medications'
@@ -52,6 +52,8 @@ export default function ApplicationWizardPage() {
   const [medications, setMedications] = useState<Record<string, Medication[]>>({}) // questionId -> medications
   const [allergies, setAllergies] = useState<Record<string, Allergy[]>>({}) // questionId -> allergies
   const [tableData, setTableData] = useState<Record<string, TableRow[]>>({}) // questionId -> table rows
+  // Last saved value and version of each text answer; autosave sends only answers that differ
+  const savedResponses = useRef<Record<string, { value: string; version: number }>>({})
 
   // Load sections, progress, and existing responses
   useEffect(() => {
@@ -143,11 +145,13 @@ export default function ApplicationWizardPage() {
             }
           }
 
-          // Load text responses
+          // Load text responses (saved empty answers still carry a version)
           applicationData.responses.forEach(r => {
-            if (r.response_value && !r.file_id) {
+            if (r.file_id) return
+            if (r.response_value) {
               responsesMap[r.question_id] = r.response_value
             }
+            savedResponses.current[r.question_id] = { value: r.response_value ?? '', version: r.version ?? 1 }
           })
 
           console.log('Final responsesMap:', responsesMap)
@@ -285,32 +289,48 @@ export default function ApplicationWizardPage() {
   const saveResponses = async () => {
     if (!token) return
 
+    // Only answers changed since the last save (file answers are saved on upload)
+    const changes: ResponseChange[] = Object.entries(responses)
+      .filter(([questionId, value]) =>
+        uploadedFiles[questionId] === undefined && savedResponses.current[questionId]?.value !== value
+      )
+      .map(([questionId, value]) => ({
+        question_id: questionId,
+        response_value: value,
+        base_version: savedResponses.current[questionId]?.version ?? null
+      }))
+
+    if (changes.length === 0) return
+
     setSaving(true)
     try {
-      const responseArray: ApplicationResponse[] = Object.entries(responses).map(([questionId, value]) => {
-        // Check if this is a file upload response (value is a UUID/file_id)
-        const isFileUpload = uploadedFiles[questionId] !== undefined
-
-        if (isFileUpload) {
-          return {
-            question_id: questionId,
-            file_id: value
-          }
-        } else {
-          return {
-            question_id: questionId,
-            response_value: value
-          }
-        }
-      })
+      const result = await saveResponseChanges(token, applicationId, changes)
 
-      await updateApplication(token, applicationId, {
-        responses: responseArray
+      const sent: Record<string, string> = {}
+      changes.forEach(c => { sent[c.question_id] = c.response_value ?? '' })
+      ;[...result.saved, ...result.unchanged].forEach(({ question_id, version }) => {
+        savedResponses.current[question_id] = { value: sent[question_id], version }
       })
 
+      // Changed by camp staff since we loaded it: show their answer instead of overwriting it
+      if (result.conflicts.length > 0) {
+        const serverValues: Record<string, string> = {}
+        result.conflicts.forEach(c => {
+          serverValues[c.question_id] = c.response_value ?? ''
+          if (c.version === null) {
+            delete savedResponses.current[c.question_id]
+          } else {
+            savedResponses.current[c.question_id] = { value: c.response_value ?? '', version: c.version }
+          }
+        })
+        setResponses(prev => ({ ...prev, ...serverValues }))
+      }
+
       // Refresh progress
-      const progressData = await getApplicationProgress(token, applicationId)
-      setProgress(progressData)
+      if (result.saved.length > 0) {
+        const progressData = await getApplicationProgress(token, applicationId)
+        setProgress(progressData)
+      }
     } catch (error) {
       console.error('Autosave failed:', error)
     } finally {
@@ -365,29 +385,60 @@ export default function ApplicationWizardPage() {
   const saveTableData = async () => {
     if (!token) return
 
+    // Tables are saved as JSON strings; only tables changed since the last save
+    // (no saved answer counts as an empty table)
+    const changes: ResponseChange[] = Object.entries(tableData)
+      .filter(([questionId, rows]) =>
+        JSON.stringify(rows) !== (savedResponses.current[questionId]?.value || '[]')
+      )
+      .map(([questionId, rows]) => ({
+        question_id: questionId,
+        response_value: JSON.stringify(rows),
+        base_version: savedResponses.current[questionId]?.version ?? null
+      }))
+
+    if (changes.length === 0) return
+
     setSaving(true)
     try {
-      // Save table data as JSON strings in responses
-      const tableResponses: Record<string, string> = {}
-      Object.entries(tableData).forEach(([questionId, rows]) => {
-        tableResponses[questionId] = JSON.stringify(rows)
+      const result = await saveResponseChanges(token, applicationId, changes)
+
+      // Keep responses in step so the text autosave doesn't resend the old JSON
+      const sent: Record<string, string> = {}
+      changes.forEach(c => { sent[c.question_id] = c.response_value ?? '' })
+      const savedValues: Record<string, string> = {}
+      ;[...result.saved, ...result.unchanged].forEach(({ question_id, version }) => {
+        savedResponses.current[question_id] = { value: sent[question_id], version }
+        savedValues[question_id] = sent[question_id]
       })
 
-      // Merge with existing responses and convert to array format
-      const updatedResponses = { ...responses, ...tableResponses }
-
-      const responseArray: ApplicationResponse[] = Object.entries(updatedResponses).map(([questionId, value]) => ({
-        question_id: questionId,
-        response_value: value
-      }))
-
-      await updateApplication(token, applicationId, {
-        responses: responseArray
+      // Changed by camp staff since we loaded it: show their table instead of overwriting it
+      const serverTables: Record<string, TableRow[]> = {}
+      result.conflicts.forEach(c => {
+        const value = c.response_value ?? ''
+        savedValues[c.question_id] = value
+        if (c.version === null) {
+          delete savedResponses.current[c.question_id]
+        } else {
+          savedResponses.current[c.question_id] = { value, version: c.version }
+        }
+        try {
+          serverTables[c.question_id] = value ? JSON.parse(value) : []
+        } catch (err) {
+          console.error('Failed to parse table data for question', c.question_id, err)
+          serverTables[c.question_id] = []
+        }
       })
+      setResponses(prev => ({ ...prev, ...savedValues }))
+      if (result.conflicts.length > 0) {
+        setTableData(prev => ({ ...prev, ...serverTables }))
+      }
 
       // Refresh progress
-      const progressData = await getApplicationProgress(token, applicationId)
-      setProgress(progressData)
+      if (result.saved.length > 0) {
+        const progressData = await getApplicationProgress(token, applicationId)
+        setProgress(progressData)
+      }
     } catch (error) {
       console.error('Table data autosave failed:', error)
     } finally {
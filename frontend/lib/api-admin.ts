@@ -8,8 +8,8 @@ const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 export interface UserInfo {
   id: string
   email: string
-  first_name: string
-  last_name: string
+  first_name?: string
+  last_name?: string
   phone?: string
 }
 
@@ -28,6 +28,7 @@ export interface ApplicationWithUser {
   completed_at?: string  // When application reached 100%
   approval_count?: number
   approved_by_teams?: string[]
+  // Only on single-application reads; the list leaves them out
   responses?: Array<{
     id: string
     question_id: string
@@ -36,17 +37,46 @@ export interface ApplicationWithUser {
   }>
 }
 
+// Counts for the current search, whatever the status filter or page
+export interface ApplicationListFacets {
+  total: number
+  status: Record<string, number>
+  completion: Record<string, number>  // by bucket: "0", "1-49", "50-99", "100"
+  approved_by_team: Record<string, number>
+}
+
+export interface ApplicationListPage {
+  items: ApplicationWithUser[]
+  next_cursor: string | null  // pass back as `cursor` for the next page
+  facets?: ApplicationListFacets  // only when requested
+}
+
+export type ApplicationSort = 'updated_at' | 'completion' | 'completed_at' | 'camper_name'
+
 /**
- * Get all applications (admin only)
+ * Get one page of applications, most recently updated first unless sorted otherwise (admin only)
+ * A cursor only continues the sort and order it came from
  */
-export async function getAllApplications(
+export async function listApplications(
   token: string,
-  statusFilter?: string,
-  search?: string
-): Promise<ApplicationWithUser[]> {
+  options: {
+    statusFilter?: string
+    search?: string
+    cursor?: string
+    limit?: number
+    sort?: ApplicationSort
+    order?: 'asc' | 'desc'
+    facets?: boolean
+  } = {}
+): Promise<ApplicationListPage> {
   const params = new URLSearchParams()
-  if (statusFilter) params.append('status_filter', statusFilter)
-  if (search) params.append('search', search)
+  if (options.statusFilter) params.append('status_filter', options.statusFilter)
+  if (options.search) params.append('search', options.search)
+  if (options.cursor) params.append('cursor', options.cursor)
+  if (options.limit) params.append('limit', String(options.limit))
+  if (options.sort) params.append('sort', options.sort)
+  if (options.order) params.append('order', options.order)
+  if (options.facets) params.append('facets', 'true')
 
   const url = `${API_URL}/api/applications/admin/all${params.toString() ? `?${params.toString()}` : ''}`
 
@@ -64,6 +94,80 @@ export async function getAllApplications(
   return response.json()
 }
 
+/**
+ * Get all applications, following every page (admin only)
+ */
+export async function getAllApplications(
+  token: string,
+  statusFilter?: string,
+  search?: string
+): Promise<ApplicationWithUser[]> {
+  const applications: ApplicationWithUser[] = []
+  let cursor: string | undefined
+  do {
+    const page = await listApplications(token, { statusFilter, search, cursor, limit: 200 })
+    applications.push(...page.items)
+    cursor = page.next_cursor ?? undefined
+  } while (cursor)
+
+  return applications
+}
+
+/**
+ * Download applications with one column per question, as CSV or NDJSON (admin only)
+ */
+export async function exportApplications(
+  token: string,
+  options: { format?: 'csv' | 'ndjson'; statusFilter?: string; search?: string } = {}
+): Promise<Blob> {
+  const params = new URLSearchParams({ format: options.format || 'csv' })
+  if (options.statusFilter) params.append('status_filter', options.statusFilter)
+  if (options.search) params.append('search', options.search)
+
+  const response = await fetch(`${API_URL}/api/applications/admin/export?${params.toString()}`, {
+    headers: {
+      'Authorization': `Bearer ${token}`,
+    },
+  })
+
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({}))
+    throw new Error(error.detail || 'Failed to export applications')
+  }
+
+  return response.blob()
+}
+
+export interface ApplicationSearchResult extends ApplicationWithUser {
+  rank: number  // higher is a better match
+}
+
+/**
+ * Search applications by camper or parent name/email, best matches first (admin only)
+ * Every word must match the start of a word, e.g. "jo smi" finds Jordan Smith
+ */
+export async function searchApplications(
+  token: string,
+  query: string,
+  limit?: number
+): Promise<ApplicationSearchResult[]> {
+  const params = new URLSearchParams({ q: query })
+  if (limit) params.append('limit', String(limit))
+
+  const response = await fetch(`${API_URL}/api/applications/admin/search?${params.toString()}`, {
+    headers: {
+      'Authorization': `Bearer ${token}`,
+    },
+  })
+
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({}))
+    throw new Error(error.detail || 'Failed to search applications')
+  }
+
+  return response.json()
+}
+
 /**
  * Get a specific application (admin only)
  */
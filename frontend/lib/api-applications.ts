@@ -59,6 +59,29 @@ export interface ApplicationResponse {
   question_id: string
   response_value?: string
   file_id?: string
+  version?: number
+}
+
+export interface ResponseChange {
+  question_id: string
+  response_value?: string
+  file_id?: string
+  base_version: number | null  // version last seen (null if there was no response)
+}
+
+export interface ResponseConflict {
+  question_id: string
+  response_value?: string | null
+  file_id?: string | null
+  version: number | null
+}
+
+export interface ApplicationDeltaResult {
+  saved: { question_id: string; version: number }[]
+  unchanged: { question_id: string; version: number }[]
+  conflicts: ResponseConflict[]
+  completion_percentage: number
+  status: string
 }
 
 export interface ApplicationWithResponses extends Application {
@@ -196,6 +219,32 @@ export async function updateApplication(
   return response.json()
 }
 
+/**
+ * Save only the responses that changed (delta autosave)
+ * Responses someone else changed since base_version come back as conflicts
+ */
+export async function saveResponseChanges(
+  token: string,
+  applicationId: string,
+  changes: ResponseChange[]
+): Promise<ApplicationDeltaResult> {
+  const response = await fetch(`${API_URL}/api/applications/${applicationId}/responses`, {
+    method: 'PATCH',
+    headers: {
+      'Content-Type': 'application/json',
+      'Authorization': `Bearer ${token}`,
+    },
+    body: JSON.stringify({ changes }),
+  })
+
+  if (!response.ok) {
+    const error = await response.json()
+    throw new Error(error.detail || 'Failed to save responses')
+  }
+
+  return response.json()
+}
+
 /**
  * Get application progress
  */
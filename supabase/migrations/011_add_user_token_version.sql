@@ -0,0 +1,8 @@
+-- Add token_version to users for JWT revocation
+-- Access tokens carry role/team claims plus the user's token_version.
+-- Bumping the version (role, team or status change) invalidates older tokens.
+
+ALTER TABLE users
+ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN users.token_version IS 'Incremented when role/team/status change; tokens with an older version are rejected';
@@ -0,0 +1,8 @@
+-- Add completion_state to applications
+-- Per-section required/answered counters behind completion_percentage, kept
+-- up to date incrementally by autosave. NULL means "recompute on next save".
+
+ALTER TABLE applications
+ADD COLUMN IF NOT EXISTS completion_state JSONB;
+
+COMMENT ON COLUMN applications.completion_state IS 'Completion counters: {"form": fingerprint, "status": status, "sections": {section_id: [required, answered_required]}}';
@@ -0,0 +1,9 @@
+-- Add version to application_responses
+-- Bumped on every write that changes a response. Delta autosave sends the
+-- version the client last saw, so an admin edit made in the meantime is
+-- reported as a conflict instead of being overwritten.
+
+ALTER TABLE application_responses
+ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+COMMENT ON COLUMN application_responses.version IS 'Incremented on every change to response_value or file_id';
@@ -0,0 +1,25 @@
+-- Backfill applications.application_data from application_responses
+-- application_data now holds a copy of each application's responses, keyed
+-- by question id, and is what application reads are served from. The API
+-- keeps it in step on every response write; this fills it for existing rows.
+-- backend/check_application_data.py verifies (and with --fix repairs) it.
+
+UPDATE applications a
+SET application_data = COALESCE((
+    SELECT jsonb_object_agg(
+        r.question_id::text,
+        jsonb_build_object(
+            'id', r.id,
+            'response_value', r.response_value,
+            'file_id', r.file_id,
+            'version', r.version,
+            'created_at', r.created_at,
+            'updated_at', r.updated_at
+        )
+    )
+    FROM application_responses r
+    WHERE r.application_id = a.id
+      AND r.question_id IS NOT NULL
+), '{}'::jsonb);
+
+COMMENT ON COLUMN applications.application_data IS 'Copy of the application''s responses: {question_id: {id, response_value, file_id, version, created_at, updated_at}}';
@@ -0,0 +1,7 @@
+-- Indexes for the keyset-paginated admin application list
+-- The list is ordered by (updated_at DESC, id DESC) and each page starts
+-- after the previous page's last row, so a page is a range scan of these
+-- instead of a sort of every application.
+
+CREATE INDEX IF NOT EXISTS idx_applications_updated_at_id ON applications(updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_status_updated_at_id ON applications(status, updated_at DESC, id DESC);
@@ -0,0 +1,15 @@
+-- Full-text indexes for admin application search
+-- Camper names and the parent's name/email as 'simple' tsvectors (no
+-- stemming; emails split on punctuation). These must match the expressions
+-- in backend/app/models/search.py exactly, or Postgres won't use them.
+-- Built in (no extension needed); prefix matching is done with to_tsquery('jan:*').
+
+CREATE INDEX IF NOT EXISTS idx_applications_camper_search ON applications USING gin (
+    to_tsvector('simple'::regconfig, coalesce(camper_first_name, '') || ' ' || coalesce(camper_last_name, ''))
+);
+
+CREATE INDEX IF NOT EXISTS idx_users_parent_search ON users USING gin (
+    to_tsvector('simple'::regconfig,
+        coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' '
+        || coalesce(regexp_replace(email, '[^[:alnum:]]+', ' ', 'g'), ''))
+);
@@ -0,0 +1,15 @@
+-- Indexes for the admin application list's other sort orders
+-- Like 015, each is the sort key then id, so a page (either direction) is a
+-- range scan. The expressions must match the SORTS keys in
+-- backend/app/services/application_list_service.py exactly.
+
+CREATE INDEX IF NOT EXISTS idx_applications_completion_id ON applications(completion_percentage DESC, id DESC);
+
+-- Applications that haven't completed sort as oldest
+CREATE INDEX IF NOT EXISTS idx_applications_completed_at_id ON applications(
+    (coalesce(completed_at, '1970-01-01 00:00:00+00:00')) DESC, id DESC
+);
+
+CREATE INDEX IF NOT EXISTS idx_applications_camper_name_id ON applications(
+    lower(coalesce(camper_last_name, '')), lower(coalesce(camper_first_name, '')), id
+);